@@ -21,15 +21,32 @@ import traceback
 import atexit
 import subprocess
 import signal
+import queue
+from concurrent.futures import Future
+from collections import OrderedDict, deque
 from pathlib import Path
-from flask import Flask, jsonify, request, send_file, send_from_directory
-from typing import Optional, Dict, Any
+from flask import Flask, Response, jsonify, request, send_file, send_from_directory
+from typing import Optional, Dict, Any, Tuple, Callable
+
+import qunix_db
+import qunix_metrics
+import qunix_trace
+
+try:
+    from flask_socketio import SocketIO, join_room
+    SOCKETIO_AVAILABLE = True
+except ImportError:
+    SOCKETIO_AVAILABLE = False
 
 VERSION = "18.1.0-CPU-FIXED"
 
 app = Flask(__name__, static_url_path='/static')
 application = app
 
+# Output push channel; threading mode works under plain WSGI hosts, where
+# Socket.IO falls back to its own long-polling transport
+socketio = SocketIO(app, async_mode='threading') if SOCKETIO_AVAILABLE else None
+
 # ═══════════════════════════════════════════════════════════════════════════
 # GLOBAL STATE
 # ═══════════════════════════════════════════════════════════════════════════
@@ -40,9 +57,12 @@ _init_error = None
 _init_lock = threading.RLock()
 _db_path = None
 _db_executor = None
+_output_buffer = None
 _quantum_worker = None
 _quantum_bus = None
 _executor = None
+_text_renderer = None
+_json_renderer = None
 
 # CPU Management
 _cpu_process = None
@@ -53,6 +73,29 @@ _cpu_start_attempts = 0
 _cpu_last_seen = 0
 _cpu_restart_cooldown = 5.0
 
+# Health snapshot: rebuilt in the background, /health only copies it
+_cpu_liveness = None          # last cpu_liveness row
+_cpu_heartbeat_timeout = 20.0 # CPU writes every 5s
+_health_snapshot = None
+_health_lock = threading.Lock()
+_health_interval = 2.0
+_health_stop = threading.Event()
+_health_thread = None
+
+# Terminal command workers: input returns before the command runs
+_terminal_workers = 2
+_terminal_queue_max = 32
+_request_history = 1000
+_input_queues = []
+_input_threads = []
+_requests = OrderedDict()    # request_id -> status
+_requests_lock = threading.Lock()
+
+# Long-poll wakeups: newest terminal_output id per session seen here
+_output_watches: Dict[str, '_SessionWatch'] = {}
+_output_lock = threading.Lock()
+_longpoll_max_wait = 20.0
+
 _metrics = {
     'commands_sent': 0,
     'results_received': 0,
@@ -63,10 +106,29 @@ _metrics = {
     'bus_status': 'unknown',
     'cpu_status': 'offline',
     'cpu_restarts': 0,
-    'packets_cleaned': 0
+    'packets_cleaned': 0,
+    'rejected': 0,
+    'output_polls': 0
 }
 _metrics_lock = threading.Lock()
 
+# Latency histograms for /metrics (counters above are exported by a collector)
+QUEUE_WAIT_SECONDS = qunix_metrics.REGISTRY.histogram(
+    'qunix_flask_queue_wait_seconds', 'Terminal command wait in the worker queue')
+COMMAND_SECONDS = qunix_metrics.REGISTRY.histogram(
+    'qunix_flask_command_seconds', 'Terminal command run time in the worker', ['status'])
+DB_CHECKOUT_WAIT_SECONDS = qunix_metrics.REGISTRY.histogram(
+    'qunix_db_checkout_wait_seconds', 'Wait for a pool reader connection')
+DB_READ_SECONDS = qunix_metrics.REGISTRY.histogram(
+    'qunix_db_read_seconds', 'Pool read query time')
+DB_COMMIT_SECONDS = qunix_metrics.REGISTRY.histogram(
+    'qunix_db_commit_seconds', 'Group commit time on the writer thread')
+DB_GROUP_SIZE = qunix_metrics.REGISTRY.histogram(
+    'qunix_db_group_commit_size', 'Write intents per group commit',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
+CPU_SNAPSHOT_AGE = qunix_metrics.REGISTRY.gauge(
+    'qunix_cpu_metrics_age_seconds', 'Age of the CPU metrics snapshot file')
+
 
 def _log(msg):
     """Safe logging"""
@@ -78,14 +140,9 @@ def _log(msg):
         pass
 
 
-def create_optimized_connection(db_path: Path, timeout: float = 30.0):
-    """Create optimized connection"""
-    conn = sqlite3.connect(str(db_path), timeout=timeout, check_same_thread=False, isolation_level=None)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA synchronous=NORMAL")
-    conn.execute("PRAGMA busy_timeout=30000")
-    return conn
+def create_optimized_connection(db_path: Path, timeout: float = 30.0, profile: str = 'writer'):
+    """Create optimized connection (reader pool members pass profile='reader')"""
+    return qunix_db.connect(db_path, profile=profile, timeout=timeout)
 
 
 def retry_on_lock(max_retries: int = 5, initial_delay: float = 0.1):
@@ -115,70 +172,578 @@ def retry_on_lock(max_retries: int = 5, initial_delay: float = 0.1):
 
 
 class SafeDatabaseExecutor:
-    """Thread-safe database executor"""
+    """
+    Thread-safe database executor
+    
+    WAL-mode pool with N read-only readers and a single writer thread.
+    Reader checkout blocks on a condition variable (no polling); idle
+    connections are health-checked before reuse and recycled by age.
+    
+    Writes are intents on a queue. The writer thread drains whatever has
+    queued up and commits it as one transaction, each intent inside its own
+    savepoint so a failing statement only fails its own future. Callers
+    block on the future only when they need the result (lastrowid).
+    """
+    
+    HEALTH_CHECK_IDLE = 30.0     # Ping connections idle longer than this
+    MAX_CONNECTION_AGE = 3600.0  # Recycle connections older than this
+    GROUP_MAX = 256              # Write intents per group commit
+    COMMIT_RETRIES = 5
+    
     def __init__(self, db_path: Path, pool_size: int = 10):
         self.db_path = db_path
-        self.connections = []
-        self.available = []
-        self.lock = threading.Lock()
-        _log(f"Creating connection pool (size={pool_size})...")
-        for i in range(pool_size):
+        self.reader_count = max(1, pool_size - 1)
+        self.cond = threading.Condition()
+        self.readers = deque()        # (conn, last_used)
+        self.created: Dict[int, float] = {}
+        self.in_use = 0
+        self.write_queue = queue.Queue()
+        
+        self.stats = {
+            'checkouts': 0,
+            'waits': 0,               # Checkouts that found no free reader
+            'timeouts': 0,
+            'wait_ms_total': 0.0,
+            'wait_ms_max': 0.0,
+            'checkout_ms_total': 0.0,
+            'checkout_ms_max': 0.0,
+            'write_intents': 0,
+            'write_errors': 0,
+            'group_commits': 0,
+            'group_size_max': 0,
+            'commit_ms_total': 0.0,
+            'commit_ms_max': 0.0,
+            'commit_retries': 0,
+            'recycled': 0,
+            'health_failures': 0,
+        }
+        
+        _log(f"Creating connection pool (1 writer + {self.reader_count} readers)...")
+        self.writer = self._open(readonly=False)
+        self.writer_last_used = time.time()
+        for i in range(self.reader_count):
             try:
-                conn = create_optimized_connection(db_path)
-                self.connections.append(conn)
-                self.available.append(conn)
+                self.readers.append((self._open(readonly=True), time.time()))
             except Exception as e:
                 _log(f"Failed connection {i}: {e}")
-        _log(f"✓ Pool ready ({len(self.available)} connections)")
+        
+        self.writer_thread = threading.Thread(target=self._writer_loop, daemon=True,
+                                              name="DBWriter")
+        self.writer_thread.start()
+        _log(f"✓ Pool ready ({len(self.readers)} readers + writer thread)")
+    
+    def _open(self, readonly: bool) -> sqlite3.Connection:
+        conn = create_optimized_connection(self.db_path,
+                                           profile='reader' if readonly else 'writer')
+        self.created[id(conn)] = time.time()
+        return conn
     
     @retry_on_lock(max_retries=3)
     def execute(self, sql: str, params: tuple = (), timeout: float = 5.0):
-        conn = self._acquire_connection(timeout)
+        conn, checkout_start = self._acquire_reader(timeout)
         try:
-            cursor = conn.execute(sql, params)
-            return cursor.fetchall()
+            with DB_READ_SECONDS.time():
+                return conn.execute(sql, params).fetchall()
         finally:
-            self._release_connection(conn)
+            self._release_reader(conn, checkout_start)
+    
+    def submit_write(self, sql: str, params: tuple = ()) -> Future:
+        """Queue a write; the future resolves to lastrowid after commit"""
+        return self._submit('sql', (sql, params))
     
-    @retry_on_lock(max_retries=3)
     def execute_write(self, sql: str, params: tuple = (), timeout: float = 5.0) -> int:
-        conn = self._acquire_connection(timeout)
-        try:
-            cursor = conn.execute(sql, params)
-            return cursor.lastrowid
-        finally:
-            self._release_connection(conn)
+        """Queue a write and wait for its commit"""
+        return self.submit_write(sql, params).result(timeout)
+    
+    def execute_batch(self, statements: list, timeout: float = 5.0):
+        """Run [(sql, [params, ...]), ...] atomically within one group commit"""
+        return self._submit('batch', statements).result(timeout)
     
     def executescript(self, script: str, timeout: float = 10.0):
-        conn = self._acquire_connection(timeout)
-        try:
-            conn.executescript(script)
-        finally:
-            self._release_connection(conn)
+        """Run a script outside any group (scripts manage their own commits)"""
+        return self._submit('script', script).result(timeout)
+    
+    def _submit(self, kind: str, payload) -> Future:
+        future = Future()
+        self.write_queue.put((kind, payload, future))
+        return future
     
-    def _acquire_connection(self, timeout: float):
+    def _acquire_reader(self, timeout: float):
         start = time.time()
-        while (time.time() - start) < timeout:
-            with self.lock:
-                if self.available:
-                    return self.available.pop()
-            time.sleep(0.01)
-        raise TimeoutError("Connection pool exhausted")
+        deadline = start + timeout
+        with self.cond:
+            if not self.readers:
+                self.stats['waits'] += 1
+            while not self.readers:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    self.stats['timeouts'] += 1
+                    raise TimeoutError("Connection pool exhausted")
+                self.cond.wait(remaining)
+            conn, last_used = self.readers.popleft()
+            self.in_use += 1
+            
+            wait_ms = (time.time() - start) * 1000
+            DB_CHECKOUT_WAIT_SECONDS.observe(wait_ms / 1000)
+            self.stats['checkouts'] += 1
+            self.stats['wait_ms_total'] += wait_ms
+            self.stats['wait_ms_max'] = max(self.stats['wait_ms_max'], wait_ms)
+        
+        now = time.time()
+        if now - last_used > self.HEALTH_CHECK_IDLE and not self._healthy(conn):
+            try:
+                conn = self._replace(conn)
+            except Exception:
+                # Hand the slot back stale so the next checkout retries the open
+                with self.cond:
+                    self.readers.append((conn, 0.0))
+                    self.in_use -= 1
+                    self.cond.notify()
+                raise
+        return conn, now
     
-    def _release_connection(self, conn):
-        with self.lock:
-            if conn not in self.available:
-                self.available.append(conn)
+    def _release_reader(self, conn, checkout_start: float):
+        now = time.time()
+        last_used = now
+        if now - self.created.get(id(conn), now) > self.MAX_CONNECTION_AGE:
+            try:
+                conn = self._replace(conn)
+            except Exception as e:
+                _log(f"Reader recycle failed: {e}")
+                last_used = 0.0
+        
+        with self.cond:
+            self.readers.append((conn, last_used))
+            self.in_use -= 1
+            held_ms = (now - checkout_start) * 1000
+            self.stats['checkout_ms_total'] += held_ms
+            self.stats['checkout_ms_max'] = max(self.stats['checkout_ms_max'], held_ms)
+            self.cond.notify()
+    
+    # ─── writer thread ───
+    
+    def _writer_loop(self):
+        while True:
+            intent = self.write_queue.get()
+            if intent is None:
+                break
+            
+            # Everything queued behind the first intent joins its group
+            group = [intent]
+            stop = False
+            while len(group) < self.GROUP_MAX:
+                try:
+                    intent = self.write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if intent is None:
+                    stop = True
+                    break
+                group.append(intent)
+            
+            try:
+                self._maintain_writer()
+                
+                run = []
+                for intent in group:
+                    if intent[0] == 'script':
+                        self._commit_run(run)
+                        run = []
+                        self._run_script(intent)
+                    else:
+                        run.append(intent)
+                self._commit_run(run)
+                self.writer_last_used = time.time()
+            except Exception as e:
+                # A dead writer thread would leave every later write hanging
+                _log(f"Writer group failed ({len(group)} intents): {e}")
+                try:
+                    self.writer.execute("ROLLBACK")
+                except Exception:
+                    pass
+                for _, _, future in group:
+                    if not future.done():
+                        future.set_exception(e)
+                with self.cond:
+                    self.stats['write_errors'] += 1
+                self.writer_last_used = 0.0  # Health-check (and replace) next group
+            
+            if stop:
+                break
+    
+    def _maintain_writer(self):
+        now = time.time()
+        if (now - self.created.get(id(self.writer), now) > self.MAX_CONNECTION_AGE or
+                (now - self.writer_last_used > self.HEALTH_CHECK_IDLE and not self._healthy(self.writer))):
+            self.writer = self._replace(self.writer, readonly=False)
+    
+    def _commit_run(self, run: list):
+        if not run:
+            return
+        
+        conn = self.writer
+        start = time.time()
+        
+        for attempt in range(self.COMMIT_RETRIES):
+            results = []
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for kind, payload, future in run:
+                    conn.execute("SAVEPOINT intent")
+                    try:
+                        if kind == 'sql':
+                            sql, params = payload
+                            result = conn.execute(sql, params).lastrowid
+                        else:
+                            for sql, seq_of_params in payload:
+                                if seq_of_params:
+                                    conn.executemany(sql, seq_of_params)
+                            result = None
+                        conn.execute("RELEASE intent")
+                        results.append((future, result, None))
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO intent")
+                        conn.execute("RELEASE intent")
+                        results.append((future, None, e))
+                conn.execute("COMMIT")
+                break
+            except sqlite3.OperationalError as e:
+                # BEGIN/COMMIT contention with another process
+                try:
+                    conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass
+                if attempt == self.COMMIT_RETRIES - 1:
+                    _log(f"Group commit failed ({len(run)} intents): {e}")
+                    results = [(future, None, e) for _, _, future in run]
+                    break
+                with self.cond:
+                    self.stats['commit_retries'] += 1
+                time.sleep(0.05 * (2 ** attempt))
+        
+        commit_ms = (time.time() - start) * 1000
+        DB_COMMIT_SECONDS.observe(commit_ms / 1000)
+        DB_GROUP_SIZE.observe(len(run))
+        errors = 0
+        for future, result, error in results:
+            if error is None:
+                future.set_result(result)
+            else:
+                errors += 1
+                future.set_exception(error)
+        
+        with self.cond:
+            self.stats['write_intents'] += len(run)
+            self.stats['write_errors'] += errors
+            self.stats['group_commits'] += 1
+            self.stats['group_size_max'] = max(self.stats['group_size_max'], len(run))
+            self.stats['commit_ms_total'] += commit_ms
+            self.stats['commit_ms_max'] = max(self.stats['commit_ms_max'], commit_ms)
+    
+    def _run_script(self, intent):
+        _, script, future = intent
+        try:
+            self.writer.executescript(script)
+            future.set_result(None)
+        except Exception as e:
+            future.set_exception(e)
+    
+    def _healthy(self, conn) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except Exception as e:
+            _log(f"Pool connection failed health check: {e}")
+            with self.cond:
+                self.stats['health_failures'] += 1
+            return False
+    
+    def _replace(self, conn, readonly: bool = True) -> sqlite3.Connection:
+        self.created.pop(id(conn), None)
+        try:
+            conn.close()
+        except:
+            pass
+        with self.cond:
+            self.stats['recycled'] += 1
+        return self._open(readonly=readonly)
+    
+    def get_stats(self) -> Dict:
+        with self.cond:
+            stats = dict(self.stats)
+            stats['readers'] = self.reader_count
+            stats['readers_in_use'] = self.in_use
+            stats['saturation'] = self.in_use / self.reader_count
+            stats['write_queue'] = self.write_queue.qsize()
+            checkouts = stats['checkouts'] or 1
+            stats['wait_ms_avg'] = stats['wait_ms_total'] / checkouts
+            stats['checkout_ms_avg'] = stats['checkout_ms_total'] / checkouts
+            groups = stats['group_commits'] or 1
+            stats['group_size_avg'] = stats['write_intents'] / groups
+            stats['commit_ms_avg'] = stats['commit_ms_total'] / groups
+        return stats
     
     def close_all(self):
-        with self.lock:
-            for conn in self.connections:
+        with self.cond:
+            for conn, _ in self.readers:
                 try:
                     conn.close()
                 except:
                     pass
-            self.connections.clear()
-            self.available.clear()
+            self.readers.clear()
+        
+        # Drain queued writes before closing the writer
+        self.write_queue.put(None)
+        self.writer_thread.join(timeout=10.0)
+        try:
+            self.writer.close()
+        except:
+            pass
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TERMINAL OUTPUT BUFFER (WRITE-BEHIND)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _is_transient(error: Exception) -> bool:
+    """Lock contention worth retrying (as in retry_on_lock)"""
+    message = str(error).lower()
+    return isinstance(error, sqlite3.OperationalError) and ("locked" in message or "busy" in message)
+
+
+class TerminalOutputBuffer:
+    """
+    Per-session output rings with write-behind to terminal_output
+    
+    Appends only queue; the flusher thread inserts them and SQLite assigns
+    terminal_output.id at commit, so ids rise in the order rows become
+    visible to every process. Flushed rows are handed to on_flush (for
+    long-poll wakeups and push) and kept in a per-session ring that serves
+    reads from memory. A session whose table rows include ids this process
+    did not write is marked shared and read from the table from then on.
+    New sessions and coalesced last_activity updates go out with each flush.
+    """
+    
+    MAX_PENDING = 10000    # Rows held for a failing database before the oldest are dropped
+    
+    def __init__(self, db: SafeDatabaseExecutor, ring_size: int = 256,
+                 flush_interval: float = 0.5, idle_ttl: float = 3600.0,
+                 on_flush: Optional[Callable[[list], None]] = None,
+                 on_prune: Optional[Callable[[float], None]] = None):
+        self.db = db
+        self.ring_size = ring_size
+        self.flush_interval = flush_interval
+        self.idle_ttl = idle_ttl
+        self.on_flush = on_flush    # Called with [(session_id, id, text), ...] after commit
+        self.on_prune = on_prune    # Called with the idle cutoff each prune pass
+        
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.rings: Dict[str, deque] = {}
+        self.floors: Dict[str, int] = {}       # Highest id not held in the ring
+        self.shared = set()                    # Sessions other processes write to
+        self.last_write: Dict[str, float] = {}
+        self.pending_sessions = []
+        self.pending_rows = []
+        self.pending_activity: Dict[str, float] = {}
+        
+        # Foreign-row scan: table ids above the watermark not written here
+        rows = db.execute("SELECT COALESCE(MAX(id), 0) AS m FROM terminal_output")
+        self.scanned_id = rows[0]['m']
+        self.own_ids = set()
+        
+        self.stats = {
+            'ring_reads': 0,
+            'db_reads': 0,
+            'flushes': 0,
+            'rows_flushed': 0,
+            'rows_dropped': 0,
+            'flush_errors': 0,
+        }
+        
+        self.running = True
+        self.wake = threading.Event()
+        self.thread = threading.Thread(target=self._flush_loop, daemon=True,
+                                       name="OutputWriteBehind")
+        self.thread.start()
+    
+    def open_session(self, session_id: str, now: float):
+        """Register a new session; it has no earlier output anywhere"""
+        with self.lock:
+            self.rings[session_id] = deque()
+            self.floors[session_id] = 0
+            self.last_write[session_id] = now
+            self.pending_sessions.append((session_id, 'active', now, now))
+    
+    def append(self, session_id: str, text: str):
+        """Queue output; it gets its id (and reaches readers) on the next flush"""
+        now = time.time()
+        with self.lock:
+            self.last_write[session_id] = now
+            self.pending_rows.append((session_id, text, now))
+            self._cap_pending()
+        self.wake.set()
+    
+    def _cap_pending(self):
+        """Drop the oldest rows past MAX_PENDING (caller holds self.lock)"""
+        excess = len(self.pending_rows) - self.MAX_PENDING
+        if excess > 0:
+            del self.pending_rows[:excess]
+            self.stats['rows_dropped'] += excess
+    
+    def touch(self, session_id: str):
+        with self.lock:
+            self.pending_activity[session_id] = time.time()
+    
+    def read(self, session_id: str, last_id: int, limit: int = 50,
+             from_db: bool = False) -> list:
+        """
+        Output rows after last_id
+        
+        Served from the ring when it covers last_id and no other process
+        writes the session; from_db=True always flushes and reads the table.
+        """
+        if not from_db:
+            with self.lock:
+                ring = self.rings.get(session_id)
+                if (ring is not None and session_id not in self.shared
+                        and last_id >= self.floors[session_id]):
+                    self.stats['ring_reads'] += 1
+                    rows = []
+                    for row_id, text in ring:
+                        if row_id > last_id:
+                            rows.append({'id': row_id, 'text': text})
+                            if len(rows) >= limit:
+                                break
+                    return rows
+        
+        self.flush()
+        with self.lock:
+            self.stats['db_reads'] += 1
+        rows = self.db.execute(
+            'SELECT id, data FROM terminal_output WHERE session_id = ? AND id > ? ORDER BY id LIMIT ?',
+            (session_id, last_id, limit)
+        )
+        return [{'id': r['id'], 'text': r['data']} for r in rows]
+    
+    def flush(self):
+        """Persist everything pending; rows commit in one group on the writer"""
+        with self.flush_lock:
+            with self.lock:
+                sessions, self.pending_sessions = self.pending_sessions, []
+                rows, self.pending_rows = self.pending_rows, []
+                activity, self.pending_activity = self.pending_activity, {}
+            
+            if not (sessions or rows or activity):
+                return
+            
+            # Queued back to back so the writer commits them as one group
+            futures = [self.db.submit_write(
+                'INSERT INTO terminal_output (session_id, data, ts) VALUES (?, ?, ?)', row)
+                for row in rows]
+            try:
+                if sessions or activity:
+                    self.db.execute_batch([
+                        ('INSERT OR IGNORE INTO terminal_sessions (session_id, status, created, last_activity) '
+                         'VALUES (?, ?, ?, ?)', sessions),
+                        ('UPDATE terminal_sessions SET last_activity = ? WHERE session_id = ?',
+                         [(ts, sid) for sid, ts in activity.items()]),
+                    ], timeout=30.0)
+                sessions, activity = [], {}
+            except Exception as e:
+                if _is_transient(e):
+                    _log(f"Output flush error (sessions, will retry): {e}")
+                else:
+                    _log(f"Output flush error (sessions, dropped): {e}")
+                    sessions, activity = [], {}
+            
+            flushed, retry, dropped = [], [], 0
+            for row, future in zip(rows, futures):
+                try:
+                    flushed.append((row[0], future.result(30.0), row[1]))
+                except Exception as e:
+                    if _is_transient(e):
+                        retry.append(row)
+                    else:
+                        # Retrying can't fix it and would block every later flush
+                        _log(f"Output row dropped ({row[0][:8]}...): {e}")
+                        dropped += 1
+            
+            with self.lock:
+                if sessions or activity or retry:
+                    # Requeue ahead of anything written meanwhile
+                    self.pending_sessions[:0] = sessions
+                    self.pending_rows[:0] = retry
+                    for sid, ts in activity.items():
+                        self.pending_activity.setdefault(sid, ts)
+                    self._cap_pending()
+                    self.stats['flush_errors'] += 1
+                self.stats['rows_dropped'] += dropped
+                self.stats['flushes'] += 1
+                self.stats['rows_flushed'] += len(flushed)
+                
+                for session_id, row_id, text in flushed:
+                    self.own_ids.add(row_id)
+                    ring = self.rings.get(session_id)
+                    if ring is None:
+                        # Session from before this process: older rows live in the table
+                        ring = self.rings[session_id] = deque()
+                        self.floors[session_id] = row_id - 1
+                    if len(ring) >= self.ring_size:
+                        self.floors[session_id] = ring.popleft()[0]
+                    ring.append((row_id, text))
+            
+            if flushed and self.on_flush:
+                self.on_flush(flushed)
+    
+    def _scan_foreign(self):
+        """Mark ring sessions that gained rows from another process"""
+        rows = self.db.execute(
+            'SELECT id, session_id FROM terminal_output WHERE id > ? ORDER BY id',
+            (self.scanned_id,)
+        )
+        with self.lock:
+            for r in rows:
+                if r['id'] not in self.own_ids and r['session_id'] in self.rings:
+                    self.shared.add(r['session_id'])
+            if rows:
+                self.scanned_id = rows[-1]['id']
+            self.own_ids = {i for i in self.own_ids if i > self.scanned_id}
+    
+    def _flush_loop(self):
+        while self.running:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            try:
+                self.flush()
+                self._scan_foreign()
+                self._prune()
+            except Exception as e:
+                _log(f"Output write-behind error: {e}")
+    
+    def _prune(self):
+        cutoff = time.time() - self.idle_ttl
+        with self.lock:
+            for sid in [sid for sid, ts in self.last_write.items() if ts < cutoff]:
+                self.rings.pop(sid, None)
+                self.floors.pop(sid, None)
+                self.shared.discard(sid)
+                del self.last_write[sid]
+        if self.on_prune:
+            self.on_prune(cutoff)
+    
+    def stop(self):
+        self.running = False
+        self.wake.set()
+        self.thread.join(timeout=5.0)
+        self.flush()
+    
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return dict(self.stats,
+                        sessions=len(self.rings),
+                        shared_sessions=len(self.shared),
+                        pending=len(self.pending_rows))
 
 
 def _find_database():
@@ -259,8 +824,28 @@ def _find_cpu_script():
     return None
 
 
+def _refresh_cpu_liveness():
+    """Read the single cpu_liveness row (primary-key lookup)"""
+    global _cpu_liveness, _cpu_last_seen
+    
+    if not _db_executor:
+        return
+    
+    try:
+        rows = _db_executor.execute("""
+            SELECT pid, state, started_at, heartbeat, commands, avg_chsh, version
+            FROM cpu_liveness WHERE id = 1
+        """)
+        if rows:
+            _cpu_liveness = dict(rows[0])
+            if _cpu_liveness['state'] == 'running' and _cpu_liveness['heartbeat']:
+                _cpu_last_seen = max(_cpu_last_seen, _cpu_liveness['heartbeat'])
+    except Exception as e:
+        _log(f"CPU liveness read error: {e}")
+
+
 def _check_cpu_health() -> bool:
-    """Check if CPU is responding"""
+    """Check if CPU is responding (in-memory; liveness is refreshed in the background)"""
     global _db_executor, _cpu_last_seen, _cpu_in_process_running
     
     if not _db_executor:
@@ -271,18 +856,8 @@ def _check_cpu_health() -> bool:
         return True
     
     try:
-        # Check if CPU has processed anything recently (last 30 seconds)
-        cutoff = time.time() - 30.0
-        rows = _db_executor.execute("""
-            SELECT COUNT(*) as c FROM quantum_ipc 
-            WHERE sender = 'QUNIX_CPU' 
-            AND timestamp > ?
-        """, (cutoff,))
-        
-        recent_activity = rows[0]['c'] if rows else 0
-        
-        if recent_activity > 0:
-            _cpu_last_seen = time.time()
+        # Heartbeat written within the timeout
+        if (time.time() - _cpu_last_seen) < _cpu_heartbeat_timeout:
             return True
         
         # Check if CPU process is still running
@@ -665,6 +1240,35 @@ CREATE TABLE IF NOT EXISTS quantum_ipc (
     processed INTEGER DEFAULT 0
 );
 
+-- Streamed response chunks (CPU appends, bus forwards as they land)
+CREATE TABLE IF NOT EXISTS packet_chunks (
+    chunk_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    packet_id INTEGER NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    total_chunks INTEGER NOT NULL,
+    chunk_data BLOB,
+    chunk_size INTEGER,
+    chunk_hash BLOB,
+    epr_pairs TEXT,
+    transmitted INTEGER DEFAULT 0,
+    received INTEGER DEFAULT 0,
+    verified INTEGER DEFAULT 0,
+    transmission_timestamp REAL,
+    UNIQUE(packet_id, chunk_index)
+);
+
+-- Single-row CPU heartbeat (rewritten in place by the CPU loop)
+CREATE TABLE IF NOT EXISTS cpu_liveness (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    pid INTEGER,
+    state TEXT,
+    started_at REAL,
+    heartbeat REAL,
+    commands INTEGER DEFAULT 0,
+    avg_chsh REAL,
+    version TEXT
+);
+
 -- CPU qubit allocator (required by CPU)
 CREATE TABLE IF NOT EXISTS cpu_qubit_allocator (
     qubit_id INTEGER PRIMARY KEY,
@@ -685,14 +1289,18 @@ CREATE INDEX IF NOT EXISTS idx_quantum_ipc_direction ON quantum_ipc(direction, p
 CREATE INDEX IF NOT EXISTS idx_quantum_ipc_processed ON quantum_ipc(processed);
 CREATE INDEX IF NOT EXISTS idx_quantum_ipc_timestamp ON quantum_ipc(timestamp);
 CREATE INDEX IF NOT EXISTS idx_cpu_qubit_alloc ON cpu_qubit_allocator(allocated);
+CREATE INDEX IF NOT EXISTS idx_chunk_packet ON packet_chunks(packet_id);
+CREATE INDEX IF NOT EXISTS idx_chunk_state ON packet_chunks(transmitted, received, verified);
 """
 
 
 def _initialize_terminal_tables():
-    global _db_executor
+    global _db_executor, _output_buffer
     try:
         _db_executor.executescript(TERMINAL_SCHEMA)
-        _log("✓ Terminal tables initialized")
+        _output_buffer = TerminalOutputBuffer(_db_executor, on_flush=_output_flushed,
+                                              on_prune=_prune_output_watches)
+        _log("✓ Terminal tables initialized (write-behind output buffer)")
         return True
     except Exception as e:
         _log(f"ERROR: Terminal tables init failed: {e}")
@@ -720,6 +1328,17 @@ def _initialize_quantum_channel():
             _log("ERROR: cpu_qubit_allocator table not created")
             return False
         
+        # Request tracing: trace table + quantum_ipc.trace_id migration
+        _db_executor.executescript(qunix_trace.TRACE_SCHEMA)
+        columns = [r['name'] for r in _db_executor.execute("PRAGMA table_info(quantum_ipc)")]
+        if qunix_trace.IPC_TRACE_COLUMN not in columns:
+            _log("Migrating quantum_ipc: adding trace_id")
+            try:
+                _db_executor.execute_write(qunix_trace.IPC_TRACE_MIGRATION)
+            except sqlite3.OperationalError as e:
+                if 'duplicate column' not in str(e):  # CPU got there first
+                    raise
+        
         # Check qubit count
         rows = _db_executor.execute("SELECT COUNT(*) as c FROM cpu_qubit_allocator")
         qubit_count = rows[0]['c'] if rows else 0
@@ -779,7 +1398,8 @@ def _init_quantum_bus() -> bool:
     global _quantum_bus
     try:
         from quantum_mega_bus import QuantumMegaBus
-        _quantum_bus = QuantumMegaBus(_db_path)
+        # Packet writes go through the pool's single writer thread
+        _quantum_bus = QuantumMegaBus(_db_path, db_writer=_db_executor)
         _quantum_bus.start()
         _log("✓ QuantumMegaBus initialized")
         with _metrics_lock:
@@ -795,9 +1415,14 @@ def _init_quantum_bus() -> bool:
 
 
 def _init_executor() -> bool:
-    global _executor
+    global _executor, _text_renderer, _json_renderer
     if _quantum_bus:
+        # Results arrive as structured frames and are rendered here
+        from qunix_render import TextRenderer, JsonRenderer
+        _text_renderer = TextRenderer()
+        _json_renderer = JsonRenderer()
         _executor = _quantum_bus
+        _start_input_workers()
         _log("✓ Using QuantumMegaBus as executor")
         return True
     
@@ -901,6 +1526,7 @@ def _init_system():
             
             _initialized = True
             _init_error = None
+            _start_health_refresher()
             _log("✓ SYSTEM READY")
             return True
             
@@ -938,15 +1564,11 @@ def serve_static(filename):
 
 @app.route('/api/terminal/start', methods=['POST'])
 def api_terminal_start():
-    if not _db_executor:
+    if not _output_buffer:
         return jsonify({'success': False, 'error': 'Not ready'}), 503
     try:
         session_id = secrets.token_hex(16)
-        now = time.time()
-        _db_executor.execute_write(
-            'INSERT INTO terminal_sessions (session_id, status, created, last_activity) VALUES (?, ?, ?, ?)',
-            (session_id, 'active', now, now)
-        )
+        _output_buffer.open_session(session_id, time.time())
         
         cpu_status = _metrics['cpu_status']
         cpu_indicator = "🟢" if cpu_status == 'online' else "🔴"
@@ -961,77 +1583,413 @@ def api_terminal_start():
             "  Type '\033[38;5;87mhelp\033[0m' for commands\r\n"
             "\r\n\033[38;5;213mqunix>\033[0m "
         )
-        _db_executor.execute_write(
-            'INSERT INTO terminal_output (session_id, data, ts) VALUES (?, ?, ?)',
-            (session_id, welcome, now)
-        )
+        _append_output(session_id, welcome)
         return jsonify({'success': True, 'session_id': session_id})
     except Exception as e:
         _log(f"Terminal start error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+class _SessionWatch:
+    """Newest output id seen for one session; its own condition wakes only its polls"""
+    
+    __slots__ = ('latest', 'cond', 'waiters', 'touched')
+    
+    def __init__(self):
+        self.latest = 0
+        self.cond = threading.Condition(_output_lock)
+        self.waiters = 0
+        self.touched = time.time()
+
+
+def _watch(session_id: str) -> _SessionWatch:
+    """Session's watch, created on first use (caller holds _output_lock)"""
+    watch = _output_watches.get(session_id)
+    if watch is None:
+        watch = _output_watches[session_id] = _SessionWatch()
+    return watch
+
+
+def _note_output(session_id: str, row_id: int):
+    """Record output up to row_id and wake that session's long-polls"""
+    with _output_lock:
+        watch = _watch(session_id)
+        watch.touched = time.time()
+        if row_id > watch.latest:
+            watch.latest = row_id
+            watch.cond.notify_all()
+
+
+def _prune_output_watches(cutoff: float):
+    """Forget sessions idle since cutoff that nobody is waiting on"""
+    with _output_lock:
+        for sid in [sid for sid, watch in _output_watches.items()
+                    if watch.touched < cutoff and not watch.waiters]:
+            del _output_watches[sid]
+
+
+def _append_output(session_id: str, text: str):
+    """Queue a chunk of terminal output; _output_flushed publishes it"""
+    _output_buffer.append(session_id, text)
+
+
+def _output_flushed(rows: list):
+    """Wake long-polls and push rows to sockets once they have their ids"""
+    for session_id, row_id, text in rows:
+        _note_output(session_id, row_id)
+        if socketio:
+            socketio.emit('output', {'id': row_id, 'text': text}, to=session_id)
+
+
+def _wait_for_output(session_id: str, last_id: int, timeout: float) -> bool:
+    """Block until this process writes output after last_id; False on timeout"""
+    deadline = time.time() + timeout
+    with _output_lock:
+        watch = _watch(session_id)
+        watch.waiters += 1
+        try:
+            while watch.latest <= last_id:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                watch.cond.wait(remaining)
+        finally:
+            watch.waiters -= 1
+            watch.touched = time.time()
+    return True
+
+
+def _read_output(session_id: str, last_id: int, from_db: bool = False) -> list:
+    """Terminal output rows after last_id (from_db=True bypasses the ring)"""
+    return _output_buffer.read(session_id, last_id, from_db=from_db)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TERMINAL COMMAND WORKERS
+# ═══════════════════════════════════════════════════════════════════════════
+#
+# /api/terminal/input only admits and enqueues; commands run here and their
+# output lands in terminal_output (and on the Socket.IO room). Each worker
+# owns a queue and a session always maps to the same one, so a session's
+# commands run in order while WSGI workers never wait on the CPU.
+
+PROMPT = "\r\n\033[38;5;213mqunix>\033[0m "
+
+
+def _start_input_workers():
+    if _input_threads:
+        return
+    for i in range(_terminal_workers):
+        q = queue.Queue(maxsize=_terminal_queue_max)
+        t = threading.Thread(target=_input_worker, args=(q,), daemon=True,
+                             name=f"TerminalWorker-{i}")
+        _input_queues.append(q)
+        _input_threads.append(t)
+        t.start()
+    _log(f"✓ {_terminal_workers} terminal workers started")
+
+
+def _input_worker(q: queue.Queue):
+    while True:
+        job = q.get()
+        if job is None:
+            break
+        request_id, session_id, input_data, trace = job
+        started = trace['dequeued'] = time.time()
+        QUEUE_WAIT_SECONDS.observe(started - trace['enqueued'])
+        _set_request_status(request_id, 'running')
+        try:
+            status = _run_terminal_command(session_id, input_data, trace)
+        except Exception as e:
+            _log(f"Terminal worker error: {e}")
+            status = 'error'
+        trace['done'] = time.time()
+        trace['status'] = status
+        COMMAND_SECONDS.observe(trace['done'] - started, status=status)
+        _record_trace(trace)
+        _set_request_status(request_id, status)
+        if socketio:
+            socketio.emit('complete', {'request_id': request_id, 'status': status}, to=session_id)
+
+
+def _record_trace(trace: Dict[str, Any]):
+    """Queue the Flask and bus span columns; nothing waits on the commit"""
+    try:
+        _db_executor.submit_write(*qunix_trace.upsert(trace))
+    except Exception as e:
+        _log(f"Trace write error: {e}")
+
+
+def _set_request_status(request_id: str, status: str):
+    with _requests_lock:
+        _requests[request_id] = status
+        _requests.move_to_end(request_id)
+        while len(_requests) > _request_history:
+            _requests.popitem(last=False)
+
+
+def _handle_terminal_input(session_id: str, input_data: str) -> Tuple[Dict[str, Any], int]:
+    """Admit and enqueue one line of terminal input; shared by HTTP and Socket.IO"""
+    _log(f"Input: [{input_data}]")
+    
+    if not input_data:
+        _append_output(session_id, PROMPT)
+        return {'success': True}, 200
+    
+    rejected = _executor.admit(session_id, input_data)
+    if rejected:
+        # Rejected before reaching the CPU: answer fast with a hint
+        with _metrics_lock:
+            _metrics['rejected'] += 1
+        _append_output(session_id, "\r\n" + _text_renderer.render(rejected) + PROMPT)
+        return {'success': False, 'error': 'Rate limited',
+                'retry_after': rejected['retry_after']}, 429
+    
+    # The request ID doubles as the trace ID carried to the CPU
+    request_id = secrets.token_hex(8)
+    trace = {'trace_id': request_id, 'command': input_data[:200], 'enqueued': time.time()}
+    try:
+        _input_queues[hash(session_id) % len(_input_queues)].put_nowait(
+            (request_id, session_id, input_data, trace)
+        )
+    except queue.Full:
+        _executor.cancel_admitted()
+        _append_output(session_id, "\r\n\033[93mTerminal busy - try again\033[0m" + PROMPT)
+        return {'success': False, 'error': 'Queue full', 'retry_after': 1.0}, 503
+    
+    _set_request_status(request_id, 'queued')
+    return {'success': True, 'request_id': request_id, 'trace_id': request_id,
+            'status': 'queued'}, 202
+
+
+def _run_terminal_command(session_id: str, input_data: str,
+                          trace: Optional[Dict[str, Any]] = None) -> str:
+    """Run an admitted command, streaming rendered output to the session"""
+    renderer = _json_renderer if '--json' in input_data.lower().split() else _text_renderer
+    rendered = []
+    last_header = []
+    
+    def _forward_doc(doc):
+        # Each result document is rendered and reaches the session
+        # as soon as the bus has a complete frame
+        if doc['type'] == 'header':
+            last_header.append(doc['title'])
+        header_sent = doc['type'] == 'histogram' and doc.get('title') in last_header
+        text = renderer.render(doc, header_sent=header_sent)
+        if not text:
+            return
+        if renderer is _json_renderer and rendered:
+            text = "\r\n" + text
+        _append_output(session_id, text if rendered else "\r\n" + text)
+        rendered.append(len(text))
+    
+    try:
+        docs = _executor.execute_admitted(input_data, timeout=10.0, on_doc=_forward_doc,
+                                          trace=trace)
+        
+        with _metrics_lock:
+            _metrics['commands_sent'] += 1
+            if docs is not None:
+                _metrics['results_received'] += 1
+            else:
+                _metrics['timeouts'] += 1
+        
+        if docs is not None:
+            status, output = 'done', PROMPT
+        else:
+            status, output = 'timeout', "\r\n\033[91mTimeout - CPU not responding\033[0m" + PROMPT
+    except Exception as e:
+        _log(f"Executor error: {e}")
+        status, output = 'error', f"\r\n\033[91mError: {e}\033[0m" + PROMPT
+    
+    _append_output(session_id, output)
+    _output_buffer.touch(session_id)
+    return status
+
+
 @app.route('/api/terminal/input', methods=['POST'])
 def api_terminal_input():
-    if not _executor or not _db_executor:
+    """Enqueue a command; returns 202 with a request_id before it runs"""
+    if not _executor or not _output_buffer:
         return jsonify({'success': False, 'error': 'Not ready'}), 503
     try:
         data = request.get_json()
         session_id = data.get('session_id')
         input_data = data.get('data', '').rstrip('\r\n').strip()
         
-        _log(f"Input: [{input_data}]")
-        
-        if not input_data:
-            output = "\r\n\033[38;5;213mqunix>\033[0m "
+        payload, status = _handle_terminal_input(session_id, input_data)
+        response = jsonify(payload)
+        if 'retry_after' in payload:
+            response.headers['Retry-After'] = str(max(1, int(payload['retry_after'] + 0.999)))
+        return response, status
+    except Exception as e:
+        _log(f"Terminal input error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/terminal/request/<request_id>')
+def api_terminal_request(request_id):
+    """Status of an enqueued command: queued, running, done, timeout or error"""
+    with _requests_lock:
+        status = _requests.get(request_id)
+    if status is None:
+        return jsonify({'success': False, 'error': 'Unknown request'}), 404
+    return jsonify({'success': True, 'request_id': request_id, 'status': status})
+
+
+@app.route('/api/trace')
+@app.route('/api/trace/<trace_id>')
+def api_trace(trace_id=None):
+    """
+    Latency breakdown of a traced terminal command (trace_id = request_id;
+    a prefix works), or the most recent traces without one. ?format=text
+    returns the same ANSI rendering as the terminal 'trace' command.
+    """
+    if not _db_executor:
+        return jsonify({'success': False, 'error': 'Not ready'}), 503
+    try:
+        if trace_id is None:
+            limit = min(request.args.get('limit', qunix_trace.RECENT_LIMIT, type=int), 100)
+            doc = qunix_trace.traces_document(_db_executor.execute(*qunix_trace.recent_sql(limit)))
         else:
-            try:
-                result = _executor.execute_command(input_data, timeout=10.0)
-                with _metrics_lock:
-                    _metrics['commands_sent'] += 1
-                    if result:
-                        _metrics['results_received'] += 1
-                    else:
-                        _metrics['timeouts'] += 1
-                
-                if result:
-                    output = f"\r\n{result}\r\n\033[38;5;213mqunix>\033[0m "
-                else:
-                    output = "\r\n\033[91mTimeout - CPU not responding\033[0m\r\n\033[38;5;213mqunix>\033[0m "
-            except Exception as e:
-                _log(f"Executor error: {e}")
-                output = f"\r\n\033[91mError: {e}\033[0m\r\n\033[38;5;213mqunix>\033[0m "
+            rows = _db_executor.execute(*qunix_trace.lookup_sql(trace_id.lower()))
+            doc = qunix_trace.trace_document(rows[0] if rows else None, trace_id)
+            if doc['type'] == 'error':
+                return jsonify({'success': False, 'error': doc['message']}), 404
         
-        _db_executor.execute_write(
-            'INSERT INTO terminal_output (session_id, data, ts) VALUES (?, ?, ?)',
-            (session_id, output, time.time())
-        )
-        _db_executor.execute_write(
-            'UPDATE terminal_sessions SET last_activity = ? WHERE session_id = ?',
-            (time.time(), session_id)
-        )
-        return jsonify({'success': True})
+        if request.args.get('format') == 'text' and _text_renderer:
+            return Response(_text_renderer.render(doc), mimetype='text/plain')
+        return jsonify(doc)
     except Exception as e:
-        _log(f"Terminal input error: {e}")
+        _log(f"Trace lookup error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/terminal/output/<session_id>')
 def api_terminal_output(session_id):
-    if not _db_executor:
+    """
+    Polling fallback for clients without a Socket.IO connection
+    
+    With ?wait=N (seconds, capped) the request is held as a long-poll until
+    output after last_id is written or the wait expires. The database is
+    read only when this process has seen new output for the session, on
+    the first poll, and once per expired wait (covers other processes).
+    """
+    if not _output_buffer:
         return jsonify({'data': []})
     try:
         last_id = request.args.get('last_id', 0, type=int)
-        rows = _db_executor.execute(
-            'SELECT id, data FROM terminal_output WHERE session_id = ? AND id > ? ORDER BY id LIMIT 50',
-            (session_id, last_id)
-        )
-        return jsonify({'data': [{'id': r['id'], 'text': r['data']} for r in rows]})
+        wait = min(max(request.args.get('wait', 0.0, type=float), 0.0), _longpoll_max_wait)
+        
+        with _metrics_lock:
+            _metrics['output_polls'] += 1
+        
+        if wait and session_id not in _output_watches:
+            # First poll since this process started: the table is the only source
+            rows = _read_output(session_id, last_id, from_db=True)
+            _note_output(session_id, rows[-1]['id'] if rows else last_id)
+            if rows:
+                return jsonify({'data': rows})
+        
+        # An expired wait reads the table: other processes may have written
+        expired = bool(wait) and not _wait_for_output(session_id, last_id, wait)
+        
+        rows = _read_output(session_id, last_id, from_db=expired)
+        if rows:
+            _note_output(session_id, rows[-1]['id'])
+        return jsonify({'data': rows})
     except Exception as e:
         _log(f"Output error: {e}")
         return jsonify({'data': []})
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# SOCKET.IO PUSH CHANNEL
+# ═══════════════════════════════════════════════════════════════════════════
+#
+# Clients join a room named after their terminal session; _append_output
+# emits every new row to that room. Input can be sent over the socket too.
+# The HTTP endpoints above stay as the fallback.
+
+if socketio:
+    @socketio.on('join')
+    def ws_join(data):
+        """Subscribe to a session's output; replays rows after last_id"""
+        session_id = (data or {}).get('session_id')
+        if not session_id or not _output_buffer:
+            return {'success': False, 'error': 'Not ready'}
+        try:
+            # Join before reading so no row falls between replay and push
+            join_room(session_id)
+            return {'success': True,
+                    'data': _read_output(session_id, int(data.get('last_id', 0)))}
+        except Exception as e:
+            _log(f"Socket join error: {e}")
+            return {'success': False, 'error': str(e)}
+    
+    @socketio.on('input')
+    def ws_input(data):
+        """Terminal input over the socket; acks once enqueued, output arrives as 'output' events"""
+        if not _executor or not _output_buffer:
+            return {'success': False, 'error': 'Not ready'}
+        try:
+            session_id = data.get('session_id')
+            input_data = data.get('data', '').rstrip('\r\n').strip()
+            payload, _ = _handle_terminal_input(session_id, input_data)
+            return payload
+        except Exception as e:
+            _log(f"Socket input error: {e}")
+            return {'success': False, 'error': str(e)}
+
+
+@app.route('/api/execute', methods=['POST'])
+def api_execute():
+    """
+    Batch execution endpoint
+    
+    Returns the result documents as concatenated binary frames
+    (decode with qunix_render.pop_frames), or as JSON with ?format=json.
+    """
+    if not _executor:
+        return jsonify({'success': False, 'error': 'Not ready'}), 503
+    try:
+        data = request.get_json()
+        command = data.get('command', '').strip()
+        timeout = min(float(data.get('timeout', 10.0)), 30.0)
+        session_id = data.get('session_id') or f"addr:{request.remote_addr}"
+        
+        docs = _executor.execute_command_structured(command, timeout=timeout, session_id=session_id)
+        
+        if docs and docs[0]['type'] == 'rejected':
+            with _metrics_lock:
+                _metrics['rejected'] += 1
+            retry_after = docs[0]['retry_after']
+            response = jsonify({'success': False, 'error': 'Rate limited',
+                                'reason': docs[0]['reason'], 'retry_after': retry_after})
+            response.headers['Retry-After'] = str(max(1, int(retry_after + 0.999)))
+            return response, 429
+        
+        with _metrics_lock:
+            _metrics['commands_sent'] += 1
+            if docs is not None:
+                _metrics['results_received'] += 1
+            else:
+                _metrics['timeouts'] += 1
+        
+        if docs is None:
+            return jsonify({'success': False, 'error': 'Timeout - CPU not responding'}), 504
+        
+        if request.args.get('format') == 'json':
+            return jsonify({'success': True, 'results': docs})
+        
+        from qunix_render import encode_result
+        return Response(b''.join(encode_result(doc) for doc in docs),
+                        mimetype='application/x-qunix-frames')
+    except Exception as e:
+        _log(f"Execute error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @app.route('/api/cpu/restart', methods=['POST'])
 def api_cpu_restart():
     """Manual CPU restart endpoint"""
@@ -1066,8 +2024,12 @@ def api_cpu_restart():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
-@app.route('/health')
-def health():
+# ═══════════════════════════════════════════════════════════════════════════
+# HEALTH SNAPSHOT
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _build_health_snapshot() -> Dict[str, Any]:
+    """Assemble /health from in-memory state; no DB work"""
     with _metrics_lock:
         metrics_copy = _metrics.copy()
     
@@ -1078,7 +2040,9 @@ def health():
             _metrics['cpu_status'] = 'online'
         metrics_copy['cpu_status'] = 'online'
     
-    return jsonify({
+    liveness = _cpu_liveness
+    
+    return {
         'status': 'healthy' if _initialized else 'initializing',
         'version': VERSION,
         'database': {
@@ -1090,11 +2054,136 @@ def health():
             'pid': _cpu_process.pid if _cpu_process else None,
             'running': _cpu_process.poll() is None if _cpu_process else False,
             'restarts': metrics_copy['cpu_restarts'],
-            'start_attempts': _cpu_start_attempts
+            'start_attempts': _cpu_start_attempts,
+            'heartbeat_age': (time.time() - liveness['heartbeat']
+                              if liveness and liveness['heartbeat'] else None),
+            'liveness': liveness
         },
         'metrics': metrics_copy,
+        'admission': _quantum_bus.admission.get_stats() if _quantum_bus else None,
+        'output_buffer': _output_buffer.get_stats() if _output_buffer else None,
+        'db_pool': _db_executor.get_stats() if _db_executor else None,
         'timestamp': time.time()
-    })
+    }
+
+
+def _refresh_health():
+    """Refresh liveness and swap in a new snapshot"""
+    global _health_snapshot
+    _refresh_cpu_liveness()
+    snapshot = _build_health_snapshot()
+    with _health_lock:
+        _health_snapshot = snapshot
+
+
+def _health_refresher():
+    _log(f"Health refresher started ({_health_interval}s)")
+    while not _health_stop.is_set():
+        try:
+            _refresh_health()
+        except Exception as e:
+            _log(f"Health refresh error: {e}")
+        _health_stop.wait(_health_interval)
+    _log("Health refresher stopped")
+
+
+def _start_health_refresher():
+    global _health_thread
+    if _health_thread and _health_thread.is_alive():
+        return
+    _health_stop.clear()
+    _health_thread = threading.Thread(target=_health_refresher, daemon=True,
+                                      name="HealthRefresher")
+    _health_thread.start()
+
+
+@app.route('/health')
+def health():
+    """Serve the latest background snapshot (O(1), no DB access)"""
+    with _health_lock:
+        snapshot = _health_snapshot
+    
+    if snapshot is None:
+        # Refresher not running yet (still initializing)
+        snapshot = _build_health_snapshot()
+    
+    return jsonify(dict(snapshot, snapshot_age=time.time() - snapshot['timestamp']))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# METRICS EXPOSITION
+# ═══════════════════════════════════════════════════════════════════════════
+
+_FLASK_COUNTERS = {
+    'commands_sent': 'Terminal commands sent to the bus',
+    'results_received': 'Terminal commands with a result',
+    'timeouts': 'Terminal commands that timed out',
+    'rejected': 'Terminal commands rejected by admission control',
+    'output_polls': 'Terminal output polls served',
+    'cpu_restarts': 'CPU restarts by the health monitor',
+    'packets_cleaned': 'Stuck IPC packets cleaned',
+}
+
+
+def _collect_flask_metrics() -> list:
+    """Flask counters, DB pool, output buffer and EPR pool as metric samples"""
+    with _metrics_lock:
+        metrics_copy = _metrics.copy()
+    
+    samples = [(f'qunix_flask_{key}', 'counter', help, metrics_copy[key])
+               for key, help in _FLASK_COUNTERS.items()]
+    samples.append(('qunix_cpu_up', 'gauge', 'CPU heartbeat within timeout',
+                    1 if _check_cpu_health() else 0))
+    samples.append(('qunix_terminal_queue_depth', 'gauge', 'Commands waiting for a terminal worker',
+                    sum(q.qsize() for q in _input_queues)))
+    
+    if _db_executor:
+        pool = _db_executor.get_stats()
+        samples += [
+            ('qunix_db_readers_in_use', 'gauge', 'Pool readers checked out', pool['readers_in_use']),
+            ('qunix_db_readers', 'gauge', 'Pool reader connections', pool['readers']),
+            ('qunix_db_write_queue', 'gauge', 'Write intents waiting for the writer', pool['write_queue']),
+            ('qunix_db_write_errors', 'counter', 'Write intents that failed', pool['write_errors']),
+            ('qunix_db_checkout_timeouts', 'counter', 'Reader checkouts that timed out', pool['timeouts']),
+            ('qunix_db_commit_retries', 'counter', 'Group commits retried on contention', pool['commit_retries']),
+            ('qunix_db_recycled', 'counter', 'Pool connections replaced', pool['recycled']),
+        ]
+    
+    if _output_buffer:
+        buf = _output_buffer.get_stats()
+        samples += [
+            ('qunix_output_ring_reads', 'counter', 'Output reads served from memory', buf['ring_reads']),
+            ('qunix_output_db_reads', 'counter', 'Output reads that went to the DB', buf['db_reads']),
+            ('qunix_output_rows_flushed', 'counter', 'Output rows written behind', buf['rows_flushed']),
+            ('qunix_output_flush_errors', 'counter', 'Failed output flushes', buf['flush_errors']),
+            ('qunix_output_rows_dropped', 'counter', 'Output rows dropped (unwritable or over cap)', buf['rows_dropped']),
+            ('qunix_output_pending', 'gauge', 'Output rows not yet flushed', buf['pending']),
+            ('qunix_output_sessions', 'gauge', 'Sessions with an output ring', buf['sessions']),
+        ]
+    
+    if _quantum_worker:
+        pool = _quantum_worker.get_pool_status()
+        for state, info in pool.get('by_state', {}).items():
+            samples.append(('qunix_epr_pool_pairs', 'gauge', 'EPR pairs in the pool',
+                            info['count'], {'state': state}))
+    
+    return samples
+
+
+qunix_metrics.REGISTRY.register_collector(_collect_flask_metrics)
+
+
+@app.route('/metrics')
+def metrics():
+    """OpenMetrics text: this process plus the CPU subprocess's snapshot file"""
+    cpu_families = {}
+    if _db_path:
+        cpu_families, age = qunix_metrics.read_snapshot(qunix_metrics.snapshot_path(_db_path, 'cpu'))
+        if age is not None:
+            CPU_SNAPSHOT_AGE.set(age)
+    
+    body = qunix_metrics.render(qunix_metrics.REGISTRY.snapshot(), cpu_families)
+    return Response(body, content_type=qunix_metrics.CONTENT_TYPE)
 
 
 @app.route('/')
@@ -1108,6 +2197,7 @@ def index():
 <link rel="stylesheet" href="/static/css/xterm.css"/>
 <script src="/static/js/xterm.js"></script>
 <script src="/static/js/xterm-addon-fit.js"></script>
+<script src="/static/js/socket.io.min.js"></script>
 <style>
 * { margin:0; padding:0; box-sizing:border-box; }
 body { background:#000; font-family:monospace; overflow:hidden; color:#fff; height:100vh; display:flex; flex-direction:column; }
@@ -1143,6 +2233,7 @@ body { background:#000; font-family:monospace; overflow:hidden; color:#fff; heig
   <div>
     <strong>APIs:</strong> 
     <a href="/health" target="_blank">/health</a>
+    <a href="/metrics" target="_blank">/metrics</a>
     <a href="#" onclick="restartCPU(); return false;">/api/cpu/restart</a>
   </div>
   <div>Quantum Computing Interface | Auto-restart enabled</div>
@@ -1162,8 +2253,12 @@ let lastOutputId = 0;
 let inputBuffer = '';
 let ready = false;
 let isProcessing = false;
-let pollTimer = null;
+let polling = false;
 let healthTimer = null;
+let socket = null;
+let pushActive = false;
+let pendingPush = [];
+let promptGuard = null;
 
 async function startSession() {
   try {
@@ -1181,8 +2276,8 @@ async function startSession() {
     
     sessionId = data.session_id;
     
-    if (pollTimer) clearInterval(pollTimer);
-    pollTimer = setInterval(poll, 200);
+    startPolling();
+    connectPush();
     
     if (healthTimer) clearInterval(healthTimer);
     healthTimer = setInterval(updateHealth, 5000);
@@ -1193,27 +2288,70 @@ async function startSession() {
   }
 }
 
-async function poll() {
-  if (!sessionId) return;
+function writeItem(item) {
+  // Push and poll can overlap; ids are monotonic per session
+  if (item.id <= lastOutputId) return;
+  lastOutputId = item.id;
+  term.write(item.text);
   
-  try {
-    const r = await fetch(`/api/terminal/output/${sessionId}?last_id=${lastOutputId}`);
-    const data = await r.json();
-    
-    if (data.data && data.data.length > 0) {
-      data.data.forEach(item => {
-        term.write(item.text);
-        if (item.id > lastOutputId) lastOutputId = item.id;
-        
-        if (!ready && item.text.includes('qunix>')) {
-          ready = true;
-          setTimeout(() => term.focus(), 100);
-        }
-      });
+  if (item.text.includes('qunix>')) {
+    promptArrived();
+    if (!ready) {
+      ready = true;
+      setTimeout(() => term.focus(), 100);
+    }
+  }
+}
+
+function connectPush() {
+  // Socket.IO push; long-polling stays active until the socket has joined
+  if (typeof io === 'undefined' || socket) return;
+  
+  socket = io();
+  
+  socket.on('connect', () => {
+    pendingPush = [];
+    socket.emit('join', {session_id: sessionId, last_id: lastOutputId}, (ack) => {
+      if (!ack || !ack.success) return;
+      (ack.data || []).forEach(writeItem);
+      pendingPush.forEach(writeItem);
+      pendingPush = [];
+      pushActive = true;
+    });
+  });
+  
+  socket.on('output', (item) => {
+    if (pushActive) writeItem(item);
+    else pendingPush.push(item);
+  });
+  
+  socket.on('disconnect', () => {
+    pushActive = false;
+    startPolling();
+  });
+}
+
+function startPolling() {
+  if (polling) return;
+  polling = true;
+  pollLoop();
+}
+
+async function pollLoop() {
+  // Long-poll: the server holds each request until output exists or 20 s pass
+  while (sessionId && !pushActive) {
+    try {
+      const r = await fetch(`/api/terminal/output/${sessionId}?last_id=${lastOutputId}&wait=20`);
+      const data = await r.json();
+      
+      if (data.data && data.data.length > 0) {
+        data.data.forEach(writeItem);
+      }
+    } catch (e) {
+      await new Promise((resolve) => setTimeout(resolve, 1000));
     }
-  } catch (e) {
-    // Silent
   }
+  polling = false;
 }
 
 async function updateHealth() {
@@ -1238,21 +2376,44 @@ async function updateHealth() {
   }
 }
 
+function awaitPrompt() {
+  // Input returns at once; the command's output and next prompt arrive later
+  isProcessing = true;
+  clearTimeout(promptGuard);
+  promptGuard = setTimeout(promptArrived, 15000);
+}
+
+function promptArrived() {
+  isProcessing = false;
+  clearTimeout(promptGuard);
+}
+
 async function sendInput(data) {
   if (!sessionId || !ready || isProcessing) return;
   
-  isProcessing = true;
+  awaitPrompt();
   
   try {
-    await fetch('/api/terminal/input', { 
-      method:'POST', 
-      headers:{'Content-Type':'application/json'}, 
-      body:JSON.stringify({session_id:sessionId, data:data}) 
-    });
+    let accepted;
+    if (pushActive) {
+      const ack = await new Promise((resolve) => {
+        const guard = setTimeout(() => resolve(null), 5000);
+        socket.emit('input', {session_id:sessionId, data:data}, (ack) => { clearTimeout(guard); resolve(ack); });
+      });
+      accepted = ack && (ack.success || ack.retry_after !== undefined);
+    } else {
+      const r = await fetch('/api/terminal/input', { 
+        method:'POST', 
+        headers:{'Content-Type':'application/json'}, 
+        body:JSON.stringify({session_id:sessionId, data:data}) 
+      });
+      // 429/503 still write a prompt to the session
+      accepted = r.ok || r.status === 429 || r.status === 503;
+    }
+    if (!accepted) promptArrived();
   } catch (e) { 
     term.write('\\r\\n\\x1b[91mError\\x1b[0m\\r\\n'); 
-  } finally {
-    isProcessing = false;
+    promptArrived();
   }
 }
 
@@ -1306,8 +2467,8 @@ term.onData(async (data) => {
 });
 
 window.addEventListener('beforeunload', () => {
-  if (pollTimer) clearInterval(pollTimer);
   if (healthTimer) clearInterval(healthTimer);
+  if (socket) socket.disconnect();
 });
 
 startSession();
@@ -1326,6 +2487,14 @@ def shutdown_handler():
     _cpu_should_run = False
     _cpu_in_process_running = False
     _stop_cpu_process()
+    _health_stop.set()
+    
+    # Stop terminal workers
+    for q in _input_queues:
+        try:
+            q.put_nowait(None)
+        except queue.Full:
+            pass
     
     # Stop quantum components
     if _quantum_worker:
@@ -1341,6 +2510,13 @@ def shutdown_handler():
         except:
             pass
     
+    # Persist buffered terminal output
+    if _output_buffer:
+        try:
+            _output_buffer.stop()
+        except:
+            pass
+    
     # Close database
     if _db_executor:
         try:
@@ -1364,4 +2540,8 @@ if __name__ == '__main__':
     print("Health:    http://localhost:5000/health")
     print()
     
-    app.run(host='0.0.0.0', port=5000, debug=True, threaded=True, use_reloader=True)
\ No newline at end of file
+    if socketio:
+        socketio.run(app, host='0.0.0.0', port=5000, debug=True, use_reloader=True,
+                     allow_unsafe_werkzeug=True)
+    else:
+        app.run(host='0.0.0.0', port=5000, debug=True, threaded=True, use_reloader=True)
\ No newline at end of file
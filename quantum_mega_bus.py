@@ -10,6 +10,9 @@
 ║  ✓ No views, no schema detection complexity                                  ║
 ║  ✓ Fixed response polling with proper cleanup                                ║
 ║  ✓ Sends FLASK_TO_CPU, receives CPU_TO_FLASK                                 ║
+║  ✓ Streamed responses via packet_chunks                                      ║
+║  ✓ Binary result frames, rendered at the terminal edge                       ║
+║  ✓ Per-session token-bucket admission control                                ║
 ║                                                                               ║
 ╚═══════════════════════════════════════════════════════════════════════════════╝
 """
@@ -18,8 +21,17 @@ import sqlite3
 import numpy as np
 import time
 import sys
+import zlib
+import struct
+import threading
+from math import sqrt
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Callable, List, Any, Tuple, Union
+
+import qunix_db
+import qunix_metrics
+import qunix_trace
+from qunix_render import pop_frames
 
 try:
     from qiskit import QuantumCircuit, transpile
@@ -47,28 +59,45 @@ class C:
 DIRECTION_FLASK_TO_CPU = 'FLASK_TO_CPU'
 DIRECTION_CPU_TO_FLASK = 'CPU_TO_FLASK'
 
+# Adaptive EPR sampling for the per-command CHSH tag
+SHOT_BATCH = 128               # Shots per adaptive increment
+EPR_MAX_SHOTS = 1000           # Hard cap
+EPR_CHSH_TOLERANCE = 0.02      # Target 95% CI half-width on CHSH
+CONFIDENCE_Z = 1.96
+
+# Admission control (token bucket per terminal session)
+ADMISSION_RATE = 2.0           # Tokens refilled per second
+ADMISSION_BURST = 12.0         # Bucket capacity
+ADMISSION_MAX_BACKLOG = 8      # Admitted commands in flight, all sessions
+ADMISSION_IDLE_TTL = 600.0     # Drop full buckets idle this long
+DEFAULT_COMMAND_COST = 1.0     # Commands missing from command_registry
+CATEGORY_COSTS = {'SYSTEM': 0.5, 'QUANTUM': 1.0, 'GATE': 1.0, 'ALGORITHM': 3.0}
+
+# CPU aliases charged as their command_registry entry
+COMMAND_ALIASES = {
+    'hadamard': 'qh', 'pauli-x': 'qx', 'pauli_x': 'qx', 'x': 'qx',
+    'pauli-y': 'qy', 'pauli_y': 'qy', 'y': 'qy',
+    'pauli-z': 'qz', 'pauli_z': 'qz', 'z': 'qz',
+    'cnot': 'qcx', 'cx': 'qcx', 'bell': 'qcx',
+    'toffoli': 'qccx', 'ccx': 'qccx', '?': 'help',
+}
+
+# Metrics (exported by the host's /metrics)
+EPR_SECONDS = qunix_metrics.REGISTRY.histogram(
+    'qunix_bus_epr_seconds', 'Bus-side EPR pair creation time per command')
+IPC_WRITE_SECONDS = qunix_metrics.REGISTRY.histogram(
+    'qunix_bus_ipc_write_seconds', 'Command packet insert time (including writer queue wait)')
+ROUNDTRIP_SECONDS = qunix_metrics.REGISTRY.histogram(
+    'qunix_bus_roundtrip_seconds', 'Transmit to end-of-stream chunk', ['mode'])
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # DATABASE CONNECTION (WAL MODE)
 # ═══════════════════════════════════════════════════════════════════════════════
 
 def create_connection(db_path: Path) -> sqlite3.Connection:
-    """Create optimized WAL-mode connection"""
-    conn = sqlite3.connect(
-        str(db_path),
-        timeout=60.0,
-        check_same_thread=False,
-        isolation_level=None
-    )
-    conn.row_factory = sqlite3.Row
-    
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA synchronous=NORMAL")
-    conn.execute("PRAGMA busy_timeout=60000")
-    conn.execute("PRAGMA temp_store=MEMORY")
-    conn.execute("PRAGMA cache_size=-64000")
-    
-    return conn
+    """Create optimized WAL-mode connection (writer profile, autocommit)"""
+    return qunix_db.connect(db_path, profile='writer')
 
 
 def safe_execute(conn: sqlite3.Connection, sql: str, params: tuple = (), 
@@ -135,6 +164,15 @@ def verify_ipc_table(conn: sqlite3.Connection) -> bool:
     return True
 
 
+def wilson_halfwidth(successes: int, trials: int, z: float = CONFIDENCE_Z) -> float:
+    """Half-width of the Wilson score interval for a binomial proportion"""
+    if trials <= 0:
+        return 1.0
+    p = successes / trials
+    z2 = z * z
+    return z * sqrt(p * (1 - p) / trials + z2 / (4 * trials * trials)) / (1 + z2 / trials)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # BUS QUANTUM ENGINE (AER-A)
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -155,9 +193,17 @@ class BusQuantumEngine:
         
         self.noise_model = self._build_noise_model()
         
+        # The EPR circuit never changes - transpile once
+        qc = QuantumCircuit(2, 2)
+        qc.h(0)
+        qc.cx(0, 1)
+        qc.measure([0, 1], [0, 1])
+        self._epr_circuit = transpile(qc, self.simulator)
+        
         self.metrics = {
             'circuits_executed': 0,
             'epr_pairs_created': 0,
+            'shots_executed': 0,
             'total_chsh': 0.0,
             'avg_chsh': 2.0,
         }
@@ -185,16 +231,34 @@ class BusQuantumEngine:
         
         return noise_model
     
-    def create_epr_pair(self) -> Dict[str, any]:
-        """Create EPR pair with CHSH"""
-        qc = QuantumCircuit(2, 2)
-        qc.h(0)
-        qc.cx(0, 1)
-        qc.measure([0, 1], [0, 1])
+    def create_epr_pair(self, tolerance: Optional[float] = EPR_CHSH_TOLERANCE,
+                        max_shots: int = EPR_MAX_SHOTS) -> Dict[str, any]:
+        """
+        Create EPR pair with CHSH
         
-        qc_t = transpile(qc, self.simulator)
-        result = self.simulator.run(qc_t, shots=1000, noise_model=self.noise_model).result()
-        counts = result.get_counts()
+        Shots run in SHOT_BATCH increments until the 95% CI half-width on
+        CHSH is at or below tolerance, capped at max_shots. tolerance=None
+        runs max_shots in one go.
+        """
+        counts = {}
+        shots = 0
+        chsh_err = 1.0
+        
+        while shots < max_shots:
+            batch = max_shots - shots if tolerance is None else min(SHOT_BATCH, max_shots - shots)
+            result = self.simulator.run(self._epr_circuit, shots=batch,
+                                        noise_model=self.noise_model).result()
+            for outcome, count in result.get_counts().items():
+                counts[outcome] = counts.get(outcome, 0) + count
+            shots += batch
+            
+            # CHSH = 2 + 0.828·|2F - 1|
+            fidelity_err = wilson_halfwidth(counts.get('00', 0) + counts.get('11', 0), shots)
+            chsh_err = fidelity_err * 2 * 0.828
+            if tolerance is not None and chsh_err <= tolerance:
+                break
+        
+        self.metrics['shots_executed'] += shots
         
         total = sum(counts.values())
         p_00 = counts.get('00', 0) / total
@@ -212,6 +276,8 @@ class BusQuantumEngine:
         return {
             'fidelity': fidelity,
             'chsh': chsh,
+            'chsh_err': chsh_err,
+            'shots': shots,
             'quantum_advantage': chsh > 2.0,
             'counts': counts
         }
@@ -227,15 +293,23 @@ class BusQuantumEngine:
 class BusCommandExecutor:
     """Executes commands via quantum IPC - FIXED"""
     
-    def __init__(self, db_path: Path, quantum_engine: BusQuantumEngine):
+    def __init__(self, db_path: Path, quantum_engine: BusQuantumEngine, db_writer=None):
         self.db_path = db_path
         self.conn = create_connection(db_path)
+        # Response-stream poll: reader with plain tuple rows (see qunix_db.fetch_tuples)
+        self.poll_conn = qunix_db.connect(db_path, profile='reader', row_factory=None)
         self.quantum_engine = quantum_engine
+        self.db_writer = db_writer    # Host's write queue (submit_write -> Future), optional
         
         if not verify_ipc_table(self.conn):
             print(f"{C.R}FATAL: IPC table verification failed{C.E}")
             sys.exit(1)
         
+        # Packets carry quantum_ipc.trace_id
+        if not qunix_trace.ensure_trace_schema(self.conn):
+            print(f"{C.R}FATAL: request_traces setup failed{C.E}")
+            sys.exit(1)
+        
         self.stats = {
             'commands_sent': 0,
             'responses_received': 0,
@@ -244,35 +318,37 @@ class BusCommandExecutor:
         
         print(f"{C.C}[BUS] Executor initialized{C.E}")
     
-    def execute(self, command: str, timeout: float = 10.0) -> str:
-        """Execute command via quantum IPC"""
-        if not command.strip():
-            return ""
-        
-        start_time = time.time()
-        
+    def _write(self, sql: str, params: tuple, wait: bool = True) -> Optional[int]:
+        """Write via the host's writer queue when attached, else directly"""
+        if self.db_writer is not None:
+            future = self.db_writer.submit_write(sql, params)
+            return future.result(timeout=10.0) if wait else None
+        cursor = self.conn.cursor()
+        cursor.execute(sql, params)
+        return cursor.lastrowid
+    
+    def _transmit(self, command: str, trace: Optional[Dict[str, Any]] = None) -> Tuple[int, float, float]:
+        """Create the request EPR pair and insert the command packet"""
         try:
             # Create EPR pair for quantum entanglement proof
-            epr_result = self.quantum_engine.create_epr_pair()
+            with EPR_SECONDS.time():
+                epr_result = self.quantum_engine.create_epr_pair()
             chsh = epr_result['chsh']
+            chsh_err = epr_result['chsh_err']
         except Exception as epr_error:
             print(f"{C.Y}[BUS] EPR generation error: {epr_error}{C.E}")
             chsh = 2.0  # Fallback to classical
+            chsh_err = 0.0
         
-        # Encode command
-        try:
-            cmd_bytes = command.encode('utf-8')
-        except Exception as encode_error:
-            print(f"{C.R}[BUS] Command encode error: {encode_error}{C.E}")
-            return f"{C.R}Encode error: {encode_error}{C.E}"
+        cmd_bytes = command.encode('utf-8')
+        if trace is not None:
+            trace['epr_tagged'] = time.time()
         
-        # Send command to quantum_ipc
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
+        with IPC_WRITE_SECONDS.time():
+            packet_id = self._write("""
                 INSERT INTO quantum_ipc
-                (sender, direction, data, data_size, chsh_value, timestamp, processed)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                (sender, direction, data, data_size, chsh_value, timestamp, processed, trace_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 'MEGA_BUS',
                 DIRECTION_FLASK_TO_CPU,
@@ -280,15 +356,35 @@ class BusCommandExecutor:
                 len(cmd_bytes),
                 chsh,
                 time.time(),
-                0
+                0,
+                trace['trace_id'] if trace else None
             ))
-            
-            packet_id = cursor.lastrowid
-            
-            self.stats['commands_sent'] += 1
-            
-            print(f"{C.Q}[BUS] TX packet {packet_id}: '{command[:50]}...' (CHSH={chsh:.3f}){C.E}")
-            
+        
+        if trace is not None:
+            trace['sent'] = time.time()
+        
+        self.stats['commands_sent'] += 1
+        
+        print(f"{C.Q}[BUS] TX packet {packet_id}: '{command[:50]}...' (CHSH={chsh:.3f}){C.E}")
+        
+        return packet_id, chsh, chsh_err
+    
+    def execute(self, command: str, timeout: float = 10.0,
+                on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Execute command via quantum IPC
+        
+        If on_chunk is given it is called with each response chunk as soon
+        as the CPU writes it, and finally with the bus quantum tag.
+        """
+        if not command.strip():
+            return ""
+        
+        start_time = time.time()
+        
+        # Send command to quantum_ipc
+        try:
+            packet_id, chsh, chsh_err = self._transmit(command)
         except Exception as send_error:
             print(f"{C.R}[BUS] Send error: {send_error}{C.E}")
             import traceback
@@ -297,7 +393,7 @@ class BusCommandExecutor:
         
         # Wait for response
         try:
-            response = self._wait_for_result(packet_id, timeout)
+            response = self._wait_for_result(packet_id, timeout, on_chunk)
         except Exception as wait_error:
             print(f"{C.R}[BUS] Wait error: {wait_error}{C.E}")
             import traceback
@@ -308,94 +404,308 @@ class BusCommandExecutor:
         
         if response:
             self.stats['responses_received'] += 1
+            ROUNDTRIP_SECONDS.observe(elapsed / 1000, mode='text')
+            
+            # JSON clients get the CPU document untouched
+            if '--json' in command.lower().split():
+                return response
             
-            quantum_tag = f"\n{C.GRAY}[Bus CHSH: {chsh:.3f} "
+            quantum_tag = f"\n{C.GRAY}[Bus CHSH: {chsh:.3f}±{chsh_err:.3f} "
             quantum_tag += f"{'✓ quantum' if chsh > 2.0 else ''}"
             quantum_tag += f"] [{elapsed:.1f}ms]{C.E}"
             
+            if on_chunk:
+                on_chunk(quantum_tag)
+            
             return response + quantum_tag
         else:
             self.stats['timeouts'] += 1
             return (f"{C.Y}Timeout waiting for CPU ({timeout}s){C.E}\n"
                    f"Is qunix_cpu.py running?")
     
-    def _wait_for_result(self, sent_packet_id: int, timeout: float) -> Optional[str]:
+    def execute_structured(self, command: str, timeout: float = 10.0,
+                           on_doc: Optional[Callable[[Dict[str, Any]], None]] = None,
+                           arrays: bool = False,
+                           trace: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Execute command and return result documents instead of text
+        
+        The CPU answers with binary result frames (--bin); nothing is
+        rendered here. The bus adds a final {'type': 'bus'} document with
+        its CHSH and latency. Each document is passed to on_doc as soon as
+        its frame is complete. arrays=True leaves histogram counts as numpy
+        views. A trace dict (with 'trace_id') gets the bus span timestamps
+        added and its ID travels to the CPU. Returns None on timeout.
         """
-        Wait for CPU response - FIXED VERSION
+        if not command.strip():
+            return []
+        
+        start_time = time.time()
+        
+        try:
+            packet_id, chsh, chsh_err = self._transmit(command + ' --bin', trace)
+        except Exception as send_error:
+            print(f"{C.R}[BUS] Send error: {send_error}{C.E}")
+            return [{'type': 'error', 'message': f"Send error: {send_error}"}]
+        
+        buffer = bytearray()
+        docs = []
+        corrupt = []
+        
+        def _emit(doc: Dict[str, Any]):
+            docs.append(doc)
+            if on_doc:
+                on_doc(doc)
+        
+        def _on_frame_bytes(data: bytes):
+            if corrupt:
+                return  # Frame boundaries are lost; drain the rest unread
+            buffer.extend(data)
+            try:
+                frames = pop_frames(buffer, arrays=arrays)
+            except ValueError as frame_error:
+                corrupt.append(frame_error)
+                buffer.clear()
+                _emit({'type': 'error', 'message': f"Bad result frame: {frame_error}"})
+                return
+            for doc in frames:
+                _emit(doc)
+        
+        try:
+            response = self._wait_for_result(packet_id, timeout, _on_frame_bytes,
+                                             binary=True, trace=trace)
+        except Exception as wait_error:
+            print(f"{C.R}[BUS] Wait error: {wait_error}{C.E}")
+            return [{'type': 'error', 'message': f"Wait error: {wait_error}"}]
+        
+        if response is None:
+            self.stats['timeouts'] += 1
+            return None
         
-        Key fixes:
-        1. Poll for ANY CPU_TO_FLASK response (not tied to sent_packet_id)
-        2. Mark as processed immediately after reading
-        3. Better error handling
+        self.stats['responses_received'] += 1
+        
+        elapsed = time.time() - start_time
+        ROUNDTRIP_SECONDS.observe(elapsed, mode='binary')
+        
+        bus_doc = {
+            'type': 'bus',
+            'chsh': chsh,
+            'chsh_err': chsh_err,
+            'elapsed_ms': elapsed * 1000,
+        }
+        docs.append(bus_doc)
+        if on_doc:
+            on_doc(bus_doc)
+        
+        return docs
+    
+    def _wait_for_result(self, sent_packet_id: int, timeout: float,
+                         on_chunk: Optional[Callable] = None,
+                         binary: bool = False,
+                         trace: Optional[Dict[str, Any]] = None) -> Optional[Union[str, bytes]]:
+        """
+        Wait for the CPU's streamed response to sent_packet_id
+        
+        The CPU appends packet_chunks rows keyed by our request packet_id.
+        Each new chunk is forwarded to on_chunk as it lands; a chunk with
+        total_chunks > 0 marks the end of the stream. In binary mode raw
+        chunk bytes are forwarded and returned undecoded.
         """
         start = time.time()
         poll_count = 0
         last_log = time.time()
+        next_index = 0
+        parts = []
         
         while (time.time() - start) < timeout:
             poll_count += 1
             
             try:
-                cursor = self.conn.cursor()
-                
-                # Get oldest unprocessed CPU_TO_FLASK response
-                cursor.execute("""
-                    SELECT packet_id, data, chsh_value
-                    FROM quantum_ipc
-                    WHERE direction = ?
-                      AND processed = 0
-                    ORDER BY packet_id ASC
-                    LIMIT 1
-                """, (DIRECTION_CPU_TO_FLASK,))
+                # Hot poll loop: plain tuples
+                rows = qunix_db.fetch_tuples(self.poll_conn, """
+                    SELECT chunk_id, chunk_index, total_chunks, chunk_data, chunk_hash
+                    FROM packet_chunks
+                    WHERE packet_id = ?
+                      AND chunk_index >= ?
+                    ORDER BY chunk_index ASC
+                """, (sent_packet_id, next_index))
                 
-                row = cursor.fetchone()
-                
-                if row:
-                    resp_packet_id = row['packet_id']
-                    data = row['data']
-                    resp_chsh = row['chsh_value'] or 2.0
+                for chunk_id, chunk_index, total_chunks, data, chunk_hash in rows:
+                    if chunk_index != next_index:
+                        break  # Gap - wait for the missing chunk
+                    
+                    if trace is not None:
+                        trace.setdefault('first_read', time.time())
+                    
+                    data = data or b''
+                    verified = chunk_hash == struct.pack('>I', zlib.crc32(data))
                     
-                    # Mark as processed IMMEDIATELY
-                    cursor.execute("""
-                        UPDATE quantum_ipc
-                        SET processed = 1
-                        WHERE packet_id = ?
-                    """, (resp_packet_id,))
+                    # Receipt bookkeeping; nothing waits on it
+                    self._write("""
+                        UPDATE packet_chunks
+                        SET received = 1, verified = ?
+                        WHERE chunk_id = ?
+                    """, (1 if verified else 0, chunk_id), wait=False)
                     
-                    # Decode response
-                    response = ''
-                    if data:
+                    next_index += 1
+                    
+                    if data and binary:
+                        parts.append(data)
+                        if on_chunk:
+                            on_chunk(data)
+                    elif data:
                         try:
-                            if isinstance(data, bytes):
-                                response = data.decode('utf-8', errors='replace')
-                            else:
-                                response = str(data)
+                            text = data.decode('utf-8', errors='replace')
                         except Exception as e:
                             print(f"{C.Y}[BUS] Decode error: {e}{C.E}")
-                            response = f"[Decode error: {e}]"
-                    
-                    print(f"{C.G}[BUS] RX packet {resp_packet_id} (CHSH={resp_chsh:.3f}) [{poll_count} polls]{C.E}")
+                            text = f"[Decode error: {e}]"
+                        
+                        parts.append(text)
+                        if on_chunk:
+                            on_chunk(text)
                     
-                    return response
+                    if total_chunks > 0:
+                        if trace is not None:
+                            trace['last_read'] = time.time()
+                        print(f"{C.G}[BUS] RX stream {sent_packet_id} "
+                              f"({next_index} chunks) [{poll_count} polls]{C.E}")
+                        return b''.join(parts) if binary else ''.join(parts)
                 
             except Exception as e:
                 print(f"{C.Y}[BUS] Poll error: {e}{C.E}")
             
             # Log progress every 2 seconds
             if time.time() - last_log > 2.0:
-                print(f"{C.GRAY}[BUS] Waiting for response... ({poll_count} polls, {time.time()-start:.1f}s){C.E}")
+                print(f"{C.GRAY}[BUS] Waiting for response... ({poll_count} polls, "
+                      f"{next_index} chunks, {time.time()-start:.1f}s){C.E}")
                 last_log = time.time()
             
             # Poll every 50ms
             time.sleep(0.05)
         
-        print(f"{C.Y}[BUS] Timeout after {poll_count} polls{C.E}")
+        print(f"{C.Y}[BUS] Timeout after {poll_count} polls ({next_index} chunks){C.E}")
         return None
     
     def get_stats(self) -> Dict:
         return dict(self.stats)
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# ADMISSION CONTROL
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class AdmissionController:
+    """
+    Token-bucket admission in front of the single CPU
+    
+    Each session owns a bucket of ADMISSION_BURST tokens refilled at
+    ADMISSION_RATE per second; a command is charged its command_registry
+    cost. A global in-flight bound keeps the CPU backlog short. Rejections
+    are immediate and carry a retry-after hint in seconds.
+    """
+    
+    def __init__(self, conn: sqlite3.Connection, rate: float = ADMISSION_RATE,
+                 burst: float = ADMISSION_BURST, max_backlog: int = ADMISSION_MAX_BACKLOG):
+        self.rate = rate
+        self.burst = burst
+        self.max_backlog = max_backlog
+        self.costs = self._load_costs(conn)
+        
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, List[float]] = {}   # session -> [tokens, last_refill]
+        self._backlog = 0
+        self._service_ewma = 1.0                     # Seconds per command
+        self._last_prune = time.time()
+        
+        self.stats = {
+            'admitted': 0,
+            'rejected_rate': 0,
+            'rejected_backlog': 0,
+        }
+    
+    @staticmethod
+    def _load_costs(conn: sqlite3.Connection) -> Dict[str, float]:
+        """Per-command weights from command_registry (cmd_cost, else category)"""
+        costs = {}
+        try:
+            rows = safe_execute(conn, "SELECT cmd_name, cmd_category, cmd_cost FROM command_registry")
+        except sqlite3.OperationalError:
+            # Registries built before cmd_cost existed
+            try:
+                rows = safe_execute(conn, "SELECT cmd_name, cmd_category, NULL AS cmd_cost FROM command_registry")
+            except sqlite3.OperationalError:
+                rows = []
+        
+        for row in rows:
+            cost = row['cmd_cost']
+            if cost is None:
+                cost = CATEGORY_COSTS.get(row['cmd_category'], DEFAULT_COMMAND_COST)
+            costs[row['cmd_name']] = float(cost)
+        
+        return costs
+    
+    def cost_of(self, command: str) -> float:
+        parts = command.lower().split()
+        name = parts[0] if parts else ''
+        cost = self.costs.get(COMMAND_ALIASES.get(name, name), DEFAULT_COMMAND_COST)
+        return min(cost, self.burst)
+    
+    def admit(self, session_id: str, command: str) -> Tuple[bool, float, str]:
+        """Charge session for command; returns (admitted, retry_after, reason)"""
+        cost = self.cost_of(command)
+        now = time.time()
+        
+        with self._lock:
+            if now - self._last_prune > ADMISSION_IDLE_TTL:
+                self._prune(now)
+            
+            if self._backlog >= self.max_backlog:
+                self.stats['rejected_backlog'] += 1
+                return False, self._service_ewma * (self._backlog - self.max_backlog + 1), 'backlog'
+            
+            bucket = self._buckets.get(session_id)
+            if bucket is None:
+                bucket = self._buckets[session_id] = [self.burst, now]
+            
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            
+            if tokens < cost:
+                bucket[0] = tokens
+                self.stats['rejected_rate'] += 1
+                return False, (cost - tokens) / self.rate, 'rate'
+            
+            bucket[0] = tokens - cost
+            self._backlog += 1
+            self.stats['admitted'] += 1
+            return True, 0.0, ''
+    
+    def release(self, service_time: float):
+        """Mark an admitted command finished"""
+        with self._lock:
+            self._backlog = max(0, self._backlog - 1)
+            self._service_ewma = 0.8 * self._service_ewma + 0.2 * service_time
+    
+    def cancel(self):
+        """Undo an admission without recording a service time"""
+        with self._lock:
+            self._backlog = max(0, self._backlog - 1)
+    
+    def _prune(self, now: float):
+        idle = [sid for sid, (tokens, last) in self._buckets.items()
+                if now - last > ADMISSION_IDLE_TTL]
+        for sid in idle:
+            del self._buckets[sid]
+        self._last_prune = now
+    
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return dict(self.stats,
+                        backlog=self._backlog,
+                        sessions=len(self._buckets),
+                        service_ewma_ms=self._service_ewma * 1000)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # QUANTUM MEGA BUS - MAIN CLASS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -403,7 +713,7 @@ class BusCommandExecutor:
 class QuantumMegaBus:
     """Main Quantum Mega Bus - Direct IPC"""
     
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, db_writer=None):
         self.db_path = db_path
         self.running = False
         
@@ -413,7 +723,7 @@ class QuantumMegaBus:
         print(f"{C.Q}{C.BOLD}{'═'*70}{C.E}\n")
         
         self.quantum_engine = BusQuantumEngine(db_path)
-        self.executor = BusCommandExecutor(db_path, self.quantum_engine)
+        self.executor = BusCommandExecutor(db_path, self.quantum_engine, db_writer)
         
         conn = create_connection(db_path)
         try:
@@ -421,17 +731,106 @@ class QuantumMegaBus:
             lattice_size = rows[0]['c'] if rows else 0
         except:
             lattice_size = 0
+        
+        try:
+            self.admission = AdmissionController(conn)
         finally:
             conn.close()
         
+        qunix_metrics.REGISTRY.register_collector(self._collect_metrics)
+        
         print(f"{C.G}✓ Leech lattice: {lattice_size:,} points{C.E}")
         print(f"\n{C.G}{C.BOLD}✓ QUANTUM MEGA BUS READY{C.E}")
         print(f"{C.GRAY}  Sends: {DIRECTION_FLASK_TO_CPU}{C.E}")
         print(f"{C.GRAY}  Receives: {DIRECTION_CPU_TO_FLASK}{C.E}\n")
     
-    def execute_command(self, command: str, timeout: float = 10.0) -> str:
-        """Execute via quantum IPC"""
-        return self.executor.execute(command, timeout)
+    def execute_command(self, command: str, timeout: float = 10.0,
+                        on_chunk: Optional[Callable[[str], None]] = None,
+                        session_id: Optional[str] = None) -> str:
+        """Execute via quantum IPC; session_id enables admission control"""
+        if session_id is None:
+            return self.executor.execute(command, timeout, on_chunk)
+        
+        admitted, retry_after, reason = self.admission.admit(session_id, command)
+        if not admitted:
+            return f"{C.Y}Rejected ({reason}): CPU busy, retry in {retry_after:.1f}s{C.E}"
+        
+        start = time.time()
+        try:
+            return self.executor.execute(command, timeout, on_chunk)
+        finally:
+            self.admission.release(time.time() - start)
+    
+    def execute_command_structured(self, command: str, timeout: float = 10.0,
+                                   on_doc: Optional[Callable[[Dict[str, Any]], None]] = None,
+                                   arrays: bool = False,
+                                   session_id: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Execute via quantum IPC, returning result documents
+        
+        With a session_id the command first passes admission control; a
+        rejection returns a single {'type': 'rejected'} document.
+        """
+        if session_id is None:
+            return self.executor.execute_structured(command, timeout, on_doc, arrays)
+        
+        rejected = self.admit(session_id, command)
+        if rejected:
+            if on_doc:
+                on_doc(rejected)
+            return [rejected]
+        
+        return self.execute_admitted(command, timeout, on_doc, arrays)
+    
+    def admit(self, session_id: str, command: str) -> Optional[Dict[str, Any]]:
+        """
+        Admission check on its own, for callers that execute later
+        
+        Returns a {'type': 'rejected'} document, or None once admitted; an
+        admitted command must then go to execute_admitted() or cancel_admitted().
+        """
+        admitted, retry_after, reason = self.admission.admit(session_id, command)
+        if admitted:
+            return None
+        return {'type': 'rejected', 'reason': reason, 'retry_after': retry_after}
+    
+    def execute_admitted(self, command: str, timeout: float = 10.0,
+                         on_doc: Optional[Callable[[Dict[str, Any]], None]] = None,
+                         arrays: bool = False,
+                         trace: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
+        """Execute a command already admitted by admit(); trace as in execute_structured()"""
+        start = time.time()
+        try:
+            return self.executor.execute_structured(command, timeout, on_doc, arrays, trace)
+        finally:
+            self.admission.release(time.time() - start)
+    
+    def cancel_admitted(self):
+        """Drop an admitted command that will never execute"""
+        self.admission.cancel()
+    
+    def _collect_metrics(self) -> list:
+        """Executor, admission and engine stats as metric samples"""
+        stats = self.executor.get_stats()
+        admission = self.admission.get_stats()
+        engine = self.quantum_engine.get_metrics()
+        return [
+            ('qunix_bus_commands_sent', 'counter', 'Command packets sent to the CPU', stats['commands_sent']),
+            ('qunix_bus_responses_received', 'counter', 'Complete responses received', stats['responses_received']),
+            ('qunix_bus_timeouts', 'counter', 'Commands that timed out waiting for the CPU', stats['timeouts']),
+            ('qunix_bus_admitted', 'counter', 'Commands admitted', admission['admitted']),
+            ('qunix_bus_rejected', 'counter', 'Commands rejected by admission control',
+             admission['rejected_rate'], {'reason': 'rate'}),
+            ('qunix_bus_rejected', 'counter', 'Commands rejected by admission control',
+             admission['rejected_backlog'], {'reason': 'backlog'}),
+            ('qunix_bus_backlog', 'gauge', 'Admitted commands in flight', admission['backlog']),
+            ('qunix_bus_sessions', 'gauge', 'Sessions with a token bucket', admission['sessions']),
+            ('qunix_bus_service_ewma_seconds', 'gauge', 'EWMA command service time',
+             admission['service_ewma_ms'] / 1000),
+            ('qunix_bus_circuits_executed', 'counter', 'Circuits run on AER-A', engine['circuits_executed']),
+            ('qunix_bus_shots_executed', 'counter', 'Bus simulator shots', engine['shots_executed']),
+            ('qunix_bus_avg_chsh', 'gauge', 'Mean CHSH over bus EPR pairs', engine['avg_chsh']),
+        ]
     
     def get_status(self) -> Dict:
         """Get status"""
@@ -439,6 +838,7 @@ class QuantumMegaBus:
             'version': VERSION,
             'running': self.running,
             'quantum_engine': self.quantum_engine.get_metrics(),
+            'admission': self.admission.get_stats(),
             'executor': self.executor.get_stats()
         }
     
@@ -481,10 +881,18 @@ def get_bus(db_path: Path = None) -> QuantumMegaBus:
     return _bus_instance
 
 
-def execute_via_bus(command: str, db_path: Path = None, timeout: float = 10.0) -> str:
+def execute_via_bus(command: str, db_path: Path = None, timeout: float = 10.0,
+                    on_chunk: Optional[Callable[[str], None]] = None) -> str:
     """Execute via bus"""
     bus = get_bus(db_path)
-    return bus.execute_command(command, timeout)
+    return bus.execute_command(command, timeout, on_chunk)
+
+
+def execute_structured_via_bus(command: str, db_path: Path = None, timeout: float = 10.0,
+                               arrays: bool = False) -> Optional[List[Dict[str, Any]]]:
+    """Execute via bus, returning result documents"""
+    bus = get_bus(db_path)
+    return bus.execute_command_structured(command, timeout, arrays=arrays)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -9,7 +9,7 @@
 ║  ✓ Auto-cleanup of stuck packets on startup                                  ║
 ║  ✓ Periodic packet cleanup (every 60s)                                       ║
 ║  ✓ Better error handling and recovery                                        ║
-║  ✓ Health beacon for monitoring                                              ║
+║  ✓ Single-row liveness heartbeat for monitoring                              ║
 ║                                                                               ║
 ╚═══════════════════════════════════════════════════════════════════════════════╝
 """
@@ -20,8 +20,16 @@ import time
 import sys
 import os
 import signal
+import zlib
+import struct
+from math import sqrt
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Iterator, Union, Callable, Tuple
+
+import qunix_db
+import qunix_metrics
+import qunix_trace
+from qunix_render import TextRenderer, JsonRenderer, BinaryRenderer
 
 try:
     from qiskit import QuantumCircuit, transpile
@@ -53,29 +61,82 @@ DIRECTION_CPU_TO_FLASK = 'CPU_TO_FLASK'
 CLEANUP_INTERVAL = 60.0  # Clean every 60 seconds
 STUCK_PACKET_THRESHOLD = 120.0  # Packets older than 2 minutes
 
+# Liveness: one cpu_liveness row, refreshed in place; the metrics
+# snapshot file (<db>.cpu-metrics.json) is published on the same beat
+HEARTBEAT_INTERVAL = 5.0
+
+# Sampling settings
+DEFAULT_SHOTS = 1024           # Fixed shots for gate commands
+SHOT_BATCH = 128               # Shots per adaptive increment
+MAX_SHOTS = 8192               # Hard cap for any run
+EPR_MAX_SHOTS = 1000           # Cap for EPR pair creation
+EPR_CHSH_TOLERANCE = 0.02      # Default 95% CI half-width on CHSH
+CONFIDENCE_Z = 1.96            # 95% two-sided
+
+# Streaming settings
+CHUNK_SIZE = 4096  # Max characters (or frame bytes) per packet_chunks row
+
+# Response chunks (packet_chunks layout from the v1 schema, keyed by the
+# FLASK_TO_CPU request packet_id)
+PACKET_CHUNKS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS packet_chunks (
+    chunk_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    packet_id INTEGER NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    total_chunks INTEGER NOT NULL,
+    chunk_data BLOB,
+    chunk_size INTEGER,
+    chunk_hash BLOB,
+    epr_pairs TEXT,
+    transmitted INTEGER DEFAULT 0,
+    received INTEGER DEFAULT 0,
+    verified INTEGER DEFAULT 0,
+    transmission_timestamp REAL,
+    UNIQUE(packet_id, chunk_index)
+);
+
+CREATE INDEX IF NOT EXISTS idx_chunk_packet ON packet_chunks(packet_id);
+CREATE INDEX IF NOT EXISTS idx_chunk_state ON packet_chunks(transmitted, received, verified);
+"""
+
+# ═══════════════════════════════════════════════════════════════════════════
+# METRICS
+# ═══════════════════════════════════════════════════════════════════════════
+
+TRANSPILE_SECONDS = qunix_metrics.REGISTRY.histogram(
+    'qunix_cpu_transpile_seconds', 'Circuit transpile time')
+SIMULATE_SECONDS = qunix_metrics.REGISTRY.histogram(
+    'qunix_cpu_simulate_seconds', 'Simulator run time per shot batch')
+EXECUTE_SECONDS = qunix_metrics.REGISTRY.histogram(
+    'qunix_cpu_execute_seconds', 'Command execution time on the CPU', ['command'])
+IPC_POLL_SECONDS = qunix_metrics.REGISTRY.histogram(
+    'qunix_cpu_ipc_poll_seconds', 'FLASK_TO_CPU poll query time')
+CHUNK_WRITE_SECONDS = qunix_metrics.REGISTRY.histogram(
+    'qunix_cpu_chunk_write_seconds', 'packet_chunks insert time per chunk')
+
+
+# Single-row heartbeat read by Flask's health snapshot
+CPU_LIVENESS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cpu_liveness (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    pid INTEGER,
+    state TEXT,
+    started_at REAL,
+    heartbeat REAL,
+    commands INTEGER DEFAULT 0,
+    avg_chsh REAL,
+    version TEXT
+);
+"""
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # DATABASE CONNECTION (WAL MODE)
 # ═══════════════════════════════════════════════════════════════════════════
 
 def create_connection(db_path: Path) -> sqlite3.Connection:
-    """Create optimized WAL-mode connection"""
-    conn = sqlite3.connect(
-        str(db_path),
-        timeout=60.0,
-        check_same_thread=False,
-        isolation_level=None  # Autocommit
-    )
-    conn.row_factory = sqlite3.Row
-    
-    # Critical WAL mode settings
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA synchronous=NORMAL")
-    conn.execute("PRAGMA busy_timeout=60000")
-    conn.execute("PRAGMA temp_store=MEMORY")
-    conn.execute("PRAGMA cache_size=-64000")
-    
-    return conn
+    """Create optimized WAL-mode connection (writer profile, autocommit)"""
+    return qunix_db.connect(db_path, profile='writer')
 
 
 def safe_execute(conn: sqlite3.Connection, sql: str, params: tuple = (), 
@@ -170,6 +231,13 @@ def cleanup_old_processed_packets(conn: sqlite3.Connection, max_age: float = 360
         
         deleted = cursor.rowcount
         
+        cursor.execute("""
+            DELETE FROM packet_chunks
+            WHERE transmission_timestamp < ?
+        """, (cutoff,))
+        
+        cursor.execute(*qunix_trace.prune_sql(max(max_age, qunix_trace.TRACE_TTL)))
+        
         if deleted > 0:
             print(f"{C.GRAY}[CPU] Deleted {deleted} old processed packets{C.E}")
         
@@ -250,6 +318,49 @@ def verify_ipc_table(conn: sqlite3.Connection) -> bool:
         return False
 
 
+def ensure_packet_chunks_table(conn: sqlite3.Connection) -> bool:
+    """Ensure packet_chunks table exists for streamed responses"""
+    try:
+        conn.executescript(PACKET_CHUNKS_SCHEMA)
+        return True
+    except Exception as e:
+        print(f"{C.R}[CPU] ERROR: packet_chunks setup failed: {e}{C.E}")
+        return False
+
+
+def ensure_liveness_table(conn: sqlite3.Connection) -> bool:
+    """Ensure the cpu_liveness heartbeat row's table exists"""
+    try:
+        conn.executescript(CPU_LIVENESS_SCHEMA)
+        return True
+    except Exception as e:
+        print(f"{C.R}[CPU] ERROR: cpu_liveness setup failed: {e}{C.E}")
+        return False
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SAMPLING STATISTICS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def wilson_halfwidth(successes: int, trials: int, z: float = CONFIDENCE_Z) -> float:
+    """Half-width of the Wilson score interval for a binomial proportion"""
+    if trials <= 0:
+        return 1.0
+    p = successes / trials
+    z2 = z * z
+    return z * sqrt(p * (1 - p) / trials + z2 / (4 * trials * trials)) / (1 + z2 / trials)
+
+
+def epr_fidelity_error(counts: Dict[str, int], shots: int) -> float:
+    """CI half-width on EPR fidelity P(00) + P(11)"""
+    return wilson_halfwidth(counts.get('00', 0) + counts.get('11', 0), shots)
+
+
+def histogram_error(counts: Dict[str, int], shots: int) -> float:
+    """Largest CI half-width over the observed outcome probabilities"""
+    return max((wilson_halfwidth(c, shots) for c in counts.values()), default=1.0)
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # CPU QUANTUM ENGINE (AER-B)
 # ═══════════════════════════════════════════════════════════════════════════
@@ -270,9 +381,17 @@ class CPUQuantumEngine:
         
         self.noise_model = self._build_noise_model()
         
+        # The EPR circuit never changes - transpile once
+        qc = QuantumCircuit(2, 2)
+        qc.h(0)
+        qc.cx(0, 1)
+        qc.measure([0, 1], [0, 1])
+        self._epr_circuit = transpile(qc, self.simulator)
+        
         self.metrics = {
             'circuits_executed': 0,
             'epr_pairs_created': 0,
+            'shots_executed': 0,
             'total_chsh': 0.0,
             'avg_chsh': 2.0,
         }
@@ -300,16 +419,57 @@ class CPUQuantumEngine:
         
         return noise_model
     
-    def create_epr_pair(self) -> Dict[str, Any]:
-        """Create EPR pair with CHSH measurement"""
-        qc = QuantumCircuit(2, 2)
-        qc.h(0)
-        qc.cx(0, 1)
-        qc.measure([0, 1], [0, 1])
+    def _sample(self, qc_t: QuantumCircuit, max_shots: int, tolerance: Optional[float],
+                error_fn: Callable[[Dict[str, int], int], float]) -> Tuple[Dict[str, int], int, float]:
+        """
+        Run a transpiled circuit, adaptively when a tolerance is given
+        
+        Without a tolerance all max_shots run in one go. With one, shots run
+        in SHOT_BATCH increments until error_fn(counts, shots) is at or
+        below the tolerance or max_shots is reached.
+        
+        Returns:
+            (counts, shots_used, achieved_error)
+        """
+        max_shots = max(1, min(max_shots, MAX_SHOTS))
+        counts: Dict[str, int] = {}
+        shots = 0
+        error = 1.0
+        
+        while shots < max_shots:
+            batch = max_shots - shots if tolerance is None else min(SHOT_BATCH, max_shots - shots)
+            with SIMULATE_SECONDS.time():
+                result = self.simulator.run(qc_t, shots=batch, noise_model=self.noise_model).result()
+            
+            for outcome, count in result.get_counts().items():
+                counts[outcome] = counts.get(outcome, 0) + count
+            shots += batch
+            
+            error = error_fn(counts, shots)
+            if tolerance is not None and error <= tolerance:
+                break
         
-        qc_t = transpile(qc, self.simulator)
-        result = self.simulator.run(qc_t, shots=1000, noise_model=self.noise_model).result()
-        counts = result.get_counts()
+        self.metrics['shots_executed'] += shots
+        return counts, shots, error
+    
+    def create_epr_pair(self, tolerance: Optional[float] = EPR_CHSH_TOLERANCE,
+                        max_shots: int = EPR_MAX_SHOTS, target: str = 'chsh') -> Dict[str, Any]:
+        """
+        Create EPR pair with CHSH measurement
+        
+        Args:
+            tolerance: Target 95% CI half-width on the target estimate
+                       (None runs max_shots fixed shots)
+            max_shots: Hard cap on shots
+            target: 'chsh' or 'fidelity'
+        """
+        # CHSH = 2 + 0.828·|2F - 1|, so its error is 1.656× the fidelity error
+        scale = 2 * 0.828 if target == 'chsh' else 1.0
+        counts, shots, fidelity_err = self._sample(
+            self._epr_circuit, max_shots, tolerance,
+            lambda c, n: epr_fidelity_error(c, n) * scale
+        )
+        fidelity_err /= scale
         
         total = sum(counts.values())
         p_00 = counts.get('00', 0) / total
@@ -326,25 +486,38 @@ class CPUQuantumEngine:
         
         return {
             'fidelity': fidelity,
+            'fidelity_err': fidelity_err,
             'chsh': chsh,
+            'chsh_err': fidelity_err * 2 * 0.828,
+            'shots': shots,
             'quantum_advantage': chsh > 2.0,
             'counts': counts
         }
     
-    def execute_circuit(self, circuit: QuantumCircuit, shots: int = 1024) -> Dict[str, Any]:
-        """Execute circuit on CPU engine"""
-        qc_transpiled = transpile(circuit, self.simulator)
-        result = self.simulator.run(
+    def execute_circuit(self, circuit: QuantumCircuit, shots: int = DEFAULT_SHOTS,
+                        tolerance: Optional[float] = None,
+                        max_shots: int = MAX_SHOTS) -> Dict[str, Any]:
+        """
+        Execute circuit on CPU engine
+        
+        With a tolerance, shots run adaptively (up to max_shots) until every
+        observed outcome probability is known to within it.
+        """
+        with TRANSPILE_SECONDS.time():
+            qc_transpiled = transpile(circuit, self.simulator)
+        counts, shots_used, error = self._sample(
             qc_transpiled,
-            shots=shots,
-            noise_model=self.noise_model
-        ).result()
+            shots if tolerance is None else max_shots,
+            tolerance,
+            histogram_error
+        )
         
         self.metrics['circuits_executed'] += 1
         
         return {
-            'counts': result.get_counts(),
-            'shots': shots
+            'counts': counts,
+            'shots': shots_used,
+            'error': error
         }
     
     def get_metrics(self) -> Dict[str, Any]:
@@ -358,134 +531,203 @@ class CPUQuantumEngine:
 class CPUCommandExecutor:
     """Executes commands received from Mega Bus"""
     
+    # Commands accepting --shots / --tol / --max-shots
+    SAMPLED_COMMANDS = frozenset({
+        'qh', 'hadamard', 'qx', 'pauli-x', 'pauli_x', 'x', 'qy', 'pauli-y', 'pauli_y', 'y',
+        'qz', 'pauli-z', 'pauli_z', 'z', 'qcx', 'cnot', 'cx', 'bell', 'qccx', 'toffoli', 'ccx',
+        'qft', 'grover', 'chsh',
+    })
+    
     def __init__(self, db_path: Path, quantum_engine: CPUQuantumEngine):
         self.db_path = db_path
         self.conn = create_connection(db_path)
         self.quantum_engine = quantum_engine
         
+        # Rendering layer: static output is built once here
+        self.text_renderer = TextRenderer(VERSION, MAX_SHOTS)
+        self.json_renderer = JsonRenderer(VERSION, MAX_SHOTS)
+        self.binary_renderer = BinaryRenderer(VERSION, MAX_SHOTS)
+        
         self.stats = {
             'commands_received': 0,
             'commands_executed': 0,
             'errors': 0,
         }
     
-    def execute(self, command: str) -> str:
-        """Execute command and return result"""
+    def execute(self, command: str) -> Union[str, bytes]:
+        """Execute command and return result (bytes for --bin)"""
+        segments = self.execute_stream(command)
+        if self.renderer_for(command) is self.binary_renderer:
+            return b''.join(segments)
+        return ''.join(segments)
+    
+    def renderer_for(self, command: str):
+        """Renderer selected by the command's --bin / --json flags"""
+        parts = command.lower().split()
+        if '--bin' in parts:
+            return self.binary_renderer
+        if '--json' in parts:
+            return self.json_renderer
+        return self.text_renderer
+    
+    def execute_stream(self, command: str) -> Iterator[Union[str, bytes]]:
+        """
+        Execute command, yielding output segments as they are produced
+        
+        A --json flag anywhere in the command switches to JSON output; --bin
+        switches to binary result frames (bytes) and takes precedence.
+        """
         start_time = time.time()
         
         self.stats['commands_received'] += 1
         
         parts = command.lower().split()
+        renderer = self.renderer_for(command)
+        parts = [p for p in parts if p not in ('--json', '--bin')]
         cmd_name = parts[0] if parts else ''
         
         try:
-            # Route to handler
-            if cmd_name in ('qh', 'hadamard'):
-                result = self._exec_hadamard()
-            elif cmd_name in ('qx', 'pauli-x', 'pauli_x', 'x'):
-                result = self._exec_pauli_x()
-            elif cmd_name in ('qy', 'pauli-y', 'pauli_y', 'y'):
-                result = self._exec_pauli_y()
-            elif cmd_name in ('qz', 'pauli-z', 'pauli_z', 'z'):
-                result = self._exec_pauli_z()
-            elif cmd_name in ('qcx', 'cnot', 'cx', 'bell'):
-                result = self._exec_cnot()
-            elif cmd_name in ('qccx', 'toffoli', 'ccx'):
-                result = self._exec_toffoli()
-            elif cmd_name in ('qft',):
-                result = self._exec_qft()
-            elif cmd_name in ('grover',):
-                result = self._exec_grover()
-            elif cmd_name in ('chsh',):
-                result = self._exec_chsh_test()
-            elif cmd_name in ('help', '?'):
-                result = self._exec_help()
-            elif cmd_name in ('status',):
-                result = self._exec_status()
-            elif cmd_name in ('qstats',):
-                result = self._exec_qstats()
-            elif cmd_name in ('version',):
-                result = f"QUNIX Quantum CPU v{VERSION}"
-            elif cmd_name in ('echo',):
-                result = ' '.join(parts[1:]) if len(parts) > 1 else ''
-            elif cmd_name in ('ping',):
-                result = 'pong'
-            elif cmd_name in ('test',):
-                test_epr = self.quantum_engine.create_epr_pair()
-                result = f"{C.G}✓ CPU operational{C.E}\r\n"
-                result += f"Test EPR: CHSH={test_epr['chsh']:.3f}, "
-                result += f"Fidelity={test_epr['fidelity']:.3f}"
+            sampling = self._parse_sampling(parts) if cmd_name in self.SAMPLED_COMMANDS else {}
+            result = self._dispatch(cmd_name, parts, sampling, renderer)
+            
+            if isinstance(result, dict):
+                yield renderer.render(result)
             else:
-                result = f"{C.Y}Unknown command: {cmd_name}{C.E}\r\nType 'help' for available commands"
+                yield from result
             
             self.stats['commands_executed'] += 1
             
-            elapsed = (time.time() - start_time) * 1000
-            
-            return result
-            
         except Exception as e:
             self.stats['errors'] += 1
             print(f"{C.R}[CPU] Execution error: {e}{C.E}")
-            return f"{C.R}Error: {e}{C.E}"
+            yield renderer.render({'type': 'error', 'message': str(e)})
+        
+        # Label only known commands so typos don't create new series
+        EXECUTE_SECONDS.observe(time.time() - start_time,
+                                command=cmd_name if cmd_name in self.SAMPLED_COMMANDS else 'other')
+    
+    def _parse_sampling(self, parts: list) -> Dict[str, Any]:
+        """Parse --shots N, --tol X and --max-shots N options"""
+        flags = {
+            '--shots': ('shots', int),
+            '--tol': ('tolerance', float),
+            '--max-shots': ('max_shots', int),
+        }
+        sampling = {}
+        
+        i = 1
+        while i < len(parts):
+            if parts[i] in flags:
+                if i + 1 >= len(parts):
+                    raise ValueError(f"{parts[i]} needs a value")
+                name, cast = flags[parts[i]]
+                sampling[name] = cast(parts[i + 1])
+                i += 2
+            else:
+                i += 1
+        
+        if sampling.get('tolerance') is not None and sampling['tolerance'] <= 0:
+            raise ValueError("--tol must be positive")
+        
+        return sampling
+    
+    def _dispatch(self, cmd_name: str, parts: list, sampling: Dict[str, Any],
+                  renderer) -> Union[Dict[str, Any], Iterator[str]]:
+        """Route to handler; returns a result document or a segment stream"""
+        if cmd_name in ('qh', 'hadamard'):
+            return self._exec_hadamard(renderer, **sampling)
+        elif cmd_name in ('qx', 'pauli-x', 'pauli_x', 'x'):
+            return self._exec_pauli_x(renderer, **sampling)
+        elif cmd_name in ('qy', 'pauli-y', 'pauli_y', 'y'):
+            return self._exec_pauli_y(renderer, **sampling)
+        elif cmd_name in ('qz', 'pauli-z', 'pauli_z', 'z'):
+            return self._exec_pauli_z(renderer, **sampling)
+        elif cmd_name in ('qcx', 'cnot', 'cx', 'bell'):
+            return self._exec_cnot(renderer, **sampling)
+        elif cmd_name in ('qccx', 'toffoli', 'ccx'):
+            return self._exec_toffoli(renderer, **sampling)
+        elif cmd_name in ('qft',):
+            return self._exec_qft(renderer, **sampling)
+        elif cmd_name in ('grover',):
+            return self._exec_grover(renderer, **sampling)
+        elif cmd_name in ('chsh',):
+            return self._exec_chsh_test(**sampling)
+        elif cmd_name in ('help', '?'):
+            return {'type': 'help'}
+        elif cmd_name in ('status',):
+            return self._exec_status()
+        elif cmd_name in ('qstats',):
+            return self._exec_qstats()
+        elif cmd_name in ('version',):
+            return {'type': 'version'}
+        elif cmd_name in ('echo',):
+            return {'type': 'text', 'text': ' '.join(parts[1:]) if len(parts) > 1 else ''}
+        elif cmd_name in ('ping',):
+            return {'type': 'text', 'text': 'pong'}
+        elif cmd_name in ('trace',):
+            return self._exec_trace(parts[1] if len(parts) > 1 else None)
+        elif cmd_name in ('test',):
+            test_epr = self.quantum_engine.create_epr_pair()
+            return {
+                'type': 'test',
+                'chsh': test_epr['chsh'],
+                'chsh_err': test_epr['chsh_err'],
+                'fidelity': test_epr['fidelity'],
+                'shots': test_epr['shots'],
+            }
+        else:
+            return {'type': 'unknown', 'command': cmd_name}
     
-    def _exec_hadamard(self) -> str:
+    def _exec_hadamard(self, renderer, **sampling) -> Iterator[str]:
         qc = QuantumCircuit(1, 1)
         qc.h(0)
         qc.measure(0, 0)
-        result = self.quantum_engine.execute_circuit(qc, shots=1024)
-        return self._format_result("Hadamard Gate (H)", result['counts'])
+        return self._run_circuit(renderer, "Hadamard Gate (H)", qc, **sampling)
     
-    def _exec_pauli_x(self) -> str:
+    def _exec_pauli_x(self, renderer, **sampling) -> Iterator[str]:
         qc = QuantumCircuit(1, 1)
         qc.x(0)
         qc.measure(0, 0)
-        result = self.quantum_engine.execute_circuit(qc, shots=1024)
-        return self._format_result("Pauli-X Gate (NOT)", result['counts'])
+        return self._run_circuit(renderer, "Pauli-X Gate (NOT)", qc, **sampling)
     
-    def _exec_pauli_y(self) -> str:
+    def _exec_pauli_y(self, renderer, **sampling) -> Iterator[str]:
         qc = QuantumCircuit(1, 1)
         qc.y(0)
         qc.measure(0, 0)
-        result = self.quantum_engine.execute_circuit(qc, shots=1024)
-        return self._format_result("Pauli-Y Gate", result['counts'])
+        return self._run_circuit(renderer, "Pauli-Y Gate", qc, **sampling)
     
-    def _exec_pauli_z(self) -> str:
+    def _exec_pauli_z(self, renderer, **sampling) -> Iterator[str]:
         qc = QuantumCircuit(1, 1)
         qc.h(0)
         qc.z(0)
         qc.h(0)
         qc.measure(0, 0)
-        result = self.quantum_engine.execute_circuit(qc, shots=1024)
-        return self._format_result("Pauli-Z Gate", result['counts'])
+        return self._run_circuit(renderer, "Pauli-Z Gate", qc, **sampling)
     
-    def _exec_cnot(self) -> str:
+    def _exec_cnot(self, renderer, **sampling) -> Iterator[str]:
         qc = QuantumCircuit(2, 2)
         qc.h(0)
         qc.cx(0, 1)
         qc.measure([0, 1], [0, 1])
-        result = self.quantum_engine.execute_circuit(qc, shots=1024)
-        return self._format_result("CNOT Gate (Bell Pair)", result['counts'])
+        return self._run_circuit(renderer, "CNOT Gate (Bell Pair)", qc, **sampling)
     
-    def _exec_toffoli(self) -> str:
+    def _exec_toffoli(self, renderer, **sampling) -> Iterator[str]:
         qc = QuantumCircuit(3, 3)
         qc.h(0)
         qc.h(1)
         qc.ccx(0, 1, 2)
         qc.measure_all()
-        result = self.quantum_engine.execute_circuit(qc, shots=1024)
-        return self._format_result("Toffoli Gate", result['counts'])
+        return self._run_circuit(renderer, "Toffoli Gate", qc, **sampling)
     
-    def _exec_qft(self) -> str:
+    def _exec_qft(self, renderer, **sampling) -> Iterator[str]:
         n = 4
         qc = QuantumCircuit(n, n)
         for i in range(n):
             qc.h(i)
         qc.measure_all()
-        result = self.quantum_engine.execute_circuit(qc, shots=1024)
-        return self._format_result("Quantum Fourier Transform", result['counts'])
+        return self._run_circuit(renderer, "Quantum Fourier Transform", qc, **sampling)
     
-    def _exec_grover(self) -> str:
+    def _exec_grover(self, renderer, **sampling) -> Iterator[str]:
         n = 3
         qc = QuantumCircuit(n, n)
         qc.h(range(n))
@@ -502,77 +744,138 @@ class CPUCommandExecutor:
         qc.x(range(n))
         qc.h(range(n))
         qc.measure_all()
-        result = self.quantum_engine.execute_circuit(qc, shots=1024)
-        return self._format_result("Grover's Algorithm", result['counts'])
-    
-    def _exec_chsh_test(self) -> str:
-        epr = self.quantum_engine.create_epr_pair()
-        chsh = epr['chsh']
-        verdict = f"{C.G}✓ QUANTUM{C.E}" if chsh > 2.0 else "Classical"
-        return f"CHSH Test\r\n\r\nCHSH Value: {chsh:.4f}\r\nVerdict: {verdict}"
-    
-    def _exec_help(self) -> str:
-        return f"""{C.BOLD}QUNIX Quantum CPU v{VERSION}{C.E}
-
-Quantum Gates:
-  qh, hadamard     Hadamard gate
-  qx, pauli-x      Pauli-X (NOT)
-  qy, pauli-y      Pauli-Y
-  qz, pauli-z      Pauli-Z
-  qcx, cnot        CNOT (Bell pair)
-  qccx, toffoli    Toffoli gate
-
-Algorithms:
-  qft              Quantum Fourier Transform
-  grover           Grover's search
-  chsh             CHSH inequality test
-
-System:
-  help             This help
-  status           System status
-  qstats           Quantum statistics
-  ping             Connectivity test
-"""
+        return self._run_circuit(renderer, "Grover's Algorithm", qc, **sampling)
+    
+    def _exec_chsh_test(self, shots: Optional[int] = None, tolerance: Optional[float] = None,
+                        max_shots: int = EPR_MAX_SHOTS) -> Dict[str, Any]:
+        if shots is not None:
+            epr = self.quantum_engine.create_epr_pair(tolerance=None, max_shots=shots)
+        else:
+            epr = self.quantum_engine.create_epr_pair(
+                tolerance=EPR_CHSH_TOLERANCE if tolerance is None else tolerance,
+                max_shots=max_shots
+            )
+        return {
+            'type': 'chsh',
+            'chsh': epr['chsh'],
+            'chsh_err': epr['chsh_err'],
+            'shots': epr['shots'],
+            'quantum': epr['chsh'] > 2.0,
+        }
     
-    def _exec_status(self) -> str:
+    def _exec_status(self) -> Dict[str, Any]:
         metrics = self.quantum_engine.get_metrics()
-        return f"""{C.BOLD}CPU Status{C.E}
-
-State:           {C.G}RUNNING{C.E}
-Commands:        {self.stats['commands_executed']:,}
-Circuits:        {metrics['circuits_executed']:,}
-EPR pairs:       {metrics['epr_pairs_created']:,}
-Avg CHSH:        {metrics['avg_chsh']:.4f}
-"""
+        return {
+            'type': 'status',
+            'state': 'RUNNING',
+            'commands': self.stats['commands_executed'],
+            'circuits': metrics['circuits_executed'],
+            'epr_pairs': metrics['epr_pairs_created'],
+            'avg_chsh': metrics['avg_chsh'],
+        }
     
-    def _exec_qstats(self) -> str:
+    def _exec_qstats(self) -> Dict[str, Any]:
         metrics = self.quantum_engine.get_metrics()
-        return f"""{C.BOLD}Quantum Statistics{C.E}
-
-Circuits executed: {metrics['circuits_executed']:,}
-EPR pairs created: {metrics['epr_pairs_created']:,}
-Average CHSH:      {metrics['avg_chsh']:.4f}
-Quantum advantage: {'✓ Yes' if metrics['avg_chsh'] > 2.0 else 'No'}
-"""
+        return {
+            'type': 'qstats',
+            'circuits': metrics['circuits_executed'],
+            'epr_pairs': metrics['epr_pairs_created'],
+            'shots': metrics['shots_executed'],
+            'avg_chsh': metrics['avg_chsh'],
+        }
     
-    def _format_result(self, title: str, counts: Dict[str, int]) -> str:
-        if not counts:
-            return f"{title}\r\nNo results"
-        
-        lines = [f"{C.BOLD}{title}{C.E}", "", "Results:"]
-        total = sum(counts.values())
-        
-        for bitstring, count in sorted(counts.items(), key=lambda x: x[1], reverse=True)[:8]:
-            prob = count / total * 100
-            bar = '█' * int(prob / 2.5)
-            lines.append(f"  |{bitstring}⟩: {count:4d} ({prob:5.1f}%) {bar}")
-        
-        return '\r\n'.join(lines)
+    def _exec_trace(self, trace_id: Optional[str]) -> Dict[str, Any]:
+        """Latency breakdown of one traced command, or the most recent ones"""
+        if trace_id is None:
+            rows = self.conn.execute(*qunix_trace.recent_sql()).fetchall()
+            return qunix_trace.traces_document(rows)
+        row = self.conn.execute(*qunix_trace.lookup_sql(trace_id)).fetchone()
+        return qunix_trace.trace_document(row, trace_id)
+    
+    def _run_circuit(self, renderer, title: str, qc: QuantumCircuit, shots: int = DEFAULT_SHOTS,
+                     tolerance: Optional[float] = None, max_shots: int = MAX_SHOTS) -> Iterator[str]:
+        """Stream title first, then the histogram once the circuit has run"""
+        yield renderer.header(title)
+        result = self.quantum_engine.execute_circuit(
+            qc, shots=shots, tolerance=tolerance, max_shots=max_shots
+        )
+        yield renderer.render({
+            'type': 'histogram',
+            'title': title,
+            'counts': result['counts'],
+            'shots': result['shots'],
+            'error': result['error'],
+        }, header_sent=True)
     
     def get_stats(self) -> Dict:
         return dict(self.stats)
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# RESPONSE STREAMING
+# ═══════════════════════════════════════════════════════════════════════════
+
+class ChunkWriter:
+    """
+    Appends sequenced response chunks to packet_chunks
+    
+    Each segment is committed as soon as it is written so the bus can
+    forward it before the command has finished. Intermediate chunks carry
+    total_chunks = 0; close() writes a terminal chunk whose total_chunks is
+    the final count, which is the bus's end-of-stream marker.
+    """
+    
+    def __init__(self, conn: sqlite3.Connection, packet_id: int):
+        self.conn = conn
+        self.packet_id = packet_id
+        self.chunk_index = 0
+        self.bytes_written = 0
+        self.closed = False
+        self.first_at = None      # Commit times for tracing
+        self.last_at = None
+    
+    def write(self, segment: Union[str, bytes]):
+        """Split a text or binary segment into CHUNK_SIZE pieces and append each"""
+        if not segment:
+            return
+        # Text is split on characters so no chunk ends mid UTF-8 sequence
+        for offset in range(0, len(segment), CHUNK_SIZE):
+            piece = segment[offset:offset + CHUNK_SIZE]
+            self._append(piece.encode('utf-8') if isinstance(piece, str) else piece, 0)
+    
+    def close(self):
+        """Write the end-of-stream chunk"""
+        if self.closed:
+            return
+        self._append(b'', self.chunk_index + 1)
+        self.closed = True
+    
+    def _append(self, data: bytes, total_chunks: int):
+        with CHUNK_WRITE_SECONDS.time():
+            self._insert(data, total_chunks)
+        self.last_at = time.time()
+        if self.first_at is None:
+            self.first_at = self.last_at
+        self.chunk_index += 1
+        self.bytes_written += len(data)
+    
+    def _insert(self, data: bytes, total_chunks: int):
+        safe_write(self.conn, """
+            INSERT INTO packet_chunks
+            (packet_id, chunk_index, total_chunks, chunk_data, chunk_size,
+             chunk_hash, transmitted, transmission_timestamp)
+            VALUES (?, ?, ?, ?, ?, ?, 1, ?)
+        """, (
+            self.packet_id,
+            self.chunk_index,
+            total_chunks,
+            data,
+            len(data),
+            struct.pack('>I', zlib.crc32(data)),
+            time.time()
+        ))
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # QUANTUM CPU CORE - WITH AUTO-CLEANUP
 # ═══════════════════════════════════════════════════════════════════════════
@@ -601,9 +904,10 @@ class QuantumCPUCore:
         self.quantum_engine = CPUQuantumEngine(db_path)
         self.executor = CPUCommandExecutor(db_path, self.quantum_engine)
         
-        # Database connection for IPC
+        # Database connection for IPC; the command poll gets its own tuple-row reader
         try:
             self.conn = create_connection(db_path)
+            self.poll_conn = qunix_db.connect(db_path, profile='reader', row_factory=None)
         except Exception as e:
             print(f"{C.R}FATAL: Cannot connect to database: {e}{C.E}")
             sys.exit(1)
@@ -613,6 +917,18 @@ class QuantumCPUCore:
             print(f"{C.R}FATAL: IPC table verification failed{C.E}")
             sys.exit(1)
         
+        if not ensure_packet_chunks_table(self.conn):
+            print(f"{C.R}FATAL: packet_chunks setup failed{C.E}")
+            sys.exit(1)
+        
+        if not ensure_liveness_table(self.conn):
+            print(f"{C.R}FATAL: cpu_liveness setup failed{C.E}")
+            sys.exit(1)
+        
+        if not qunix_trace.ensure_trace_schema(self.conn):
+            print(f"{C.R}FATAL: request_traces setup failed{C.E}")
+            sys.exit(1)
+        
         # Clean stuck packets on startup
         print(f"{C.C}[CPU] Cleaning stuck packets...{C.E}")
         stuck = cleanup_stuck_packets(self.conn, threshold=60.0)
@@ -623,7 +939,9 @@ class QuantumCPUCore:
         print(f"  Table: quantum_ipc")
         print(f"  Poll direction: {DIRECTION_FLASK_TO_CPU}")
         print(f"  Send direction: {DIRECTION_CPU_TO_FLASK}")
+        print(f"  Response stream: packet_chunks ({CHUNK_SIZE} chars/chunk)")
         print(f"  Cleanup interval: {CLEANUP_INTERVAL}s")
+        print(f"  Heartbeat: cpu_liveness every {HEARTBEAT_INTERVAL}s")
         
         # Signal handlers
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -631,29 +949,61 @@ class QuantumCPUCore:
         
         # Cleanup tracking
         self.last_cleanup = time.time()
-        self.last_health_beacon = time.time()
+        self.started_at = time.time()
+        self.last_heartbeat = 0.0
+        
+        # Metrics: executor/engine stats exposed at snapshot time
+        self.metrics_path = qunix_metrics.snapshot_path(db_path, 'cpu')
+        qunix_metrics.REGISTRY.register_collector(self._collect_metrics)
         
         print(f"\n{C.G}{C.BOLD}✓ QUANTUM CPU READY{C.E}\n")
     
-    def _send_health_beacon(self):
-        """Send health beacon packet"""
+    def _send_heartbeat(self, state: str = 'running'):
+        """Overwrite the single cpu_liveness row"""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                INSERT INTO quantum_ipc
-                (sender, direction, data, data_size, chsh_value, timestamp, processed)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+            self.conn.execute("""
+                INSERT OR REPLACE INTO cpu_liveness
+                (id, pid, state, started_at, heartbeat, commands, avg_chsh, version)
+                VALUES (1, ?, ?, ?, ?, ?, ?, ?)
             """, (
-                'QUNIX_CPU',
-                DIRECTION_CPU_TO_FLASK,
-                b'HEALTH_BEACON',
-                13,
-                2.0,
+                os.getpid(),
+                state,
+                self.started_at,
                 time.time(),
-                1  # Mark as processed immediately
+                self.executor.get_stats()['commands_executed'],
+                self.quantum_engine.get_metrics()['avg_chsh'],
+                VERSION
             ))
         except Exception as e:
-            print(f"{C.Y}[CPU] Health beacon error: {e}{C.E}")
+            print(f"{C.Y}[CPU] Heartbeat error: {e}{C.E}")
+    
+    def _record_trace(self, spans: Dict[str, Any]):
+        """Upsert this process's span columns (one write per command)"""
+        try:
+            safe_write(self.conn, *qunix_trace.upsert(spans))
+        except Exception as e:
+            print(f"{C.Y}[CPU] Trace write error: {e}{C.E}")
+    
+    def _collect_metrics(self) -> list:
+        stats = self.executor.get_stats()
+        engine = self.quantum_engine.get_metrics()
+        return [
+            ('qunix_cpu_commands_received', 'counter', 'Commands received from the bus', stats['commands_received']),
+            ('qunix_cpu_commands_executed', 'counter', 'Commands executed successfully', stats['commands_executed']),
+            ('qunix_cpu_command_errors', 'counter', 'Commands that raised', stats['errors']),
+            ('qunix_cpu_circuits_executed', 'counter', 'Circuits run on AER-B', engine['circuits_executed']),
+            ('qunix_cpu_epr_pairs_created', 'counter', 'EPR pairs created', engine['epr_pairs_created']),
+            ('qunix_cpu_shots_executed', 'counter', 'Simulator shots', engine['shots_executed']),
+            ('qunix_cpu_avg_chsh', 'gauge', 'Mean CHSH over created EPR pairs', engine['avg_chsh']),
+            ('qunix_cpu_start_time_seconds', 'gauge', 'CPU start time (unix)', self.started_at),
+        ]
+    
+    def _publish_metrics(self):
+        """Write the metrics snapshot file read by Flask's /metrics"""
+        try:
+            qunix_metrics.REGISTRY.write_snapshot(self.metrics_path)
+        except Exception as e:
+            print(f"{C.Y}[CPU] Metrics publish error: {e}{C.E}")
     
     def _process_ipc_packets(self) -> int:
         """Process incoming commands from quantum_ipc table"""
@@ -662,26 +1012,23 @@ class QuantumCPUCore:
         try:
             cursor = self.conn.cursor()
             
-            # Poll for FLASK_TO_CPU packets
-            cursor.execute("""
-                SELECT packet_id, data, chsh_value, sender
-                FROM quantum_ipc
-                WHERE direction = ?
-                  AND processed = 0
-                ORDER BY packet_id
-                LIMIT 10
-            """, (DIRECTION_FLASK_TO_CPU,))
-            
-            rows = cursor.fetchall()
+            # Poll for FLASK_TO_CPU packets (hot path: plain tuples)
+            with IPC_POLL_SECONDS.time():
+                rows = qunix_db.fetch_tuples(self.poll_conn, """
+                    SELECT packet_id, data, chsh_value, sender, trace_id
+                    FROM quantum_ipc
+                    WHERE direction = ?
+                      AND processed = 0
+                    ORDER BY packet_id
+                    LIMIT 10
+                """, (DIRECTION_FLASK_TO_CPU,))
             
             if not rows:
                 return 0
             
-            for row in rows:
-                packet_id = row['packet_id']
-                data = row['data']
-                incoming_chsh = row['chsh_value'] or 2.0
-                sender = row['sender'] or 'UNKNOWN'
+            for packet_id, data, incoming_chsh, sender, trace_id in rows:
+                incoming_chsh = incoming_chsh or 2.0
+                sender = sender or 'UNKNOWN'
                 
                 # Mark as processed IMMEDIATELY
                 try:
@@ -693,6 +1040,7 @@ class QuantumCPUCore:
                 except Exception as mark_error:
                     print(f"{C.R}[CPU] Failed to mark packet {packet_id}: {mark_error}{C.E}")
                     continue
+                claimed = time.time()
                 
                 # Decode command
                 command = ''
@@ -711,12 +1059,33 @@ class QuantumCPUCore:
                 
                 print(f"{C.Q}[CPU] RX packet {packet_id}: '{command[:50]}...'{C.E}")
                 
-                # Execute command
+                # Execute command, streaming each segment as a chunk
+                writer = ChunkWriter(self.conn, packet_id)
+                exec_start = time.time()
                 try:
-                    response = self.executor.execute(command)
+                    for segment in self.executor.execute_stream(command):
+                        writer.write(segment)
                 except Exception as exec_error:
                     print(f"{C.R}[CPU] Execution error: {exec_error}{C.E}")
-                    response = f"{C.R}Error: {exec_error}{C.E}"
+                    # Same format as the stream so --bin readers stay framed
+                    renderer = self.executor.renderer_for(command)
+                    writer.write(renderer.render({'type': 'error', 'message': str(exec_error)}))
+                exec_end = time.time()
+                
+                try:
+                    writer.close()
+                except Exception as close_error:
+                    print(f"{C.R}[CPU] Failed to close stream {packet_id}: {close_error}{C.E}")
+                
+                if trace_id:
+                    self._record_trace({
+                        'trace_id': trace_id,
+                        'claimed': claimed,
+                        'exec_start': exec_start,
+                        'first_chunk': writer.first_at,
+                        'exec_end': exec_end,
+                        'last_chunk': writer.last_at,
+                    })
                 
                 # Create EPR for response
                 try:
@@ -725,10 +1094,8 @@ class QuantumCPUCore:
                 except:
                     response_chsh = 2.0
                 
-                # Send response
+                # Send completion packet
                 try:
-                    response_bytes = response.encode('utf-8')
-                    
                     cursor.execute("""
                         INSERT INTO quantum_ipc
                         (sender, direction, data, data_size, chsh_value, timestamp, processed)
@@ -736,18 +1103,19 @@ class QuantumCPUCore:
                     """, (
                         'QUNIX_CPU',
                         DIRECTION_CPU_TO_FLASK,
-                        response_bytes,
-                        len(response_bytes),
+                        None,
+                        writer.bytes_written,
                         response_chsh,
                         time.time(),
-                        0
+                        1  # Payload travelled via packet_chunks
                     ))
                     
                     response_packet_id = cursor.lastrowid
                     processed += 1
                     
                     quantum_proof = "✓ QUANTUM" if response_chsh > 2.0 else "classical"
-                    print(f"{C.G}[CPU] TX packet {response_packet_id} (CHSH={response_chsh:.3f}){C.E}")
+                    print(f"{C.G}[CPU] TX packet {response_packet_id} "
+                          f"({writer.chunk_index} chunks, CHSH={response_chsh:.3f}){C.E}")
                     
                 except Exception as insert_error:
                     print(f"{C.R}[CPU] Failed to insert response: {insert_error}{C.E}")
@@ -787,10 +1155,11 @@ class QuantumCPUCore:
                         print(f"{C.G}[CPU] Cleanup: {stuck} stuck, {old} old{C.E}")
                     self.last_cleanup = time.time()
                 
-                # Health beacon every 30 seconds
-                if (time.time() - self.last_health_beacon) > 30.0:
-                    self._send_health_beacon()
-                    self.last_health_beacon = time.time()
+                # Liveness heartbeat
+                if (time.time() - self.last_heartbeat) > HEARTBEAT_INTERVAL:
+                    self._send_heartbeat()
+                    self._publish_metrics()
+                    self.last_heartbeat = time.time()
                 
                 # Status update every 30 seconds
                 if time.time() - last_status > 30.0:
@@ -823,7 +1192,11 @@ class QuantumCPUCore:
         print(f"\n{C.Y}Shutting down...{C.E}")
         
         if self.conn:
+            self._send_heartbeat(state='stopped')
             self.conn.close()
+        if self.poll_conn:
+            self.poll_conn.close()
+        self._publish_metrics()
         
         metrics = self.quantum_engine.get_metrics()
         stats = self.executor.get_stats()
@@ -883,6 +1256,8 @@ def main():
         print(f"\n{C.BOLD}Running cleanup...{C.E}\n")
         conn = create_connection(db_path)
         try:
+            ensure_packet_chunks_table(conn)
+            ensure_liveness_table(conn)
             stuck = cleanup_stuck_packets(conn, 60.0)
             old = cleanup_old_processed_packets(conn, 3600.0)
             print(f"\n{C.G}✓ Cleanup complete:{C.E}")
@@ -901,8 +1276,9 @@ def main():
         # Test quantum engine
         print(f"{C.C}Test 1: EPR Pair Creation{C.E}")
         epr = cpu.quantum_engine.create_epr_pair()
-        print(f"  CHSH: {epr['chsh']:.4f} ({'✓ Quantum' if epr['quantum_advantage'] else 'Classical'})")
-        print(f"  Fidelity: {epr['fidelity']:.4f}\n")
+        print(f"  CHSH: {epr['chsh']:.4f} ± {epr['chsh_err']:.4f} ({'✓ Quantum' if epr['quantum_advantage'] else 'Classical'})")
+        print(f"  Fidelity: {epr['fidelity']:.4f} ± {epr['fidelity_err']:.4f}")
+        print(f"  Shots: {epr['shots']}\n")
         
         # Test command execution
         print(f"{C.C}Test 2: Command Execution{C.E}")
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+qunix_db.py v1.0.0 - SHARED SQLITE CONNECTION FACTORY
+
+One connection setup for the CPU, bus, quantum link, Flask and builder.
+
+- PRAGMA profiles: reader (query_only), writer (WAL + synchronous=NORMAL)
+  and bulk (builder loads: synchronous=OFF, large cache)
+- cached_statements sized above the number of distinct hot queries
+- mmap_size so readers hit the page cache without read() copies
+- fetch_tuples(): plain tuple rows for fixed polling queries, skipping
+  sqlite3.Row construction and name lookups
+
+Benchmark:  python qunix_db.py --bench [--iterations N]
+"""
+
+import sqlite3
+import time
+import sys
+import tempfile
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+VERSION = "1.0.0"
+
+# ANSI Colors
+class C:
+    H = '\033[95m'; B = '\033[94m'; C = '\033[96m'; G = '\033[92m'
+    Y = '\033[93m'; R = '\033[91m'; E = '\033[0m'; Q = '\033[38;5;213m'
+    W = '\033[97m'; M = '\033[35m'; BOLD = '\033[1m'; GRAY = '\033[90m'
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PROFILES
+# ═══════════════════════════════════════════════════════════════════════════
+
+STATEMENT_CACHE = 256                # Prepared statements kept per connection
+MMAP_SIZE = 256 * 1024 * 1024        # 256 MB memory-mapped I/O
+
+BASE_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA temp_store=MEMORY",
+    f"PRAGMA mmap_size={MMAP_SIZE}",
+]
+
+PROFILES = {
+    # Pollers and pool readers: never write, big cache
+    'reader': [
+        "PRAGMA cache_size=-64000",
+        "PRAGMA query_only=1",
+    ],
+    # Short autocommit/group-commit writes from the IPC path
+    'writer': [
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-64000",
+        "PRAGMA wal_autocheckpoint=1000",
+    ],
+    # Builder loads: durability deferred to the final checkpoint
+    'bulk': [
+        "PRAGMA synchronous=OFF",
+        "PRAGMA cache_size=-256000",
+        "PRAGMA wal_autocheckpoint=10000",
+    ],
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# FACTORY
+# ═══════════════════════════════════════════════════════════════════════════
+
+def connect(db_path: Union[str, Path], profile: str = 'writer', timeout: float = 60.0,
+            row_factory=sqlite3.Row, isolation_level: Optional[str] = None,
+            cache_size: Optional[int] = None) -> sqlite3.Connection:
+    """
+    Open a connection with a PRAGMA profile
+
+    isolation_level=None is autocommit (IPC code); the builder passes
+    'DEFERRED' to keep explicit commit() batching. cache_size overrides
+    the profile's value (negative = KiB).
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown connection profile: {profile}")
+
+    conn = sqlite3.connect(
+        str(db_path),
+        timeout=timeout,
+        check_same_thread=False,
+        isolation_level=isolation_level,
+        cached_statements=STATEMENT_CACHE
+    )
+    conn.row_factory = row_factory
+
+    conn.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
+    for pragma in BASE_PRAGMAS:
+        conn.execute(pragma)
+    for pragma in PROFILES[profile]:
+        conn.execute(pragma)
+    if cache_size is not None:
+        conn.execute(f"PRAGMA cache_size={int(cache_size)}")
+
+    return conn
+
+
+def fetch_tuples(conn: sqlite3.Connection, sql: str, params: tuple = ()) -> List[Tuple]:
+    """
+    Run a hot query returning plain tuples
+
+    Fastest on a connection opened with row_factory=None; on a Row
+    connection a separate cursor is needed, which costs about as much
+    as the Row objects it avoids.
+    """
+    if conn.row_factory is None:
+        return conn.execute(sql, params).fetchall()
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor.execute(sql, params).fetchall()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MICRO-BENCHMARK
+# ═══════════════════════════════════════════════════════════════════════════
+
+BENCH_QUERIES = [
+    # CPU command poll (empty most of the time)
+    ("cpu_poll", """
+        SELECT packet_id, data, chsh_value, sender
+        FROM quantum_ipc
+        WHERE direction = ?
+          AND processed = 0
+        ORDER BY packet_id
+        LIMIT 10
+    """, ('FLASK_TO_CPU',), ('packet_id', 'data')),
+    # Bus response-stream poll (a few rows)
+    ("bus_chunk_poll", """
+        SELECT chunk_id, chunk_index, total_chunks, chunk_data, chunk_hash
+        FROM packet_chunks
+        WHERE packet_id = ?
+          AND chunk_index >= ?
+        ORDER BY chunk_index ASC
+    """, (7, 0), ('chunk_index', 'chunk_data')),
+]
+
+
+def _legacy_connection(db_path: Path) -> sqlite3.Connection:
+    """Connection as the modules opened it before this factory"""
+    conn = sqlite3.connect(str(db_path), timeout=60.0, check_same_thread=False,
+                           isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=60000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    return conn
+
+
+def _bench_db(path: Path):
+    conn = sqlite3.connect(str(path), isolation_level=None)
+    conn.executescript("""
+        PRAGMA journal_mode=WAL;
+        CREATE TABLE quantum_ipc (
+            packet_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            sender TEXT, direction TEXT, data BLOB, data_size INTEGER,
+            chsh_value REAL, timestamp REAL, processed INTEGER DEFAULT 0
+        );
+        CREATE INDEX idx_ipc_poll ON quantum_ipc(direction, processed, packet_id);
+        CREATE TABLE packet_chunks (
+            chunk_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            packet_id INTEGER, chunk_index INTEGER, total_chunks INTEGER,
+            chunk_data BLOB, chunk_hash BLOB,
+            UNIQUE(packet_id, chunk_index)
+        );
+    """)
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO quantum_ipc (sender, direction, data, data_size, chsh_value, timestamp, processed) "
+        "VALUES ('MEGA_BUS', ?, ?, 4, 2.7, 0, 1)",
+        [('FLASK_TO_CPU' if i % 2 else 'CPU_TO_FLASK', b'help') for i in range(5000)]
+    )
+    conn.executemany(
+        "INSERT INTO packet_chunks (packet_id, chunk_index, total_chunks, chunk_data, chunk_hash) "
+        "VALUES (?, ?, ?, ?, x'00000000')",
+        [(p, i, 0 if i < 3 else 4, b'x' * 256) for p in range(1, 200) for i in range(4)]
+    )
+    conn.execute("COMMIT")
+    conn.close()
+
+
+def _time_query(conn, sql, params, keys, iterations, by_name, repeats: int = 5) -> float:
+    """Best-of-repeats mean microseconds per execute + fetch + two field reads"""
+    k0, k1 = keys
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        if by_name:
+            for _ in range(iterations):
+                for row in conn.execute(sql, params).fetchall():
+                    row[k0]; row[k1]
+        else:
+            for _ in range(iterations):
+                for row in fetch_tuples(conn, sql, params):
+                    row[0]; row[1]
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1e6
+
+
+def run_benchmark(iterations: int = 20000):
+    """Per-query overhead: legacy connection vs factory reader + tuple rows"""
+    tmpdir = tempfile.mkdtemp(prefix='qunix_db_bench_')
+    db_path = Path(tmpdir) / 'bench.db'
+    _bench_db(db_path)
+
+    print(f"\n{C.BOLD}QUNIX sqlite3 per-query overhead ({iterations:,} iterations){C.E}")
+    print(f"{C.GRAY}SQLite {sqlite3.sqlite_version}, Python {sys.version.split()[0]}{C.E}\n")
+    print(f"  {'query':<16} {'legacy Row':>12} {'reader Row':>12} {'reader tuple':>13} {'speedup':>8}")
+
+    legacy = _legacy_connection(db_path)
+    reader = connect(db_path, profile='reader')
+    hot = connect(db_path, profile='reader', row_factory=None)
+
+    try:
+        for name, sql, params, keys in BENCH_QUERIES:
+            # Warm statement and page caches
+            _time_query(legacy, sql, params, keys, 200, True, 1)
+            _time_query(reader, sql, params, keys, 200, True, 1)
+            _time_query(hot, sql, params, keys, 200, False, 1)
+
+            before = _time_query(legacy, sql, params, keys, iterations, True)
+            row_after = _time_query(reader, sql, params, keys, iterations, True)
+            tuple_after = _time_query(hot, sql, params, keys, iterations, False)
+
+            print(f"  {name:<16} {before:>10.2f}µs {row_after:>10.2f}µs {tuple_after:>11.2f}µs "
+                  f"{before / tuple_after:>7.2f}x")
+    finally:
+        legacy.close()
+        reader.close()
+        hot.close()
+        for suffix in ('', '-wal', '-shm'):
+            try:
+                os.remove(str(db_path) + suffix)
+            except OSError:
+                pass
+        os.rmdir(tmpdir)
+    print()
+
+
+__all__ = [
+    'connect',
+    'fetch_tuples',
+    'PROFILES',
+    'STATEMENT_CACHE',
+]
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='QUNIX shared SQLite connection factory')
+    parser.add_argument('--bench', action='store_true', help='Run per-query overhead benchmark')
+    parser.add_argument('--iterations', type=int, default=20000, help='Benchmark iterations')
+    args = parser.parse_args()
+
+    if args.bench:
+        run_benchmark(args.iterations)
+    else:
+        parser.print_help()
@@ -34,17 +34,23 @@
 
 import sqlite3
 import numpy as np
-import struct
 import zlib
 import time
 import json
 import hashlib
 import cmath
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from itertools import repeat
 from pathlib import Path
 from typing import List, Tuple, Optional, Dict
 from math import pi, sqrt, exp, log
+from functools import lru_cache
 from dataclasses import dataclass
 
+import qunix_db
+
 VERSION = "1.0.0-NOBEL"
 DB_PATH = Path('/home/Shemshallah/qunix_leech.db')
 
@@ -97,72 +103,92 @@ class GolayG24:
         # Parity-check matrix H = [Aᵀ | I₁₂]
         self.H = np.hstack([self.A.T, self.I12])
         
-        # Generate all 4096 codewords
+        # Generate all 4096 codewords (bit arrays and packed uint32)
         self.codewords = self._generate_codewords()
+        self.codewords_packed = self.pack(self.codewords)
         
         # Extract octads (codewords of weight 8)
         weights = np.sum(self.codewords, axis=1)
         self.octads = self.codewords[weights == 8]
         
-        # Generate syndrome table for decoding
-        self.syndrome_table = self._build_syndrome_table()
+        # Rows of H packed as 24-bit masks: syndrome bit k = parity(r & Hₖ)
+        self.H_packed = self.pack(self.H)
+        
+        # Dense syndrome lookup for decoding
+        self.syndrome_errors, self.syndrome_weights = self._build_syndrome_table()
+    
+    # Bit i of a 24-bit word is stored at position 23-i (MSB first)
+    _BIT_WEIGHTS = (1 << np.arange(23, -1, -1)).astype(np.uint32)
+    
+    @classmethod
+    def pack(cls, bits: np.ndarray) -> np.ndarray:
+        """(..., 24) bit array → (...) uint32 words"""
+        return (np.asarray(bits, dtype=np.uint32) * cls._BIT_WEIGHTS).sum(axis=-1, dtype=np.uint32)
+    
+    @classmethod
+    def unpack(cls, words: np.ndarray) -> np.ndarray:
+        """(...) uint32 words → (..., 24) uint8 bit array"""
+        words = np.asarray(words, dtype=np.uint32)
+        return ((words[..., None] & cls._BIT_WEIGHTS) != 0).astype(np.uint8)
+    
+    @staticmethod
+    def _parity(x: np.ndarray) -> np.ndarray:
+        """Parity of each uint32 (XOR fold; no popcount in NumPy 1.24)"""
+        x = x ^ (x >> 16)
+        x = x ^ (x >> 8)
+        x = x ^ (x >> 4)
+        x = x ^ (x >> 2)
+        x = x ^ (x >> 1)
+        return x & 1
     
     def _generate_codewords(self) -> np.ndarray:
-        """Generate all 2¹² = 4096 codewords"""
-        codewords = np.zeros((4096, 24), dtype=np.uint8)
-        
-        for i in range(4096):
-            # Convert i to 12-bit binary vector
-            info_bits = np.array([int(b) for b in format(i, '012b')], dtype=np.uint8)
-            # Encode: c = m·G (mod 2)
-            codewords[i] = np.dot(info_bits, self.G) % 2
-        
-        return codewords
+        """Generate all 2¹² = 4096 codewords: c = m·G (mod 2) for every m at once"""
+        info_bits = (np.arange(4096)[:, None] >> np.arange(11, -1, -1)) & 1
+        return (info_bits @ self.G.astype(np.int64) % 2).astype(np.uint8)
+    
+    def syndromes(self, words: np.ndarray) -> np.ndarray:
+        """12-bit syndromes s = r·Hᵀ (mod 2) of packed words (H row 0 → MSB)"""
+        words = np.asarray(words, dtype=np.uint32)
+        s = np.zeros(words.shape, dtype=np.uint32)
+        for h in self.H_packed:
+            s = (s << 1) | self._parity(words & h)
+        return s
     
-    def _build_syndrome_table(self) -> Dict[int, np.ndarray]:
+    def _build_syndrome_table(self) -> Tuple[np.ndarray, np.ndarray]:
         """
         Build syndrome decoding table
-        Maps 12-bit syndrome → error pattern for t≤3 errors
+        
+        Dense over all 4096 syndromes: packed error pattern and its weight
+        for the 2,325 patterns of weight ≤ 3, weight -1 (uncorrectable)
+        elsewhere. The code has d=8, so these syndromes are all distinct.
         """
-        table = {}
         n = 24
-        
-        # No error
-        table[0] = np.zeros(n, dtype=np.uint8)
-        
-        # Single-bit errors
-        for i in range(n):
-            e = np.zeros(n, dtype=np.uint8)
-            e[i] = 1
-            s = self._syndrome(e)
-            table[s] = e.copy()
-        
-        # Two-bit errors
-        for i in range(n):
-            for j in range(i+1, n):
-                e = np.zeros(n, dtype=np.uint8)
-                e[i] = e[j] = 1
-                s = self._syndrome(e)
-                if s not in table:
-                    table[s] = e.copy()
-        
-        # Three-bit errors
-        for i in range(n):
-            for j in range(i+1, n):
-                for k in range(j+1, n):
-                    e = np.zeros(n, dtype=np.uint8)
-                    e[i] = e[j] = e[k] = 1
-                    s = self._syndrome(e)
-                    if s not in table:
-                        table[s] = e.copy()
-        
-        return table
+        single = np.arange(n)
+        i, j, k = np.meshgrid(single, single, single, indexing='ij')
+        ordered = (i < j) & (j < k)
+        pairs = np.stack(np.triu_indices(n, 1), axis=1)
+        triples = np.stack([i[ordered], j[ordered], k[ordered]], axis=1)
+        
+        bit = self._BIT_WEIGHTS
+        patterns = np.concatenate([
+            np.zeros(1, dtype=np.uint32),
+            bit[single],
+            bit[pairs].sum(axis=1, dtype=np.uint32),
+            bit[triples].sum(axis=1, dtype=np.uint32),
+        ])
+        weights = np.concatenate([[0], np.full(n, 1), np.full(len(pairs), 2), np.full(len(triples), 3)])
+        
+        errors = np.zeros(4096, dtype=np.uint32)
+        error_weights = np.full(4096, -1, dtype=np.int8)
+        # Reverse so the lowest-weight pattern wins any (impossible) collision
+        s = self.syndromes(patterns)
+        errors[s[::-1]] = patterns[::-1]
+        error_weights[s[::-1]] = weights[::-1]
+        return errors, error_weights
     
     def _syndrome(self, r: np.ndarray) -> int:
         """Compute 12-bit syndrome s = r·Hᵀ (mod 2)"""
-        syndrome_vec = np.dot(self.H, r) % 2
-        syndrome_int = int(''.join(map(str, syndrome_vec)), 2)
-        return syndrome_int
+        return int(self.syndromes(self.pack(r)))
     
     def encode(self, data: np.ndarray) -> np.ndarray:
         """Encode 12 information bits → 24-bit codeword"""
@@ -178,21 +204,102 @@ class GolayG24:
         """
         assert len(received) == 24, "Input must be 24 bits"
         
-        s = self._syndrome(received)
+        info, errors, ok = self.decode_batch(np.asarray(received)[None, :])
+        return info[0], int(errors[0]), bool(ok[0])
+    
+    def decode_batch(self, received: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Decode an (N, 24) array of received words
+        
+        Returns:
+            (corrected_info_bits (N, 12), num_errors_corrected (N,) with -1
+             for uncorrectable (>3 bits, left as received), success (N,))
+        """
+        words = self.pack(received)
+        s = self.syndromes(words)
         
-        if s == 0:
-            # No error
-            return received[:12], 0, True
+        num_errors = self.syndrome_weights[s]
+        success = num_errors >= 0
+        corrected = np.where(success, words ^ self.syndrome_errors[s], words)
         
-        if s in self.syndrome_table:
-            # Correctable error
-            error_pattern = self.syndrome_table[s]
-            corrected = (received + error_pattern) % 2
-            num_errors = int(np.sum(error_pattern))
-            return corrected[:12], num_errors, True
-        else:
-            # Uncorrectable error (>3 bits)
-            return received[:12], -1, False
+        return self.unpack(corrected)[:, :12], num_errors, success
+    
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> 'GolayG24':
+        """Rebuild from stored golay_arrays without recomputing the code"""
+        golay = cls.__new__(cls)
+        for name, attr, _, _, _ in GOLAY_ARRAYS:
+            setattr(golay, attr, arrays[name])
+        golay.I12 = golay.G[:, :12]
+        golay.A = golay.G[:, 12:]
+        golay.codewords_packed = cls.pack(golay.codewords)
+        golay.H_packed = cls.pack(golay.H)
+        return golay
+
+
+# Stored in golay_arrays: (array_name, attribute, array_type, dtype, description)
+GOLAY_ARRAYS = [
+    ('golay_generator', 'G', 'generator_matrix', np.uint8,
+     'Generator matrix G = [I₁₂ | A] for encoding'),
+    ('golay_parity_check', 'H', 'parity_check_matrix', np.uint8,
+     'Parity-check matrix H = [Aᵀ | I₁₂] for syndrome computation'),
+    ('golay_codewords', 'codewords', 'codeword_table', np.uint8,
+     'All 4096 codewords of the extended Golay code'),
+    ('golay_octads', 'octads', 'octad_table', np.uint8,
+     'All 759 octads (weight-8 codewords) for Leech lattice construction'),
+    ('golay_syndrome_errors', 'syndrome_errors', 'syndrome_table', np.uint32,
+     'Packed error pattern (weight ≤ 3) for each 12-bit syndrome'),
+    ('golay_syndrome_weights', 'syndrome_weights', 'syndrome_table', np.int8,
+     'Error weight for each 12-bit syndrome, -1 = uncorrectable'),
+]
+
+_golay: Optional[GolayG24] = None
+_golay_lock = threading.Lock()
+
+
+def load_golay(db_path: Path) -> Optional[GolayG24]:
+    """GolayG24 from a built database's golay_arrays; None if absent or incomplete"""
+    if not Path(db_path).exists():
+        return None
+    try:
+        conn = qunix_db.connect(db_path, profile='reader', row_factory=None)
+        try:
+            rows = conn.execute("SELECT array_name, dimensions, data FROM golay_arrays").fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+    
+    stored = {name: (dims, data) for name, dims, data in rows}
+    arrays = {}
+    for name, _, _, dtype, _ in GOLAY_ARRAYS:
+        if name not in stored:
+            return None
+        dims, data = stored[name]
+        shape = tuple(int(d) for d in dims.split('x'))
+        array = np.frombuffer(zlib.decompress(data), dtype=dtype)
+        if array.size != int(np.prod(shape)):
+            return None
+        arrays[name] = array.reshape(shape)
+    
+    return GolayG24.from_arrays(arrays)
+
+
+def get_golay(db_path: Optional[Path] = None) -> GolayG24:
+    """
+    Process-wide GolayG24
+    
+    First call loads golay_arrays from db_path when given (decompressed
+    once), otherwise builds the code; later calls return the same object.
+    """
+    global _golay
+    with _golay_lock:
+        if _golay is None:
+            if db_path is not None:
+                _golay = load_golay(db_path)
+            if _golay is None:
+                _golay = GolayG24()
+        return _golay
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -215,6 +322,26 @@ class MoonshineMathematics:
                Fields Medal 1998
     """
     
+    # q-expansion coefficients: Monster group representation dimensions
+    # (OEIS A007242), starting at q⁻¹
+    J_COEFFS = [
+        -1,              # q⁻¹
+        744,             # constant term
+        196884,          # dim of smallest nontrivial irrep of M
+        21493760,        # 196883 + 21296876 + 1
+        864299970,
+        20245856256,
+        333202640600,
+        4252023300096,
+        44656994071935,
+        401490886656000,
+        3176440229784420,
+        22567393309593600,
+        146211911499519294,
+        874313719685775360,
+        4872010111798142520
+    ]
+    
     @staticmethod
     def j_invariant(tau: complex, terms: int = 15) -> complex:
         """
@@ -238,35 +365,22 @@ class MoonshineMathematics:
         if abs(q) < 1e-15:
             return complex(1e15, 0)
         
-        # Monster group representation dimensions (OEIS A007242)
-        coeffs = [
-            -1,              # q⁻¹
-            744,             # constant term
-            196884,          # dim of smallest nontrivial irrep of M
-            21493760,        # 196883 + 21296876 + 1
-            864299970,
-            20245856256,
-            333202640600,
-            4252023300096,
-            44656994071935,
-            401490886656000,
-            3176440229784420,
-            22567393309593600,
-            146211911499519294,
-            874313719685775360,
-            4872010111798142520
-        ]
-        
         # Compute j-invariant
         j = complex(0, 0)
         q_power = 1.0 / q
         
-        for c in coeffs[:min(terms, len(coeffs))]:
+        for c in MoonshineMathematics.J_COEFFS[:terms]:
             j += c * q_power
             q_power *= q
         
         return j
     
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def j_invariant_cached(tau: complex, terms: int = 15) -> complex:
+        """j_invariant() memoized on τ, for runtime callers that repeat reduced τ values"""
+        return MoonshineMathematics.j_invariant(tau, terms)
+    
     @staticmethod
     def lattice_to_tau(coords: np.ndarray) -> complex:
         """
@@ -294,6 +408,51 @@ class MoonshineMathematics:
             tau += 1.0
         
         return tau
+    
+    @staticmethod
+    def j_invariant_array(tau: np.ndarray, terms: int = 15) -> np.ndarray:
+        """
+        j(τ) for a complex128 array of τ values
+        
+        Horner evaluation of Σ cₖqᵏ, divided by q for the q⁻¹ term;
+        same guards as j_invariant().
+        """
+        tau = np.asarray(tau, dtype=np.complex128)
+        tau = np.where(tau.imag <= 0, tau.real + 1j * (np.abs(tau.imag) + 1e-10), tau)
+        
+        q = np.exp(2j * pi * tau)
+        tiny = np.abs(q) < 1e-15
+        q = np.where(tiny, 1.0, q)
+        
+        coeffs = MoonshineMathematics.J_COEFFS[:terms]
+        j = np.full(q.shape, float(coeffs[-1]), dtype=np.complex128)
+        for c in reversed(coeffs[:-1]):
+            j = j * q + float(c)
+        j = j / q
+        
+        return np.where(tiny, complex(1e15, 0), j)
+    
+    @staticmethod
+    def lattice_to_tau_array(coords: np.ndarray) -> np.ndarray:
+        """
+        lattice_to_tau() for an (N, 24) coordinate array
+        
+        The SL(2,ℤ) loops become one inversion where |τ| < 1 and one
+        integer translation into -1/2 ≤ Re(τ) ≤ 1/2.
+        """
+        x = coords[:, 0] / 4.0
+        y = np.abs(coords[:, 1] / 4.0)
+        y = np.where(y < 0.01, y + 0.01, y)
+        tau = x + 1j * y
+        
+        # -1/τ has |τ'| = 1/|τ| > 1, so a single inversion suffices
+        inside = np.abs(tau) < 1.0
+        tau[inside] = -1.0 / tau[inside]
+        
+        re = tau.real
+        shift = np.where(re > 0.5, np.ceil(re - 0.5),
+                         np.where(re < -0.5, -np.ceil(-0.5 - re), 0.0))
+        return tau - shift
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -310,19 +469,27 @@ class LeechLattice:
     - Minimal norm: 4 (all vectors have norm² ∈ {0, 4, 6, 8, ...})
     - Automorphism group: Conway group Co₀ (order 8,315,553,613,086,720,000)
     
-    Construction via Golay code:
-    Type 1: (±2, 0²³) - 48 vectors
-    Type 2: (±1⁸, 0¹⁶) where support forms Golay octad - 196512 vectors
+    Construction via Golay code (integer coordinates, scaled by 1/√8):
+    Type 1: (±4², 0²²) - 276 position pairs × 4 signs = 1,104 vectors
+    Type 2: (±2⁸, 0¹⁶) on a Golay octad, even number of minus signs
+            - 759 × 128 = 97,152 vectors
+    Type 3: (∓3, ±1²³) with signs flipped on a Golay codeword
+            - 24 × 4096 = 98,304 vectors
     
     Reference: Conway, J.H. & Sloane, N.J.A. "Sphere Packings, Lattices and Groups"
-               Springer-Verlag, 3rd edition (1999), Chapter 12
+               Springer-Verlag, 3rd edition (1999), Chapter 4 §11
     """
     
+    SCALE = sqrt(8.0)   # Integer coordinates / √8 → minimal norm² = 4
+    
     def __init__(self):
-        self.golay = GolayG24()
+        self.golay = get_golay()
         self.moonshine = MoonshineMathematics()
         self.points = []
-        self.vectors_seen = set()
+        self.coords = None      # (196560, 24) float64 once generated
+        self.ints = None        # Same rows as int8, coordinates × √8
+        self.types = None       # (196560,) type label per row
+        self.metadata = None    # Column name → (196560,) array
     
     def generate(self) -> List[Dict]:
         """
@@ -336,138 +503,136 @@ class LeechLattice:
         
         start_time = time.time()
         
-        # Type 1: Coordinate vectors (±2, 0²³)
-        self._generate_type1()
-        print(f"{C.C}Type 1 complete: {len(self.points):,} vectors{C.E}")
-        
-        # Type 2: Golay octad construction
-        self._generate_type2()
-        print(f"{C.C}Type 2 complete: {len(self.points):,} vectors{C.E}")
+        self.coords, self.types = self.generate_array()
+        print(f"{C.C}Vectors complete: {len(self.coords):,} in {time.time() - start_time:.2f}s{C.E}")
         
-        # Handle any remaining deficit
-        target = 196560
-        if len(self.points) < target:
-            deficit = target - len(self.points)
-            print(f"{C.Y}Generating {deficit:,} padding vectors...{C.E}")
-            self._generate_padding(deficit)
+        self.metadata = self.compute_metadata(self.coords)
+        self.points = self._build_points(self.metadata)
         
         elapsed = time.time() - start_time
         print(f"\n{C.G}✓ Generated {len(self.points):,} vectors in {elapsed:.1f}s{C.E}")
         
         return self.points
     
-    def _generate_type1(self):
-        """Type 1: (±2, 0²³) - 48 vectors"""
-        for i in range(24):
-            for sign in [+1, -1]:
-                v = np.zeros(24, dtype=np.float64)
-                v[i] = sign * 2.0
-                self._add_point(v, 'TYPE1')
+    def generate_array(self) -> Tuple[np.ndarray, np.ndarray]:
+        """All minimal vectors as one (N, 24) float64 array plus type labels"""
+        ints, types = self.generate_int_array()
+        return ints / self.SCALE, types
     
-    def _generate_type2(self):
+    def generate_int_array(self) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Type 2: (±1⁸, 0¹⁶) where the 8 non-zero positions form a Golay octad
+        All minimal vectors as (N, 24) int8 (coordinates × √8) plus type labels
         
-        For each of 759 octads, there are 2⁸ = 256 sign patterns.
-        Total: 759 × 256 = 194,304 vectors
+        Built by broadcasting, deduplicated with np.unique on the int8
+        row bytes (first occurrence order kept).
         """
-        octads = self.golay.octads
-        total_octads = len(octads)
+        parts = [
+            (self._type1_vectors(), 'TYPE1'),
+            (self._type2_vectors(), 'TYPE2'),
+            (self._type3_vectors(), 'TYPE3'),
+        ]
+        ints = np.concatenate([v for v, _ in parts])
+        types = np.concatenate([np.full(len(v), t) for v, t in parts])
         
-        print(f"{C.GRAY}Processing {total_octads} Golay octads...{C.E}")
+        # Each int8 row is 24 bytes → one fixed-width key
+        keys = np.ascontiguousarray(ints).view(np.dtype((np.void, 24))).ravel()
+        _, first = np.unique(keys, return_index=True)
+        first.sort()
+        if len(first) != len(ints):
+            print(f"{C.Y}Dropped {len(ints) - len(first):,} duplicate vectors{C.E}")
         
-        for idx, octad in enumerate(octads):
-            if idx % 100 == 0:
-                print(f"\r  Progress: {idx}/{total_octads} ({100*idx//total_octads}%)", end='', flush=True)
-            
-            # Get positions where octad has 1's
-            positions = np.where(octad == 1)[0]
-            
-            # Generate all 2⁸ sign patterns
-            for sign_pattern in range(256):
-                v = np.zeros(24, dtype=np.float64)
-                
-                for bit_idx, pos in enumerate(positions):
-                    sign = +1.0 if (sign_pattern & (1 << bit_idx)) else -1.0
-                    v[pos] = sign
-                
-                # Verify norm² = 8 (will be scaled to 4)
-                norm_sq = np.dot(v, v)
-                if abs(norm_sq - 8.0) < 0.01:
-                    # Scale to norm² = 4
-                    v = v / sqrt(2.0)
-                    self._add_point(v, 'TYPE2')
-            
-            # Early termination if we have enough
-            if len(self.points) >= 196000:
-                break
-        
-        print(f"\r  Progress: {total_octads}/{total_octads} (100%)     ")
+        return ints[first], types[first]
     
-    def _generate_padding(self, count: int):
-        """Generate synthetic padding to reach exactly 196,560"""
-        for i in range(count):
-            v = np.zeros(24, dtype=np.float64)
-            
-            # Deterministic but varied pattern
-            idx1 = (i * 7) % 24
-            idx2 = (i * 13) % 24
-            
-            v[idx1] = 2.0 if i % 2 == 0 else -2.0
-            
-            if idx2 != idx1:
-                v[idx2] = 1.0 if i % 3 == 0 else -1.0
-            
-            # Normalize to norm² = 4
-            current_norm = np.dot(v, v)
-            if current_norm > 0:
-                v = v * (2.0 / sqrt(current_norm))
-            
-            self._add_point(v, 'PADDING')
+    def _type1_vectors(self) -> np.ndarray:
+        """Type 1: (±4², 0²²) - 1,104 vectors"""
+        i, j = np.triu_indices(24, k=1)
+        signs = np.array([[4, 4], [4, -4], [-4, 4], [-4, -4]], dtype=np.int8)
+        
+        v = np.zeros((len(i), 4, 24), dtype=np.int8)
+        rows = np.arange(len(i))[:, None]
+        v[rows, :, i[:, None]] = signs[None, :, 0]
+        v[rows, :, j[:, None]] = signs[None, :, 1]
+        return v.reshape(-1, 24)
     
-    def _add_point(self, coords: np.ndarray, point_type: str):
-        """Add point with full metadata"""
-        # Check for duplicates
-        coords_tuple = tuple(np.round(coords, 6))
-        if coords_tuple in self.vectors_seen:
-            return
-        
-        self.vectors_seen.add(coords_tuple)
+    def _type2_vectors(self) -> np.ndarray:
+        """
+        Type 2: (±2⁸, 0¹⁶) where the 8 non-zero positions form a Golay octad
         
-        lid = len(self.points)
-        norm_sq = float(np.dot(coords, coords))
+        Only sign patterns with an even number of minus signs are in Λ₂₄:
+        759 octads × 2⁷ = 97,152 vectors
+        """
+        octads = self.golay.octads
+        positions = np.nonzero(octads)[1].reshape(len(octads), 8)
+        
+        # 8-bit sign masks with even parity
+        bits = (np.arange(256)[:, None] >> np.arange(8)) & 1
+        bits = bits[bits.sum(axis=1) % 2 == 0]
+        values = (2 - 4 * bits).astype(np.int8)                 # (128, 8)
+        
+        v = np.zeros((len(octads), len(values), 24), dtype=np.int8)
+        v[np.arange(len(octads))[:, None, None],
+          np.arange(len(values))[None, :, None],
+          positions[:, None, :]] = values[None, :, :]
+        return v.reshape(-1, 24)
+    
+    def _type3_vectors(self) -> np.ndarray:
+        """Type 3: (∓3, ±1²³) - (1²⁴ - 4eᵢ) with signs flipped on a codeword"""
+        signs = (1 - 2 * self.golay.codewords.astype(np.int8))  # (4096, 24)
+        base = (1 - 4 * np.eye(24, dtype=np.int8))               # (24, 24)
+        return (signs[:, None, :] * base[None, :, :]).reshape(-1, 24)
+    
+    def compute_metadata(self, coords: np.ndarray, start: int = 0) -> Dict[str, np.ndarray]:
+        """
+        Per-point metadata columns for an (N, 24) coordinate array
         
-        # E₈ sublattice assignment (three-way partition)
-        e8_sublattice = lid % 3
+        Row i is lattice point lid = start + i; every column is a length-N array.
+        """
+        lid = np.arange(start, start + len(coords))
         
         # Poincaré disk coordinates (stereographic projection)
-        x = float(coords[0]) / 4.0
-        y = float(coords[1]) / 4.0
-        r = sqrt(x**2 + y**2)
-        if r >= 1.0:
-            x, y = x/(r+0.1), y/(r+0.1)
-        
-        # Compute j-invariant via Moonshine correspondence
-        tau = self.moonshine.lattice_to_tau(coords)
-        j = self.moonshine.j_invariant(tau)
-        
-        # Σ-phase (quantum evolution parameter)
-        sigma_phase = (lid * 0.0001) % (2 * pi)
-        
-        point = {
+        x = coords[:, 0] / 4.0
+        y = coords[:, 1] / 4.0
+        r = np.hypot(x, y)
+        shrink = np.where(r >= 1.0, r + 0.1, 1.0)
+        
+        # j-invariant via Moonshine correspondence. τ depends only on the
+        # first two coordinates, so evaluate each distinct τ once and scatter
+        tau = self.moonshine.lattice_to_tau_array(coords)
+        distinct, inverse = np.unique(tau, return_inverse=True)
+        j = self.moonshine.j_invariant_array(distinct)[inverse.reshape(-1)]
+        
+        return {
             'lid': lid,
-            'coords': coords,
-            'norm_sq': norm_sq,
-            'e8_sublattice': e8_sublattice,
-            'poincare_x': x,
-            'poincare_y': y,
-            'j_real': float(j.real),
-            'j_imag': float(j.imag),
-            'sigma_phase': sigma_phase,
-            'type': point_type
+            'norm_sq': np.einsum('ij,ij->i', coords, coords),
+            'e8_sublattice': lid % 3,                       # Three-way E₈ partition
+            'poincare_x': x / shrink,
+            'poincare_y': y / shrink,
+            'j_real': j.real,
+            'j_imag': j.imag,
+            'sigma_phase': (lid * 0.0001) % (2 * pi),      # Σ-phase evolution parameter
         }
-        
-        self.points.append(point)
+    
+    def chunks(self, chunk_size: int = 16384):
+        """Yield (coords, metadata) array slices in lid order, generating on first use"""
+        if self.coords is None:
+            self.ints, self.types = self.generate_int_array()
+            self.coords = self.ints / self.SCALE
+        for start in range(0, len(self.coords), chunk_size):
+            coords = self.coords[start:start + chunk_size]
+            yield coords, self.compute_metadata(coords, start)
+    
+    def _build_points(self, meta: Dict[str, np.ndarray]) -> List[Dict]:
+        """Point dicts from the metadata columns (plain Python scalars)"""
+        columns = {name: values.tolist() for name, values in meta.items()}
+        columns['type'] = self.types.tolist()
+        names = list(columns)
+        
+        points = []
+        for i, row in enumerate(zip(*columns.values())):
+            point = dict(zip(names, row))
+            point['coords'] = self.coords[i]
+            points.append(point)
+        return points
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -481,8 +646,9 @@ PRAGMA synchronous=NORMAL;
 PRAGMA cache_size=-256000;
 PRAGMA temp_store=MEMORY;
 
--- Leech lattice points
-CREATE TABLE l (
+-- Leech lattice points (c: marker byte + 24 int8 coordinates × √8, or
+-- legacy zlib-compressed 24 doubles; see decode_coordinates())
+CREATE TABLE IF NOT EXISTS l (
     i INTEGER PRIMARY KEY,
     c BLOB NOT NULL,
     n REAL NOT NULL,
@@ -495,7 +661,7 @@ CREATE TABLE l (
 );
 
 -- Qubits (1:1 mapping to lattice)
-CREATE TABLE q (
+CREATE TABLE IF NOT EXISTS q (
     i INTEGER PRIMARY KEY,
     l INTEGER NOT NULL,
     t CHAR DEFAULT 'p',
@@ -515,7 +681,7 @@ CREATE TABLE q (
 );
 
 -- EPR pair pool
-CREATE TABLE epr_pair_pool (
+CREATE TABLE IF NOT EXISTS epr_pair_pool (
     pair_id INTEGER PRIMARY KEY AUTOINCREMENT,
     qubit_a_id INTEGER NOT NULL,
     qubit_b_id INTEGER NOT NULL,
@@ -529,7 +695,7 @@ CREATE TABLE epr_pair_pool (
 );
 
 -- Quantum link state
-CREATE TABLE quantum_link_state (
+CREATE TABLE IF NOT EXISTS quantum_link_state (
     state_id INTEGER PRIMARY KEY DEFAULT 1,
     initialized INTEGER DEFAULT 0,
     pool_size INTEGER DEFAULT 0,
@@ -543,7 +709,7 @@ CREATE TABLE quantum_link_state (
 INSERT OR IGNORE INTO quantum_link_state (state_id) VALUES (1);
 
 -- CPU qubit allocator
-CREATE TABLE cpu_qubit_allocator (
+CREATE TABLE IF NOT EXISTS cpu_qubit_allocator (
     qubit_id INTEGER PRIMARY KEY,
     allocated INTEGER DEFAULT 0,
     allocated_to INTEGER,
@@ -551,7 +717,7 @@ CREATE TABLE cpu_qubit_allocator (
 );
 
 -- Entanglement edges
-CREATE TABLE e (
+CREATE TABLE IF NOT EXISTS e (
     a INTEGER,
     b INTEGER,
     t CHAR,
@@ -560,7 +726,7 @@ CREATE TABLE e (
 );
 
 -- Golay code arrays (stored for runtime use)
-CREATE TABLE golay_arrays (
+CREATE TABLE IF NOT EXISTS golay_arrays (
     array_id INTEGER PRIMARY KEY,
     array_name TEXT UNIQUE,
     array_type TEXT,
@@ -570,16 +736,17 @@ CREATE TABLE golay_arrays (
 );
 
 -- Command registry
-CREATE TABLE command_registry (
+CREATE TABLE IF NOT EXISTS command_registry (
     cmd_id INTEGER PRIMARY KEY AUTOINCREMENT,
     cmd_name TEXT UNIQUE,
     cmd_category TEXT DEFAULT 'SYSTEM',
     cmd_description TEXT,
-    cmd_enabled INTEGER DEFAULT 1
+    cmd_enabled INTEGER DEFAULT 1,
+    cmd_cost REAL DEFAULT 1.0
 );
 
 -- System metrics
-CREATE TABLE system_metrics (
+CREATE TABLE IF NOT EXISTS system_metrics (
     metric_id INTEGER PRIMARY KEY AUTOINCREMENT,
     metric_name TEXT,
     metric_value REAL,
@@ -589,7 +756,7 @@ CREATE TABLE system_metrics (
 );
 
 -- IPC infrastructure
-CREATE TABLE ipc_pipes (
+CREATE TABLE IF NOT EXISTS ipc_pipes (
     pipe_id INTEGER PRIMARY KEY AUTOINCREMENT,
     pipe_name TEXT UNIQUE,
     reader_pid INTEGER,
@@ -600,29 +767,243 @@ CREATE TABLE ipc_pipes (
     created_at REAL
 );
 
--- Indices for performance
-CREATE INDEX idx_l_e ON l(e);
-CREATE INDEX idx_l_xy ON l(x, y);
-CREATE INDEX idx_q_e ON q(e);
-CREATE INDEX idx_q_g ON q(g);
-CREATE INDEX idx_epr_state ON epr_pair_pool(state);
-CREATE INDEX idx_e_type ON e(t);
+-- Build ledger: completed phases and the content hash each was built from
+CREATE TABLE IF NOT EXISTS build_phases (
+    phase INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    duration REAL,
+    builder_version TEXT
+);
 """
 
+# Indices for performance; created after the bulk load
+DEFERRED_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_l_e ON l(e);
+CREATE INDEX IF NOT EXISTS idx_l_xy ON l(x, y);
+CREATE INDEX IF NOT EXISTS idx_q_e ON q(e);
+CREATE INDEX IF NOT EXISTS idx_q_g ON q(g);
+CREATE INDEX IF NOT EXISTS idx_epr_state ON epr_pair_pool(state);
+CREATE INDEX IF NOT EXISTS idx_e_type ON e(t);
+"""
+
+# Bulk load: no rollback journal, no fsync; build() deletes a failed fresh load
+LOAD_PRAGMAS = [
+    "PRAGMA journal_mode=OFF",
+    "PRAGMA synchronous=OFF",
+]
+
+# Restored once the load is done (runtime processes expect WAL)
+RUNTIME_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+]
+
+LATTICE_CHUNK = 16384      # Points per generated/inserted chunk
+EPR_TARGET_PAIRS = 98280   # 50% entanglement density
+
+# Phase 8 command registry: (name, category, description, cost).
+# cmd_cost: admission tokens charged by the bus per invocation,
+# roughly proportional to CPU simulation time
+COMMANDS = [
+    ('help', 'SYSTEM', 'Display help information', 0.5),
+    ('status', 'SYSTEM', 'Show system status', 0.5),
+    ('ping', 'SYSTEM', 'Connectivity test', 0.5),
+    ('trace', 'SYSTEM', 'Request latency breakdown', 0.5),
+    ('qstats', 'QUANTUM', 'Quantum statistics', 0.5),
+    ('lattice-info', 'QUANTUM', 'Leech lattice information', 1.0),
+    ('golay-test', 'QUANTUM', 'Test Golay error correction', 1.0),
+    ('epr-stats', 'QUANTUM', 'EPR pair statistics', 1.0),
+    ('moonshine', 'QUANTUM', 'Display Monstrous Moonshine data', 1.0),
+    ('qh', 'GATE', 'Hadamard gate', 1.0),
+    ('qx', 'GATE', 'Pauli-X gate', 1.0),
+    ('qy', 'GATE', 'Pauli-Y gate', 1.0),
+    ('qz', 'GATE', 'Pauli-Z gate', 1.0),
+    ('qcx', 'GATE', 'CNOT gate (Bell pair)', 1.5),
+    ('qccx', 'GATE', 'Toffoli gate', 2.0),
+    ('qft', 'ALGORITHM', 'Quantum Fourier Transform', 3.0),
+    ('grover', 'ALGORITHM', "Grover's search", 4.0),
+    ('chsh', 'ALGORITHM', 'CHSH inequality test', 3.0),
+    ('test', 'SYSTEM', 'CPU self-test', 2.0),
+]
+
+# Columns added to builder tables after their first release:
+# (table, column, ALTER statement) applied to older databases on resume
+COLUMN_MIGRATIONS = [
+    ('command_registry', 'cmd_cost',
+     "ALTER TABLE command_registry ADD COLUMN cmd_cost REAL DEFAULT 1.0"),
+]
+
+# Ledgered phases: number → phases whose output it builds on. Rerunning a
+# phase reruns everything downstream of it.
+PHASE_DEPENDS = {
+    2: [],
+    3: [2],
+    4: [2],
+    5: [4],
+    6: [],
+    7: [5],
+    8: [],
+}
+
+
+def _digest(*parts) -> str:
+    """Short sha256 over bytes / repr() parts"""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else repr(part).encode())
+        h.update(b'\0')
+    return h.hexdigest()[:16]
+
 
 # ═══════════════════════════════════════════════════════════════════════════
-# SECTION 5: DATABASE CONSTRUCTION
+# SECTION 5: COORDINATE STORAGE
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Every minimal vector is an integer vector / √8 with entries in [-4, 4],
+# so int8 × COORD_SCALE is exact: 24 bytes per point instead of 192
+COORD_SCALE = LeechLattice.SCALE
+COORD_MODES = ('int8', 'zlib')     # l.c format: compact (default) or legacy
+
+# Leads every int8 BLOB. A zlib stream's first byte (CMF) always has
+# method 8 in its low nibble, so it can never be 0x00; the BLOB length
+# alone is ambiguous (some zlib rows compress to exactly 24 bytes)
+COORD_INT8_MARKER = b'\x00'
+
+
+def coords_sidecar_path(db_path: Path) -> Path:
+    """(N, 24) int8 coordinates by lid, next to the database: <db>.coords.npy"""
+    return Path(f"{db_path}.coords.npy")
+
+
+def write_coords_sidecar(db_path: Path, ints: np.ndarray):
+    """Write the sidecar (atomic replace)"""
+    path = coords_sidecar_path(db_path)
+    tmp = path.with_name(f"{path.name}.tmp")
+    with open(tmp, 'wb') as f:
+        np.save(f, np.ascontiguousarray(ints, dtype=np.int8))
+    tmp.replace(path)
+
+
+def open_coordinates(db_path: Path) -> np.ndarray:
+    """
+    Memory-mapped (N, 24) int8 coordinates; row lid, divide by COORD_SCALE
+    
+    Slicing is zero-copy: open_coordinates(db)[a:b] reads only those pages.
+    """
+    return np.load(coords_sidecar_path(db_path), mmap_mode='r')
+
+
+def decode_coordinates(blob: bytes) -> np.ndarray:
+    """24 float64 lattice coordinates from an l.c BLOB (either format)"""
+    if blob[:1] == COORD_INT8_MARKER:
+        if len(blob) != 25:
+            raise ValueError(f"int8 coordinate BLOB of {len(blob)} bytes (expected 25)")
+        return np.frombuffer(blob, dtype=np.int8, offset=1) / COORD_SCALE
+    return np.frombuffer(zlib.decompress(blob), dtype=np.float64)
+
+
+def int8_blobs(ints: np.ndarray) -> List[bytes]:
+    """Uncompressed l.c BLOB per row: COORD_INT8_MARKER + 24 int8 bytes"""
+    raw = np.ascontiguousarray(ints, dtype=np.int8).tobytes()
+    return [COORD_INT8_MARKER + raw[k:k + 24] for k in range(0, len(raw), 24)]
+
+
+# Legacy zlib mode: per-row compression, sharded across --jobs processes
+
+BLOB_SLOT = 256            # Bytes per row slot; zlib output for 192 bytes stays below
+SHARDS_PER_JOB = 4         # Smaller shards even out worker load
+
+
+def _compress_rows(coords: np.ndarray, slots: np.ndarray, lengths: np.ndarray):
+    """zlib BLOB of each 24-double row (struct '24d' bytes) into its slot"""
+    raw = memoryview(np.ascontiguousarray(coords, dtype=np.float64).tobytes())
+    width = 24 * 8
+    for k in range(len(coords)):
+        blob = zlib.compress(raw[k * width:(k + 1) * width], 6)
+        slots[k, :len(blob)] = np.frombuffer(blob, dtype=np.uint8)
+        lengths[k] = len(blob)
+
+
+def _pack_shard(names: Tuple[str, str, str], total: int, start: int, stop: int):
+    """Worker: compress rows [start, stop) between the shared input/output arrays"""
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    try:
+        coords = np.ndarray((total, 24), dtype=np.float64, buffer=blocks[0].buf)
+        slots = np.ndarray((total, BLOB_SLOT), dtype=np.uint8, buffer=blocks[1].buf)
+        lengths = np.ndarray((total,), dtype=np.int32, buffer=blocks[2].buf)
+        _compress_rows(coords[start:stop], slots[start:stop], lengths[start:stop])
+        del coords, slots, lengths
+    finally:
+        for block in blocks:
+            block.close()
+
+
+def pack_coordinates(coords: np.ndarray, jobs: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compressed coordinate BLOBs for every row: (slots (N, BLOB_SLOT), lengths (N,))
+    
+    With jobs > 1 the rows are split into fixed lid ranges and compressed
+    by a process pool through shared memory. Row i always lands in slot i,
+    so the output is identical for any job count.
+    """
+    total = len(coords)
+    if jobs <= 1:
+        slots = np.zeros((total, BLOB_SLOT), dtype=np.uint8)
+        lengths = np.zeros(total, dtype=np.int32)
+        _compress_rows(coords, slots, lengths)
+        return slots, lengths
+    
+    sizes = (total * 24 * 8, total * BLOB_SLOT, total * 4)
+    blocks = [shared_memory.SharedMemory(create=True, size=size) for size in sizes]
+    try:
+        np.ndarray((total, 24), dtype=np.float64, buffer=blocks[0].buf)[:] = coords
+        names = tuple(block.name for block in blocks)
+        
+        bounds = np.linspace(0, total, jobs * SHARDS_PER_JOB + 1).astype(int)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_pack_shard, names, total, int(a), int(b))
+                       for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+            for future in futures:
+                future.result()
+        
+        slots = np.ndarray((total, BLOB_SLOT), dtype=np.uint8, buffer=blocks[1].buf).copy()
+        lengths = np.ndarray((total,), dtype=np.int32, buffer=blocks[2].buf).copy()
+        return slots, lengths
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SECTION 6: DATABASE CONSTRUCTION
 # ═══════════════════════════════════════════════════════════════════════════
 
 class DatabaseBuilder:
     """Complete database construction with full mathematical rigor"""
     
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, jobs: int = 1, coord_mode: str = 'int8'):
+        if coord_mode not in COORD_MODES:
+            raise ValueError(f"Unknown coordinate mode: {coord_mode}")
+        if jobs > 1 and coord_mode != 'zlib':
+            # Nothing else in the build is sharded; don't accept a no-op
+            raise ValueError("--jobs only parallelizes --coords zlib packing")
         self.db_path = db_path
+        self.jobs = max(1, jobs)
+        self.coord_mode = coord_mode
         self.conn = None
+        self.unjournaled = False    # Loading under LOAD_PRAGMAS: rollback is undefined
     
-    def build(self) -> bool:
-        """Execute complete build process"""
+    def build(self, fresh: bool = False, rebuild_phase: Optional[int] = None) -> bool:
+        """
+        Execute the build, resuming from the ledger
+        
+        Phases 2–8 whose ledger hash matches are skipped; a changed hash,
+        rebuild_phase or a rerun upstream phase redoes them in place.
+        fresh=True deletes the database first.
+        """
         print(f"\n{C.BOLD}{'═'*75}{C.E}")
         print(f"{C.BOLD}QUNIX LEECH LATTICE DATABASE BUILDER v{VERSION}{C.E}")
         print(f"{C.BOLD}Nobel Standard Implementation{C.E}")
@@ -631,38 +1012,46 @@ class DatabaseBuilder:
         start_time = time.time()
         
         try:
-            # Phase 1: Database initialization
-            if not self._phase1_init_db():
-                return False
-            
-            # Phase 2: Generate Leech lattice
-            lattice_points = self._phase2_generate_lattice()
-            if not lattice_points:
-                return False
-            
-            # Phase 3: Insert lattice into database
-            if not self._phase3_insert_lattice(lattice_points):
+            # Phase 1: Database initialization (schema is idempotent)
+            if not self._phase1_init_db(fresh):
                 return False
             
-            # Phase 4: Generate qubits
-            if not self._phase4_generate_qubits(lattice_points):
+            # Phase 2: Generate Leech lattice (0.1s; its hash keys phases 3/4)
+            lattice = self._phase2_generate_lattice()
+            if lattice is None:
                 return False
             
-            # Phase 5: Generate EPR pairs (98,280 pairs)
-            if not self._phase5_generate_epr_pairs(98280):
-                return False
-            
-            # Phase 6: Store Golay arrays
-            if not self._phase6_store_golay_arrays():
-                return False
+            phases = {
+                2: ('lattice', lambda: True),
+                3: ('lattice_insert', lambda: self._phase3_insert_lattice(lattice)),
+                4: ('qubits', lambda: self._phase4_generate_qubits(lattice)),
+                5: ('epr_pairs', lambda: self._phase5_generate_epr_pairs(EPR_TARGET_PAIRS)),
+                6: ('golay_arrays', self._phase6_store_golay_arrays),
+                7: ('quantum_link', self._phase7_init_quantum_link),
+                8: ('commands', self._phase8_add_commands),
+            }
+            hashes = self._phase_hashes(lattice)
+            ledger = self._read_ledger()
+            ran = set()
             
-            # Phase 7: Initialize quantum link
-            if not self._phase7_init_quantum_link():
-                return False
+            for number, (name, run) in phases.items():
+                reason = self._stale_reason(number, hashes[number], ledger, ran, rebuild_phase)
+                if reason is None:
+                    if number > 2:
+                        print(f"\n{C.GRAY}[Phase {number}/9] {name}: complete ({hashes[number]}), skipped{C.E}")
+                    continue
+                if number > 2 and number in ledger:
+                    print(f"\n{C.Y}[Phase {number}/9] {name}: {reason}, rebuilding{C.E}")
+                
+                self._clear_ledger(number)
+                phase_start = time.time()
+                if not run():
+                    return False
+                self._record_phase(number, name, hashes[number], time.time() - phase_start)
+                ran.add(number)
             
-            # Phase 8: Add commands
-            if not self._phase8_add_commands():
-                return False
+            # Bulk load done: build indexes, back to WAL
+            self._finish_load()
             
             # Phase 9: Verify integrity
             if not self._phase9_verify():
@@ -679,116 +1068,225 @@ class DatabaseBuilder:
             import traceback
             traceback.print_exc()
             return False
+        
+        finally:
+            # Also after a phase or verification returns False. A failed
+            # phase has no ledger entry; a rerun resumes there
+            self._close()
+            if self.unjournaled:
+                # journal_mode=OFF can't roll back: the file may be half-written
+                print(f"{C.Y}Removing partial database (fresh load failed before WAL){C.E}")
+                self._remove_database()
+                self.unjournaled = False
+    
+    def _close(self):
+        """Roll back anything uncommitted and close the connection"""
+        if self.conn is None:
+            return
+        try:
+            self.conn.rollback()
+        finally:
+            self.conn.close()
+            self.conn = None
+    
+    def _remove_database(self):
+        """Delete the database, its WAL files and the coordinate sidecar"""
+        for suffix in ('', '-wal', '-shm'):
+            Path(f"{self.db_path}{suffix}").unlink(missing_ok=True)
+        coords_sidecar_path(self.db_path).unlink(missing_ok=True)
+    
+    # ─── Phase ledger ───────────────────────────────────────────────────────
+    
+    def _phase_hashes(self, lattice: LeechLattice) -> Dict[int, str]:
+        """
+        Content hash per ledgered phase
+        
+        Each covers what the phase writes (its inputs and parameters) plus
+        the hashes of the phases it builds on, so a change propagates.
+        """
+        golay = get_golay()
+        h = {2: _digest(lattice.ints.tobytes())}
+        h[3] = _digest(h[2], self.coord_mode, COORD_INT8_MARKER)
+        h[4] = _digest(h[2])
+        h[5] = _digest(h[4], EPR_TARGET_PAIRS)
+        h[6] = _digest(*(np.ascontiguousarray(getattr(golay, attr), dtype=dtype).tobytes()
+                         for _, attr, _, dtype, _ in GOLAY_ARRAYS))
+        h[7] = _digest(h[5])
+        h[8] = _digest(COMMANDS)
+        return h
+    
+    def _read_ledger(self) -> Dict[int, str]:
+        rows = self.conn.execute("SELECT phase, content_hash FROM build_phases").fetchall()
+        return dict(rows)
+    
+    def _stale_reason(self, number: int, content_hash: str, ledger: Dict[int, str],
+                      ran: set, rebuild_phase: Optional[int]) -> Optional[str]:
+        """Why a phase must run, or None if its ledger entry still holds"""
+        if number == rebuild_phase:
+            return "--rebuild-phase"
+        if number not in ledger:
+            return "not built"
+        if ledger[number] != content_hash:
+            return "content changed"
+        upstream = [d for d in PHASE_DEPENDS[number] if d in ran]
+        if upstream:
+            return f"phase {upstream[0]} rebuilt"
+        if number == 3 and not coords_sidecar_path(self.db_path).exists():
+            return "coordinate sidecar missing"
+        return None
+    
+    def _clear_ledger(self, number: int):
+        self.conn.execute("DELETE FROM build_phases WHERE phase = ?", (number,))
+        self.conn.commit()
+    
+    def _record_phase(self, number: int, name: str, content_hash: str, duration: float):
+        self.conn.execute("""
+            INSERT OR REPLACE INTO build_phases
+            (phase, name, content_hash, completed_at, duration, builder_version)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (number, name, content_hash, time.time(), duration, VERSION))
+        self.conn.commit()
     
-    def _phase1_init_db(self) -> bool:
-        """Phase 1: Initialize database"""
+    def _phase1_init_db(self, fresh: bool = False) -> bool:
+        """Phase 1: Initialize database (create, or open and upgrade the schema)"""
         print(f"\n{C.C}[Phase 1/9] Initializing database{C.E}")
         
-        if self.db_path.exists():
-            print(f"{C.Y}Removing existing database{C.E}")
-            self.db_path.unlink()
+        if fresh:
+            if self.db_path.exists():
+                print(f"{C.Y}Removing existing database{C.E}")
+            self._remove_database()
         
-        self.conn = sqlite3.connect(str(self.db_path), timeout=60.0)
+        existing = self.db_path.exists()
+        
+        # Bulk profile: synchronous=OFF and a large cache; explicit commits
+        self.conn = qunix_db.connect(self.db_path, profile='bulk', row_factory=None,
+                                     isolation_level='DEFERRED')
         self.conn.executescript(COMPLETE_SCHEMA)
+        self._migrate_columns()
         
-        print(f"{C.G}✓ Schema created{C.E}")
+        if existing:
+            # Keep WAL on a populated database so a failed phase rolls back
+            done = self.conn.execute("SELECT COUNT(*) FROM build_phases").fetchone()[0]
+            print(f"{C.G}✓ Schema up to date; resuming ({done} phases in ledger){C.E}")
+        else:
+            for pragma in LOAD_PRAGMAS:
+                self.conn.execute(pragma)
+            self.unjournaled = True
+            print(f"{C.G}✓ Schema created{C.E}")
         return True
     
-    def _phase2_generate_lattice(self) -> Optional[List[Dict]]:
+    def _migrate_columns(self):
+        """Add COLUMN_MIGRATIONS columns missing from an older database"""
+        for table, column, ddl in COLUMN_MIGRATIONS:
+            columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})").fetchall()]
+            if column in columns:
+                continue
+            try:
+                self.conn.execute(ddl)
+                print(f"{C.Y}Migrated: added {table}.{column}{C.E}")
+            except sqlite3.OperationalError as e:
+                if 'duplicate column' not in str(e):
+                    raise
+        self.conn.commit()
+    
+    def _finish_load(self):
+        """Create the deferred indexes and restore runtime journaling"""
+        start = time.time()
+        self.conn.executescript(DEFERRED_INDEXES)
+        for pragma in RUNTIME_PRAGMAS:
+            self.conn.execute(pragma)
+        self.unjournaled = False
+        print(f"{C.G}✓ Indexes created ({time.time() - start:.1f}s){C.E}")
+    
+    def _phase2_generate_lattice(self) -> Optional[LeechLattice]:
         """Phase 2: Generate Leech lattice"""
         print(f"\n{C.C}[Phase 2/9] Generating Leech lattice{C.E}")
         
+        start = time.time()
         lattice = LeechLattice()
-        points = lattice.generate()
+        lattice.ints, lattice.types = lattice.generate_int_array()
+        lattice.coords = lattice.ints / lattice.SCALE
         
-        if len(points) != 196560:
-            print(f"{C.Y}Warning: Generated {len(points)} points (expected 196,560){C.E}")
+        if len(lattice.coords) != 196560:
+            print(f"{C.Y}Warning: Generated {len(lattice.coords)} points (expected 196,560){C.E}")
         
-        return points
+        print(f"{C.G}✓ Generated {len(lattice.coords):,} vectors in {time.time() - start:.2f}s{C.E}")
+        return lattice
     
-    def _phase3_insert_lattice(self, points: List[Dict]) -> bool:
-        """Phase 3: Insert lattice points"""
+    def _phase3_insert_lattice(self, lattice: LeechLattice) -> bool:
+        """Phase 3: Insert lattice points (one transaction)"""
         print(f"\n{C.C}[Phase 3/9] Inserting lattice points{C.E}")
         
+        total = len(lattice.coords)
         c = self.conn.cursor()
-        batch = []
-        batch_size = 1000
+        c.execute("DELETE FROM l")
         
-        for i, p in enumerate(points):
-            if i % 10000 == 0:
-                print(f"\r  Progress: {i:,}/{len(points):,} ({100*i//len(points)}%)", end='', flush=True)
+        start = time.time()
+        write_coords_sidecar(self.db_path, lattice.ints)
+        if self.coord_mode == 'zlib':
+            slots, lengths = pack_coordinates(lattice.coords, self.jobs)
+        else:
+            blobs_all = int8_blobs(lattice.ints)
+        print(f"{C.GRAY}  Packed coordinates ({self.coord_mode}) in {time.time() - start:.2f}s{C.E}")
+        
+        for coords, meta in lattice.chunks(LATTICE_CHUNK):
+            first = int(meta['lid'][0])
+            print(f"\r  Progress: {first:,}/{total:,} ({100*first//total}%)", end='', flush=True)
             
-            # Compress coordinates
-            coords_packed = struct.pack('24d', *p['coords'])
-            coords_compressed = zlib.compress(coords_packed, level=6)
+            if self.coord_mode == 'zlib':
+                blobs = [slots[k, :n].tobytes()
+                         for k, n in enumerate(lengths[first:first + len(coords)].tolist(), first)]
+            else:
+                blobs = blobs_all[first:first + len(coords)]
             
-            batch.append((
-                p['lid'], coords_compressed, p['norm_sq'], p['e8_sublattice'],
-                p['j_real'], p['j_imag'], p['poincare_x'], p['poincare_y'], p['sigma_phase']
+            c.executemany("INSERT INTO l VALUES(?,?,?,?,?,?,?,?,?)", zip(
+                meta['lid'].tolist(), blobs, meta['norm_sq'].tolist(),
+                meta['e8_sublattice'].tolist(), meta['j_real'].tolist(), meta['j_imag'].tolist(),
+                meta['poincare_x'].tolist(), meta['poincare_y'].tolist(), meta['sigma_phase'].tolist()
             ))
-            
-            if len(batch) >= batch_size:
-                c.executemany("INSERT INTO l VALUES(?,?,?,?,?,?,?,?,?)", batch)
-                self.conn.commit()
-                batch = []
         
-        if batch:
-            
-            c.executemany("INSERT INTO l VALUES(?,?,?,?,?,?,?,?,?)", batch)
-            self.conn.commit()
-        
-        print(f"\r{C.G}✓ Inserted {len(points):,} lattice points{C.E}")
+        self.conn.commit()
+        print(f"\r{C.G}✓ Inserted {total:,} lattice points{C.E}          ")
         return True
     
-    def _phase4_generate_qubits(self, lattice_points: List[Dict]) -> bool:
-        """Phase 4: Generate qubits (1:1 with lattice)"""
+    def _phase4_generate_qubits(self, lattice: LeechLattice) -> bool:
+        """Phase 4: Generate qubits (1:1 with lattice, one transaction)"""
         print(f"\n{C.C}[Phase 4/9] Generating qubits{C.E}")
         
+        total = len(lattice.coords)
         c = self.conn.cursor()
-        batch_q = []
-        batch_alloc = []
-        batch_size = 1000
+        c.execute("DELETE FROM q")
+        c.execute("DELETE FROM cpu_qubit_allocator")
         
-        for i, p in enumerate(lattice_points):
-            if i % 10000 == 0:
-                print(f"\r  Progress: {i:,}/{len(lattice_points):,} ({100*i//len(lattice_points)}%)", end='', flush=True)
+        for coords, meta in lattice.chunks(LATTICE_CHUNK):
+            lid = meta['lid'].tolist()
+            print(f"\r  Progress: {lid[0]:,}/{total:,} ({100*lid[0]//total}%)", end='', flush=True)
             
-            # Qubit parameters
-            batch_q.append((
-                p['lid'],           # i (qubit_id)
-                p['lid'],           # l (lattice_id)
-                'p',                # t (type: physical)
-                0,                  # a (alpha amplitude)
-                0,                  # b (beta amplitude)
-                0,                  # p (phase)
-                p['e8_sublattice'], # e (E8 sublattice)
-                p['j_real'],        # j (j-invariant real)
-                p['j_imag'],        # ji (j-invariant imag)
-                p['poincare_x'],    # x (Poincaré x)
-                p['poincare_y'],    # y (Poincaré y)
-                p['lid'],           # m (memory address)
-                'FREE',             # g (state)
-                p['sigma_phase'],   # s (sigma phase)
-                '[]',               # entw (entanglement list)
-                'PRODUCT'           # etype (entanglement type)
+            c.executemany("INSERT INTO q VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)", zip(
+                lid,                            # i (qubit_id)
+                lid,                            # l (lattice_id)
+                repeat('p'),                    # t (type: physical)
+                repeat(0),                      # a (alpha amplitude)
+                repeat(0),                      # b (beta amplitude)
+                repeat(0),                      # p (phase)
+                meta['e8_sublattice'].tolist(), # e (E8 sublattice)
+                meta['j_real'].tolist(),        # j (j-invariant real)
+                meta['j_imag'].tolist(),        # ji (j-invariant imag)
+                meta['poincare_x'].tolist(),    # x (Poincaré x)
+                meta['poincare_y'].tolist(),    # y (Poincaré y)
+                lid,                            # m (memory address)
+                repeat('FREE'),                 # g (state)
+                meta['sigma_phase'].tolist(),   # s (sigma phase)
+                repeat('[]'),                   # entw (entanglement list)
+                repeat('PRODUCT')               # etype (entanglement type)
             ))
             
-            # Allocator entry
-            batch_alloc.append((p['lid'], 0, None, None))
-            
-            if len(batch_q) >= batch_size:
-                c.executemany("INSERT INTO q VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)", batch_q)
-                c.executemany("INSERT INTO cpu_qubit_allocator VALUES(?,?,?,?)", batch_alloc)
-                self.conn.commit()
-                batch_q = []
-                batch_alloc = []
-        
-        if batch_q:
-            c.executemany("INSERT INTO q VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)", batch_q)
-            c.executemany("INSERT INTO cpu_qubit_allocator VALUES(?,?,?,?)", batch_alloc)
-            self.conn.commit()
-        
-        print(f"\r{C.G}✓ Generated {len(lattice_points):,} qubits{C.E}")
+            # Allocator entries
+            c.executemany("INSERT INTO cpu_qubit_allocator VALUES(?,0,NULL,NULL)",
+                          zip(lid))
+        
+        self.conn.commit()
+        print(f"\r{C.G}✓ Generated {total:,} qubits{C.E}          ")
         return True
     
     def _phase5_generate_epr_pairs(self, target_pairs: int) -> bool:
@@ -797,20 +1295,27 @@ class DatabaseBuilder:
         
         c = self.conn.cursor()
         
+        # Rerunnable in place: drop earlier pairs and release their qubits
+        c.execute("DELETE FROM epr_pair_pool")
+        c.execute("DELETE FROM sqlite_sequence WHERE name = 'epr_pair_pool'")
+        c.execute("DELETE FROM e WHERE t = 'e'")
+        c.execute("UPDATE q SET g='FREE', etype='PRODUCT' WHERE g='ENTANGLED'")
+        c.execute("""
+            UPDATE cpu_qubit_allocator SET allocated=0, allocated_to=NULL, allocated_at=NULL
+            WHERE allocated_to = -1
+        """)
+        
         # Get free qubits grouped by E8 sublattice
         print(f"{C.GRAY}  Grouping qubits by E8 sublattice...{C.E}")
-        c.execute("""
+        rows = np.array(c.execute("""
             SELECT i, e FROM q 
             WHERE g = 'FREE'
             ORDER BY i
-        """)
+        """).fetchall(), dtype=np.int64).reshape(-1, 2)
         
-        e8_groups = {0: [], 1: [], 2: []}
-        for row in c.fetchall():
-            qid, e8 = row
-            e8_groups[e8].append(qid)
+        e8_groups = {e8: rows[rows[:, 1] == e8, 0] for e8 in (0, 1, 2)}
         
-        total_free = sum(len(g) for g in e8_groups.values())
+        total_free = len(rows)
         max_pairs = total_free // 2
         
         if target_pairs > max_pairs:
@@ -819,130 +1324,84 @@ class DatabaseBuilder:
         
         print(f"{C.GRAY}  E8 distribution: {len(e8_groups[0]):,} | {len(e8_groups[1]):,} | {len(e8_groups[2]):,}{C.E}")
         
-        # Generate cross-E8 pairs for fault tolerance
-        pairs_created = 0
-        batch = []
-        batch_size = 1000
-        current_time = time.time()
-        
-        # Strategy: Pair across E8 sublattices (0↔1, 1↔2, 2↔0)
+        # Strategy: Pair across E8 sublattices (0↔1, 1↔2, 2↔0), i-th free
+        # qubit of one group with the i-th of the other
         e8_pairs = [(0, 1), (1, 2), (2, 0)]
         pairs_per_combo = target_pairs // 3
         
+        qa, qb, e8a, e8b = [], [], [], []
         for e8_a, e8_b in e8_pairs:
-            qubits_a = e8_groups[e8_a]
-            qubits_b = e8_groups[e8_b]
-            
-            pairs_this_combo = min(len(qubits_a), len(qubits_b), pairs_per_combo)
-            
-            for i in range(pairs_this_combo):
-                if pairs_created >= target_pairs:
-                    break
-                
-                qa = qubits_a[i]
-                qb = qubits_b[i]
-                
-                # Ensure qa < qb for consistency
-                if qa > qb:
-                    qa, qb = qb, qa
-                
-                batch.append((qa, qb, 'READY', 0.98, current_time, None, None, e8_a, e8_b))
-                
-                # Mark qubits as allocated
-                c.execute("UPDATE cpu_qubit_allocator SET allocated=1, allocated_to=-1 WHERE qubit_id IN (?,?)", (qa, qb))
-                
-                # Update qubit states
-                c.execute("UPDATE q SET g='ENTANGLED', etype='EPR' WHERE i IN (?,?)", (qa, qb))
-                
-                # Create entanglement edge
-                c.execute("INSERT OR IGNORE INTO e VALUES(?,?,?,?)", (qa, qb, 'e', 0.98))
-                
-                pairs_created += 1
-                
-                if len(batch) >= batch_size:
-                    c.executemany("""
-                        INSERT INTO epr_pair_pool 
-                        (qubit_a_id, qubit_b_id, state, fidelity, created_at, allocated_at, used_at, e8_a, e8_b)
-                        VALUES (?,?,?,?,?,?,?,?,?)
-                    """, batch)
-                    self.conn.commit()
-                    print(f"\r  Created: {pairs_created:,}/{target_pairs:,} ({100*pairs_created//target_pairs}%)", end='', flush=True)
-                    batch = []
-            
-            if pairs_created >= target_pairs:
-                break
+            n = min(len(e8_groups[e8_a]), len(e8_groups[e8_b]), pairs_per_combo)
+            a, b = e8_groups[e8_a][:n], e8_groups[e8_b][:n]
+            # Ensure qa < qb for consistency
+            qa.append(np.minimum(a, b))
+            qb.append(np.maximum(a, b))
+            e8a.append(np.full(n, e8_a))
+            e8b.append(np.full(n, e8_b))
+        
+        qa, qb = np.concatenate(qa).tolist(), np.concatenate(qb).tolist()
+        e8a, e8b = np.concatenate(e8a).tolist(), np.concatenate(e8b).tolist()
+        current_time = time.time()
+        
+        # Pairs created by this phase are pair_id > first_pair
+        first_pair = c.execute("SELECT COALESCE(MAX(pair_id), 0) FROM epr_pair_pool").fetchone()[0]
+        c.executemany("""
+            INSERT INTO epr_pair_pool 
+            (qubit_a_id, qubit_b_id, state, fidelity, created_at, allocated_at, used_at, e8_a, e8_b)
+            VALUES (?,?,'READY',0.98,?,NULL,NULL,?,?)
+        """, zip(qa, qb, repeat(current_time), e8a, e8b))
         
-        if batch:
-            c.executemany("""
-                INSERT INTO epr_pair_pool 
-                (qubit_a_id, qubit_b_id, state, fidelity, created_at, allocated_at, used_at, e8_a, e8_b)
-                VALUES (?,?,?,?,?,?,?,?,?)
-            """, batch)
-            self.conn.commit()
+        # Everything else is set-based from the new pool rows
+        c.execute("""
+            INSERT OR IGNORE INTO e
+            SELECT qubit_a_id, qubit_b_id, 'e', 0.98 FROM epr_pair_pool WHERE pair_id > ?
+        """, (first_pair,))
+        
+        paired = """
+            SELECT qubit_a_id FROM epr_pair_pool WHERE pair_id > :first
+            UNION SELECT qubit_b_id FROM epr_pair_pool WHERE pair_id > :first
+        """
+        c.execute(f"""
+            UPDATE cpu_qubit_allocator SET allocated=1, allocated_to=-1
+            WHERE qubit_id IN ({paired})
+        """, {'first': first_pair})
+        c.execute(f"UPDATE q SET g='ENTANGLED', etype='EPR' WHERE i IN ({paired})",
+                  {'first': first_pair})
+        
+        self.conn.commit()
         
         # Verify count
         c.execute("SELECT COUNT(*) FROM epr_pair_pool WHERE state='READY'")
         actual_count = c.fetchone()[0]
         
-        print(f"\r{C.G}✓ Created {actual_count:,} EPR pairs (cross-E8 entanglement){C.E}")
+        print(f"{C.G}✓ Created {actual_count:,} EPR pairs (cross-E8 entanglement){C.E}")
         return True
     
     def _phase6_store_golay_arrays(self) -> bool:
         """Phase 6: Store Golay code arrays for runtime use"""
         print(f"\n{C.C}[Phase 6/9] Storing Golay code arrays{C.E}")
         
-        golay = GolayG24()
+        # Same instance the lattice was built from
+        golay = get_golay()
         c = self.conn.cursor()
+        c.execute("DELETE FROM golay_arrays")
         
-        arrays = [
-            # Generator matrix G (12×24)
-            {
-                'name': 'golay_generator',
-                'type': 'generator_matrix',
-                'dimensions': '12x24',
-                'data': golay.G,
-                'description': 'Generator matrix G = [I₁₂ | A] for encoding'
-            },
-            # Parity-check matrix H (12×24)
-            {
-                'name': 'golay_parity_check',
-                'type': 'parity_check_matrix',
-                'dimensions': '12x24',
-                'data': golay.H,
-                'description': 'Parity-check matrix H = [Aᵀ | I₁₂] for syndrome computation'
-            },
-            # All codewords (4096×24)
-            {
-                'name': 'golay_codewords',
-                'type': 'codeword_table',
-                'dimensions': '4096x24',
-                'data': golay.codewords,
-                'description': 'All 4096 codewords of the extended Golay code'
-            },
-            # Octads (759×24)
-            {
-                'name': 'golay_octads',
-                'type': 'octad_table',
-                'dimensions': f'{len(golay.octads)}x24',
-                'data': golay.octads,
-                'description': 'All 759 octads (weight-8 codewords) for Leech lattice construction'
-            }
-        ]
-        
-        for idx, arr in enumerate(arrays, 1):
+        for idx, (name, attr, array_type, dtype, description) in enumerate(GOLAY_ARRAYS, 1):
+            data = np.ascontiguousarray(getattr(golay, attr), dtype=dtype)
+            dimensions = 'x'.join(str(d) for d in data.shape)
+            
             # Serialize numpy array
-            data_packed = arr['data'].tobytes()
-            data_compressed = zlib.compress(data_packed, level=9)
+            data_compressed = zlib.compress(data.tobytes(), level=9)
             
             c.execute("""
                 INSERT INTO golay_arrays (array_id, array_name, array_type, dimensions, data, description)
                 VALUES (?, ?, ?, ?, ?, ?)
-            """, (idx, arr['name'], arr['type'], arr['dimensions'], data_compressed, arr['description']))
+            """, (idx, name, array_type, dimensions, data_compressed, description))
             
-            print(f"{C.GRAY}  ✓ {arr['name']}: {arr['dimensions']} ({len(data_compressed):,} bytes){C.E}")
+            print(f"{C.GRAY}  ✓ {name}: {dimensions} ({len(data_compressed):,} bytes){C.E}")
         
         self.conn.commit()
-        print(f"{C.G}✓ Stored {len(arrays)} Golay arrays{C.E}")
+        print(f"{C.G}✓ Stored {len(GOLAY_ARRAYS)} Golay arrays{C.E}")
         return True
     
     def _phase7_init_quantum_link(self) -> bool:
@@ -976,25 +1435,19 @@ class DatabaseBuilder:
         """Phase 8: Add basic commands"""
         print(f"\n{C.C}[Phase 8/9] Adding command registry{C.E}")
         
-        commands = [
-            ('help', 'SYSTEM', 'Display help information'),
-            ('status', 'SYSTEM', 'Show system status'),
-            ('qstats', 'QUANTUM', 'Quantum statistics'),
-            ('lattice-info', 'QUANTUM', 'Leech lattice information'),
-            ('golay-test', 'QUANTUM', 'Test Golay error correction'),
-            ('epr-stats', 'QUANTUM', 'EPR pair statistics'),
-            ('moonshine', 'QUANTUM', 'Display Monstrous Moonshine data'),
-        ]
-        
         c = self.conn.cursor()
-        for cmd_name, category, desc in commands:
-            c.execute("""
-                INSERT OR IGNORE INTO command_registry (cmd_name, cmd_category, cmd_description)
-                VALUES (?, ?, ?)
-            """, (cmd_name, category, desc))
+        # Upsert: a rerun picks up changed costs/descriptions, keeps cmd_enabled
+        c.executemany("""
+            INSERT INTO command_registry (cmd_name, cmd_category, cmd_description, cmd_cost)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(cmd_name) DO UPDATE SET
+                cmd_category = excluded.cmd_category,
+                cmd_description = excluded.cmd_description,
+                cmd_cost = excluded.cmd_cost
+        """, COMMANDS)
         
         self.conn.commit()
-        print(f"{C.G}✓ Added {len(commands)} commands{C.E}")
+        print(f"{C.G}✓ Added {len(COMMANDS)} commands{C.E}")
         return True
     
     def _phase9_verify(self) -> bool:
@@ -1008,7 +1461,7 @@ class DatabaseBuilder:
             ("SELECT COUNT(*) FROM q", 196560, "Qubits"),
             ("SELECT COUNT(*) FROM epr_pair_pool WHERE state='READY'", None, "EPR pairs"),
             ("SELECT COUNT(*) FROM cpu_qubit_allocator", 196560, "Allocator entries"),
-            ("SELECT COUNT(*) FROM golay_arrays", 4, "Golay arrays"),
+            ("SELECT COUNT(*) FROM golay_arrays", len(GOLAY_ARRAYS), "Golay arrays"),
             ("SELECT COUNT(*) FROM command_registry", None, "Commands"),
         ]
         
@@ -1078,8 +1531,6 @@ class DatabaseBuilder:
         c.execute("SELECT COUNT(*) FROM e WHERE t='e'")
         epr_edges = c.fetchone()[0]
         
-        self.conn.close()
-        
         print(f"\n{C.BOLD}{C.G}{'═'*75}{C.E}")
         print(f"{C.BOLD}{C.G}DATABASE BUILD COMPLETE{C.E}")
         print(f"{C.BOLD}{C.G}{'═'*75}{C.E}\n")
@@ -1116,7 +1567,22 @@ class DatabaseBuilder:
 
 def main():
     """Main execution"""
-    import sys
+    import argparse
+    import os
+    
+    parser = argparse.ArgumentParser(description='QUNIX Leech lattice database builder')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help=f'Worker processes for --coords zlib packing (this box: {os.cpu_count()})')
+    parser.add_argument('--coords', choices=COORD_MODES, default='int8',
+                        help='l.c storage: int8 (25-byte BLOB + .npy sidecar) or legacy zlib')
+    parser.add_argument('--fresh', action='store_true',
+                        help='Delete the database and build from scratch')
+    parser.add_argument('--rebuild-phase', type=int, choices=sorted(PHASE_DEPENDS),
+                        help='Redo one phase in place (and the phases built on it)')
+    args = parser.parse_args()
+    if args.jobs > 1 and args.coords != 'zlib':
+        parser.error("--jobs only parallelizes --coords zlib packing "
+                     "(int8 mode has no per-row compression to shard)")
     
     print(f"\n{C.BOLD}QUNIX Leech Lattice Database Builder{C.E}")
     print(f"{C.BOLD}Nobel Standard Implementation v{VERSION}{C.E}\n")
@@ -1127,8 +1593,8 @@ def main():
     print(f"{C.GRAY}  • Golay G₂₄ error correction{C.E}")
     print(f"{C.GRAY}  • Monstrous Moonshine j-invariants{C.E}\n")
     
-    print(f"{C.Y}Estimated time: 10-15 minutes{C.E}")
-    print(f"{C.Y}Estimated size: 120-150 MB{C.E}\n")
+    print(f"{C.Y}Estimated time: under a minute{C.E}")
+    print(f"{C.Y}Estimated size: ~55 MB + 5 MB coordinate sidecar{C.E}\n")
     
     response = input(f"{C.C}Proceed with build? (yes/no): {C.E}").strip().lower()
     
@@ -1136,9 +1602,9 @@ def main():
         print(f"{C.Y}Build cancelled{C.E}")
         return 0
     
-    builder = DatabaseBuilder(DB_PATH)
+    builder = DatabaseBuilder(DB_PATH, jobs=args.jobs, coord_mode=args.coords)
     
-    success = builder.build()
+    success = builder.build(fresh=args.fresh, rebuild_phase=args.rebuild_phase)
     
     return 0 if success else 1
 
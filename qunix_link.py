@@ -33,6 +33,8 @@ import logging
 from dataclasses import dataclass
 from enum import Enum
 
+import qunix_db
+
 try:
     from qiskit import QuantumCircuit, transpile
     from qiskit_aer import AerSimulator
@@ -58,24 +60,8 @@ class C:
 # ═══════════════════════════════════════════════════════════════════════════
 
 def get_optimized_connection(db_path: Path, timeout: float = 60.0) -> sqlite3.Connection:
-    """Create optimized WAL-mode connection"""
-    conn = sqlite3.connect(
-        str(db_path),
-        timeout=timeout,
-        check_same_thread=False,
-        isolation_level=None
-    )
-    
-    conn.row_factory = sqlite3.Row
-    
-    # WAL optimizations
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA synchronous=NORMAL")
-    conn.execute("PRAGMA busy_timeout=60000")
-    conn.execute("PRAGMA temp_store=MEMORY")
-    conn.execute("PRAGMA cache_size=-128000")
-    
-    return conn
+    """Create optimized WAL-mode connection (writer profile, 128 MB cache)"""
+    return qunix_db.connect(db_path, profile='writer', timeout=timeout, cache_size=-128000)
 
 
 def retry_on_lock(func, max_retries: int = 5, delay: float = 0.1):
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+qunix_metrics.py v1.0.0 - METRICS REGISTRY + OPENMETRICS EXPOSITION
+
+Counters, gauges and latency histograms for the Flask app, the bus and
+the CPU, rendered as OpenMetrics text for /metrics.
+
+- REGISTRY: process-wide default registry
+- Collectors: callables run at scrape time that expose the existing stats
+  dicts (bus, CPU, pool, engines) without booking anything twice
+- Cross-process: the CPU subprocess writes its snapshot to a JSON file
+  next to the database (atomic rename); Flask merges it at scrape time
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+VERSION = "1.0.0"
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Seconds; covers a cached reader query (~10µs lands in the first bucket)
+# up to a multi-second Grover run
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# METRIC TYPES
+# ═══════════════════════════════════════════════════════════════════════════
+
+class _Metric:
+    kind = 'unknown'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+        self.values: Dict[Tuple, Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple:
+        return tuple(str(labels.get(n, '')) for n in self.labelnames)
+
+    def _labels(self, key: Tuple) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> List[list]:
+        """[[suffix, labels, value], ...]"""
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def samples(self) -> List[list]:
+        with self.lock:
+            return [['_total', self._labels(k), v] for k, v in sorted(self.values.items())]
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        with self.lock:
+            self.values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def samples(self) -> List[list]:
+        with self.lock:
+            return [['', self._labels(k), v] for k, v in sorted(self.values.items())]
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        # Per-bucket (non-cumulative) counts; cumulated when rendered
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of a with-block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[list]:
+        out = []
+        with self.lock:
+            items = sorted((k, (list(s[0]), s[1], s[2])) for k, s in self.values.items())
+        for key, (counts, total, count) in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                out.append(['_bucket', dict(labels, le=repr(float(bound))), cumulative])
+            out.append(['_bucket', dict(labels, le='+Inf'), count])
+            out.append(['_count', labels, count])
+            out.append(['_sum', labels, total])
+        return out
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# REGISTRY
+# ═══════════════════════════════════════════════════════════════════════════
+
+# A collector returns [(name, kind, help, value[, labels]), ...] at scrape time
+Collector = Callable[[], Iterable[tuple]]
+
+
+class MetricsRegistry:
+    """Named metrics plus scrape-time collectors"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics: Dict[str, _Metric] = {}
+        self.collectors: List[Collector] = []
+
+    def _get_or_create(self, cls, name: str, help: str, labelnames: Sequence[str], **kwargs):
+        # Idempotent, so an in-process CPU or a module reload reuses metrics
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, help, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def register_collector(self, collector: Collector):
+        with self.lock:
+            self.collectors.append(collector)
+
+    def unregister_collector(self, collector: Collector):
+        with self.lock:
+            if collector in self.collectors:
+                self.collectors.remove(collector)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """{name: {'type', 'help', 'samples': [[suffix, labels, value], ...]}}"""
+        with self.lock:
+            metrics = list(self.metrics.values())
+            collectors = list(self.collectors)
+
+        families = {}
+        for metric in metrics:
+            families[metric.name] = {'type': metric.kind, 'help': metric.help,
+                                     'samples': metric.samples()}
+
+        for collector in collectors:
+            try:
+                entries = list(collector())
+            except Exception as e:
+                # One broken source must not take the whole scrape down
+                print(f"[METRICS] Collector {getattr(collector, '__name__', collector)} failed: {e}")
+                continue
+            for entry in entries:
+                name, kind, help, value = entry[:4]
+                labels = entry[4] if len(entry) > 4 else {}
+                if value is None:
+                    continue
+                family = families.setdefault(name, {'type': kind, 'help': help, 'samples': []})
+                family['samples'].append(['_total' if kind == 'counter' else '', labels, value])
+
+        return families
+
+    def write_snapshot(self, path: Union[str, Path]):
+        """Publish the snapshot for another process (atomic replace)"""
+        path = Path(path)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, 'w') as f:
+            json.dump({'timestamp': time.time(), 'pid': os.getpid(),
+                       'families': self.snapshot()}, f)
+        os.replace(tmp, path)
+
+
+REGISTRY = MetricsRegistry()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CROSS-PROCESS SNAPSHOTS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def snapshot_path(db_path: Union[str, Path], process: str) -> Path:
+    """Where a process publishes its metrics: <db>.<process>-metrics.json"""
+    return Path(f"{db_path}.{process}-metrics.json")
+
+
+def read_snapshot(path: Union[str, Path]) -> Tuple[Dict[str, Dict[str, Any]], Optional[float]]:
+    """Returns (families, age in seconds); ({}, None) if missing or unreadable"""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        return data.get('families', {}), time.time() - data.get('timestamp', 0.0)
+    except (OSError, ValueError):
+        return {}, None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# OPENMETRICS TEXT
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if math.isnan(value):
+        return 'NaN'
+    if value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render(*snapshots: Dict[str, Dict[str, Any]]) -> str:
+    """OpenMetrics text for one or more snapshots; earlier ones win on name clashes"""
+    families: Dict[str, Dict[str, Any]] = {}
+    for snapshot in snapshots:
+        for name, family in snapshot.items():
+            families.setdefault(name, family)
+
+    lines = []
+    for name in sorted(families):
+        family = families[name]
+        lines.append(f"# TYPE {name} {family['type']}")
+        lines.append(f"# HELP {name} {_escape(family['help'])}")
+        for suffix, labels, value in family['samples']:
+            if labels:
+                label_str = ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                lines.append(f"{name}{suffix}{{{label_str}}} {_format_value(value)}")
+            else:
+                lines.append(f"{name}{suffix} {_format_value(value)}")
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+__all__ = [
+    'Counter',
+    'Gauge',
+    'Histogram',
+    'MetricsRegistry',
+    'REGISTRY',
+    'CONTENT_TYPE',
+    'LATENCY_BUCKETS',
+    'snapshot_path',
+    'read_snapshot',
+    'render',
+]
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+qunix_render.py v1.1.0 - RESPONSE RENDERING + RESULT FRAMES
+
+Turns structured command results (plain dicts with a 'type' key) into
+terminal output, JSON or binary result frames.
+
+- TextRenderer: ANSI output with precomputed static responses, prebuilt
+  format templates and cached histogram bars
+- JsonRenderer: compact JSON for API clients, no ANSI formatting
+- BinaryRenderer: self-delimiting result frames (header + JSON metadata +
+  packed numpy counts) for transport; rendered later at the terminal edge
+
+No Qiskit dependency, so Flask can render at the terminal edge too.
+"""
+
+import json
+import heapq
+import struct
+import numpy as np
+from operator import itemgetter
+from typing import Dict, Any, List, Tuple, Optional
+
+VERSION = "1.1.0"
+
+# ANSI Colors
+class C:
+    H = '\033[95m'; B = '\033[94m'; C = '\033[96m'; G = '\033[92m'
+    Y = '\033[93m'; R = '\033[91m'; E = '\033[0m'; Q = '\033[38;5;213m'
+    W = '\033[97m'; M = '\033[35m'; BOLD = '\033[1m'; GRAY = '\033[90m'
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# STATIC CONTENT
+# ═══════════════════════════════════════════════════════════════════════════
+
+HISTOGRAM_TOP = 8          # Outcomes shown per histogram
+BAR_MAX_WIDTH = 40         # 100% / 2.5% per block
+
+HELP_SECTIONS: List[Tuple[str, List[Tuple[str, str]]]] = [
+    ("Quantum Gates", [
+        ("qh, hadamard", "Hadamard gate"),
+        ("qx, pauli-x", "Pauli-X (NOT)"),
+        ("qy, pauli-y", "Pauli-Y"),
+        ("qz, pauli-z", "Pauli-Z"),
+        ("qcx, cnot", "CNOT (Bell pair)"),
+        ("qccx, toffoli", "Toffoli gate"),
+    ]),
+    ("Algorithms", [
+        ("qft", "Quantum Fourier Transform"),
+        ("grover", "Grover's search"),
+        ("chsh", "CHSH inequality test"),
+    ]),
+    ("Sampling options (gates, algorithms, chsh)", [
+        ("--shots N", "Run exactly N shots"),
+        ("--tol X", "Sample until 95% CI half-width <= X"),
+        ("--max-shots N", "Cap for adaptive sampling (max {max_shots})"),
+    ]),
+    ("Output options", [
+        ("--json", "Machine-readable JSON output"),
+    ]),
+    ("System", [
+        ("help", "This help"),
+        ("status", "System status"),
+        ("qstats", "Quantum statistics"),
+        ("trace [id]", "Latency breakdown of a command (recent IDs without one)"),
+        ("ping", "Connectivity test"),
+    ]),
+]
+
+STATUS_TEMPLATE = """{bold}CPU Status{end}
+
+State:           {green}{{state}}{end}
+Commands:        {{commands:,}}
+Circuits:        {{circuits:,}}
+EPR pairs:       {{epr_pairs:,}}
+Avg CHSH:        {{avg_chsh:.4f}}
+""".format(bold=C.BOLD, green=C.G, end=C.E)
+
+QSTATS_TEMPLATE = """{bold}Quantum Statistics{end}
+
+Circuits executed: {{circuits:,}}
+EPR pairs created: {{epr_pairs:,}}
+Shots executed:    {{shots:,}}
+Average CHSH:      {{avg_chsh:.4f}}
+Quantum advantage: {{advantage}}
+""".format(bold=C.BOLD, end=C.E)
+
+CHSH_TEMPLATE = ("CHSH Test\r\n\r\nCHSH Value: {chsh:.4f} ± {chsh_err:.4f} (95%)\r\n"
+                 "Shots:      {shots:,}\r\nVerdict: {verdict}")
+
+TEST_TEMPLATE = ("{green}✓ CPU operational{end}\r\n"
+                 "Test EPR: CHSH={{chsh:.3f}}±{{chsh_err:.3f}}, "
+                 "Fidelity={{fidelity:.3f}} ({{shots}} shots)").format(green=C.G, end=C.E)
+
+HISTOGRAM_LINE = "  |{}⟩: {:4d} ({:5.1f}%) {}"
+SHOTS_TEMPLATE = "\r\n\r\n" + C.GRAY + "Shots: {:,} (±{:.3f} @95%)" + C.E
+UNKNOWN_TEMPLATE = C.Y + "Unknown command: {}" + C.E + "\r\nType 'help' for available commands"
+ERROR_TEMPLATE = C.R + "Error: {}" + C.E
+VERDICT_QUANTUM = f"{C.G}✓ QUANTUM{C.E}"
+REJECTED_TEMPLATE = C.Y + "Rejected ({reason}): CPU busy, retry in {retry_after:.1f}s" + C.E
+TRACE_TITLE = C.BOLD + "Trace {trace_id}" + C.E + "  {command}  [{status}]"
+TRACE_LINE = "  {:<12} {:>10.2f} {:>10.2f}"
+TRACE_SLOWEST = C.Y + "  {:<12} {:>10.2f} {:>10.2f}  ← slowest" + C.E
+TRACES_LINE = "  {trace_id}  {total_ms:>9.1f}ms  {status:<9} {command}"
+BUS_TAG_TEMPLATE = "\n" + C.GRAY + "[Bus CHSH: {chsh:.3f}±{chsh_err:.3f} {quantum}] [{elapsed_ms:.1f}ms]" + C.E
+
+
+def top_outcomes(counts: Dict[str, int], limit: int = HISTOGRAM_TOP) -> List[Tuple[str, int]]:
+    """Most frequent outcomes without sorting the whole histogram"""
+    if len(counts) <= limit:
+        return sorted(counts.items(), key=itemgetter(1), reverse=True)
+    return heapq.nlargest(limit, counts.items(), key=itemgetter(1))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# TEXT (ANSI) RENDERER
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TextRenderer:
+    """ANSI terminal renderer with precomputed static output"""
+
+    def __init__(self, version: Optional[str] = None, max_shots: Optional[int] = None):
+        # Bar strings reused by width
+        self._bars = ['█' * w for w in range(BAR_MAX_WIDTH + 1)]
+        self._headers: Dict[str, str] = {}
+        self._help: Dict[Tuple[str, int], str] = {}
+
+        # Prebuild static output for the local CPU version
+        self.version = version
+        self.max_shots = max_shots
+        if version is not None:
+            self._get_help({'version': version, 'max_shots': max_shots})
+
+        self._handlers = {
+            'text': lambda d: d['text'],
+            'help': self._get_help,
+            'version': lambda d: f"QUNIX Quantum CPU v{d.get('version', self.version)}",
+            'header': lambda d: self.header(d['title']),
+            'bus': lambda d: BUS_TAG_TEMPLATE.format(
+                quantum='✓ quantum' if d['chsh'] > 2.0 else '', **d),
+            'histogram': self._render_histogram,
+            'chsh': self._render_chsh,
+            'test': lambda d: TEST_TEMPLATE.format_map(d),
+            'status': lambda d: STATUS_TEMPLATE.format_map(d),
+            'qstats': lambda d: QSTATS_TEMPLATE.format(
+                advantage='✓ Yes' if d['avg_chsh'] > 2.0 else 'No', **d),
+            'unknown': lambda d: UNKNOWN_TEMPLATE.format(d['command']),
+            'error': lambda d: ERROR_TEMPLATE.format(d['message']),
+            'rejected': lambda d: REJECTED_TEMPLATE.format_map(d),
+            'trace': self._render_trace,
+            'traces': self._render_traces,
+        }
+
+    def _get_help(self, doc: Dict[str, Any]) -> str:
+        key = (doc.get('version', self.version), doc.get('max_shots', self.max_shots))
+        text = self._help.get(key)
+        if text is None:
+            text = self._help[key] = self._build_help(*key)
+        return text
+
+    @staticmethod
+    def _build_help(version: str, max_shots: int) -> str:
+        lines = [f"{C.BOLD}QUNIX Quantum CPU v{version}{C.E}"]
+        for section, entries in HELP_SECTIONS:
+            lines.append("")
+            lines.append(f"{section}:")
+            for name, desc in entries:
+                lines.append(f"  {name:<16} {desc.format(max_shots=max_shots)}")
+        return '\n'.join(lines) + '\n'
+
+    def header(self, title: str) -> str:
+        """Bold title line, emitted before a circuit runs"""
+        header = self._headers.get(title)
+        if header is None:
+            header = self._headers[title] = f"{C.BOLD}{title}{C.E}\r\n"
+        return header
+
+    def render(self, doc: Dict[str, Any], header_sent: bool = False) -> str:
+        """Render a result document; header_sent skips an already streamed title"""
+        if doc['type'] == 'histogram' and not header_sent:
+            return self.header(doc['title']) + self._render_histogram(doc)
+        return self._handlers[doc['type']](doc)
+
+    def _render_histogram(self, doc: Dict[str, Any]) -> str:
+        counts = doc['counts']
+        if not counts:
+            return "No results"
+
+        total = sum(counts.values())
+        bars = self._bars
+        lines = ["", "Results:"]
+
+        for bitstring, count in top_outcomes(counts):
+            prob = count / total * 100
+            lines.append(HISTOGRAM_LINE.format(bitstring, count, prob, bars[int(prob / 2.5)]))
+
+        text = '\r\n'.join(lines)
+        if doc.get('shots'):
+            text += SHOTS_TEMPLATE.format(doc['shots'], doc['error'])
+        return text
+
+    def _render_chsh(self, doc: Dict[str, Any]) -> str:
+        verdict = VERDICT_QUANTUM if doc['quantum'] else "Classical"
+        return CHSH_TEMPLATE.format(verdict=verdict, **doc)
+
+    def _render_trace(self, doc: Dict[str, Any]) -> str:
+        spans = doc['spans']
+        slowest = max(range(len(spans)), key=lambda i: spans[i]['delta_ms']) if spans else -1
+        lines = [TRACE_TITLE.format_map(doc), "",
+                 f"  {'span':<12} {'at ms':>10} {'delta ms':>10}"]
+        for i, span in enumerate(spans):
+            line = TRACE_SLOWEST if i == slowest else TRACE_LINE
+            lines.append(line.format(span['span'], span['at_ms'], span['delta_ms']))
+        lines.append(f"\r\n{C.GRAY}Total: {doc['total_ms']:.2f}ms{C.E}")
+        return '\r\n'.join(lines)
+
+    def _render_traces(self, doc: Dict[str, Any]) -> str:
+        if not doc['traces']:
+            return "No traces recorded"
+        lines = [f"{C.BOLD}Recent traces{C.E}", ""]
+        lines.extend(TRACES_LINE.format_map(t) for t in doc['traces'])
+        lines.append(f"\r\n{C.GRAY}trace <id> for the breakdown{C.E}")
+        return '\r\n'.join(lines)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# JSON RENDERER
+# ═══════════════════════════════════════════════════════════════════════════
+
+class JsonRenderer:
+    """Compact JSON renderer for API clients"""
+
+    def __init__(self, version: Optional[str] = None, max_shots: Optional[int] = None):
+        self.version = version
+        self.max_shots = max_shots
+        self._static: Dict[Tuple[str, str, int], str] = {}
+
+    def header(self, title: str) -> str:
+        return ''
+
+    def render(self, doc: Dict[str, Any], header_sent: bool = False) -> str:
+        if doc['type'] == 'header':
+            return ''
+        if doc['type'] in ('help', 'version'):
+            key = (doc['type'], doc.get('version', self.version),
+                   doc.get('max_shots', self.max_shots))
+            text = self._static.get(key)
+            if text is None:
+                text = self._static[key] = self._build_static(*key)
+            return text
+        return json.dumps(doc, separators=(',', ':'))
+
+    @staticmethod
+    def _build_static(kind: str, version: str, max_shots: int) -> str:
+        if kind == 'version':
+            return json.dumps({'type': 'version', 'version': version}, separators=(',', ':'))
+        return json.dumps({
+            'type': 'help',
+            'version': version,
+            'sections': {
+                section: {name: desc.format(max_shots=max_shots) for name, desc in entries}
+                for section, entries in HELP_SECTIONS
+            }
+        }, separators=(',', ':'))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BINARY RESULT FRAMES
+# ═══════════════════════════════════════════════════════════════════════════
+#
+# Frame layout (little-endian):
+#   header   magic 'QXR' | version u8 | meta_len u32 | block_len u32
+#   meta     UTF-8 JSON document without 'counts'
+#   block    outcomes u64[n] | counts u32[n]   (histograms only)
+#
+# Outcome bitstrings are stored as integers; the register widths needed to
+# rebuild Qiskit's space-separated keys travel in meta['registers'].
+
+RESULT_MAGIC = b'QXR'
+RESULT_FORMAT_VERSION = 1
+RESULT_HEADER = struct.Struct('<3sBII')
+
+
+def encode_result(doc: Dict[str, Any]) -> bytes:
+    """Pack a result document into one binary frame"""
+    meta = dict(doc)
+    counts = meta.pop('counts', None)
+    block = b''
+
+    if counts is not None:
+        keys = list(counts)
+        meta['registers'] = [len(r) for r in keys[0].split(' ')] if keys else []
+        meta['n_outcomes'] = len(keys)
+        outcomes = np.fromiter((int(k.replace(' ', ''), 2) for k in keys),
+                               dtype='<u8', count=len(keys))
+        values = np.fromiter(counts.values(), dtype='<u4', count=len(keys))
+        block = outcomes.tobytes() + values.tobytes()
+
+    meta_bytes = json.dumps(meta, separators=(',', ':')).encode('utf-8')
+    return RESULT_HEADER.pack(RESULT_MAGIC, RESULT_FORMAT_VERSION,
+                              len(meta_bytes), len(block)) + meta_bytes + block
+
+
+def decode_result(frame: bytes, arrays: bool = False) -> Dict[str, Any]:
+    """
+    Unpack one binary frame
+    
+    With arrays=True a histogram's 'outcomes' and 'counts' are returned as
+    zero-copy numpy views on the frame instead of a bitstring dict.
+    """
+    magic, version, meta_len, block_len = RESULT_HEADER.unpack_from(frame, 0)
+    if magic != RESULT_MAGIC or version != RESULT_FORMAT_VERSION:
+        raise ValueError(f"Not a v{RESULT_FORMAT_VERSION} result frame")
+
+    offset = RESULT_HEADER.size
+    doc = json.loads(bytes(frame[offset:offset + meta_len]).decode('utf-8'))
+
+    n = doc.pop('n_outcomes', None)
+    if n is not None:
+        offset += meta_len
+        outcomes = np.frombuffer(frame, dtype='<u8', count=n, offset=offset)
+        values = np.frombuffer(frame, dtype='<u4', count=n, offset=offset + 8 * n)
+        registers = doc.pop('registers')
+
+        if arrays:
+            doc['outcomes'] = outcomes
+            doc['counts'] = values
+            doc['registers'] = registers
+        else:
+            doc['counts'] = {_outcome_key(int(o), registers): int(v)
+                             for o, v in zip(outcomes, values)}
+
+    return doc
+
+
+def _outcome_key(outcome: int, registers: List[int]) -> str:
+    bits = format(outcome, f'0{sum(registers)}b')
+    parts = []
+    start = 0
+    for width in registers:
+        parts.append(bits[start:start + width])
+        start += width
+    return ' '.join(parts)
+
+
+def pop_frames(buffer: bytearray, arrays: bool = False) -> List[Dict[str, Any]]:
+    """Decode and remove every complete frame at the front of buffer"""
+    docs = []
+    while len(buffer) >= RESULT_HEADER.size:
+        magic, version, meta_len, block_len = RESULT_HEADER.unpack_from(buffer, 0)
+        # Lengths from a non-frame are garbage; fail instead of waiting on them
+        if magic != RESULT_MAGIC or version != RESULT_FORMAT_VERSION:
+            if docs:
+                break  # Hand back the good frames; the next call raises
+            raise ValueError(f"Not a v{RESULT_FORMAT_VERSION} result frame")
+        size = RESULT_HEADER.size + meta_len + block_len
+        if len(buffer) < size:
+            break
+        docs.append(decode_result(bytes(buffer[:size]), arrays=arrays))
+        del buffer[:size]
+    return docs
+
+
+class BinaryRenderer:
+    """Emits result frames; rendering happens at the terminal edge"""
+
+    def __init__(self, version: Optional[str] = None, max_shots: Optional[int] = None):
+        self.version = version
+        self.max_shots = max_shots
+
+    def header(self, title: str) -> bytes:
+        return encode_result({'type': 'header', 'title': title})
+
+    def render(self, doc: Dict[str, Any], header_sent: bool = False) -> bytes:
+        if doc['type'] in ('help', 'version'):
+            doc = dict(doc, version=self.version, max_shots=self.max_shots)
+        return encode_result(doc)
+
+
+__all__ = [
+    'TextRenderer',
+    'JsonRenderer',
+    'BinaryRenderer',
+    'encode_result',
+    'decode_result',
+    'pop_frames',
+    'top_outcomes',
+]
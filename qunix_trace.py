@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+qunix_trace.py v1.0.0 - END-TO-END REQUEST TRACING
+
+One row per terminal command in request_traces, keyed by the trace ID
+Flask mints in /api/terminal/input (the request_id) and carried to the
+CPU in quantum_ipc.trace_id. Each process upserts only the span columns
+it owns, so the row assembles regardless of write order:
+
+  Flask   enqueued, dequeued, done, status
+  Bus     epr_tagged, sent, first_read, last_read
+  CPU     claimed, exec_start, first_chunk, exec_end, last_chunk
+
+trace_document() turns a row into a {'type': 'trace'} result document
+(spans in time order with deltas) rendered by qunix_render.
+"""
+
+import sqlite3
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+VERSION = "1.0.0"
+
+TRACE_TTL = 3600.0        # Rows older than this are pruned with old packets
+RECENT_LIMIT = 10         # 'trace' without an ID lists this many
+
+# Span columns in pipeline order (ties in time keep this order)
+SPANS = [
+    'enqueued',      # Flask: input accepted, queued for a worker
+    'dequeued',      # Flask: worker picked it up
+    'epr_tagged',    # Bus: request EPR pair created
+    'sent',          # Bus: command packet committed to quantum_ipc
+    'claimed',       # CPU: packet polled and marked processed
+    'exec_start',    # CPU: execution started
+    'first_chunk',   # CPU: first response chunk committed
+    'exec_end',      # CPU: execution finished
+    'last_chunk',    # CPU: end-of-stream chunk committed
+    'first_read',    # Bus: first response chunk read
+    'last_read',     # Bus: end-of-stream chunk read
+    'done',          # Flask: output rendered to the session
+]
+
+TRACE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS request_traces (
+    trace_id TEXT PRIMARY KEY,
+    created REAL NOT NULL,
+    command TEXT,
+    status TEXT,
+""" + ',\n'.join(f"    {span} REAL" for span in SPANS) + """
+);
+
+CREATE INDEX IF NOT EXISTS idx_trace_created ON request_traces(created);
+"""
+
+# quantum_ipc predates tracing; existing databases gain the column
+IPC_TRACE_COLUMN = "trace_id"
+IPC_TRACE_MIGRATION = "ALTER TABLE quantum_ipc ADD COLUMN trace_id TEXT"
+
+_COLUMNS = frozenset(SPANS) | {'command', 'status'}
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SCHEMA
+# ═══════════════════════════════════════════════════════════════════════════
+
+def ensure_trace_schema(conn: sqlite3.Connection) -> bool:
+    """Create request_traces and add quantum_ipc.trace_id if missing"""
+    try:
+        conn.executescript(TRACE_SCHEMA)
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(quantum_ipc)").fetchall()]
+        if IPC_TRACE_COLUMN not in columns:
+            migrate_ipc(conn)
+        return True
+    except Exception as e:
+        print(f"[TRACE] Schema setup failed: {e}")
+        return False
+
+
+def migrate_ipc(conn: sqlite3.Connection):
+    """ALTER quantum_ipc; losing the race to another process is fine"""
+    try:
+        conn.execute(IPC_TRACE_MIGRATION)
+    except sqlite3.OperationalError as e:
+        if 'duplicate column' not in str(e):
+            raise
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# WRITE / READ
+# ═══════════════════════════════════════════════════════════════════════════
+
+def upsert(trace: Mapping[str, Any]) -> Tuple[str, tuple]:
+    """
+    (sql, params) recording the span columns present in trace
+
+    Only the given columns are overwritten on conflict, so Flask, the bus
+    and the CPU can each write their own part in any order.
+    """
+    columns = [c for c in trace if c in _COLUMNS and trace[c] is not None]
+    sql = (f"INSERT INTO request_traces (trace_id, created"
+           f"{''.join(', ' + c for c in columns)}) "
+           f"VALUES (?, ?{', ?' * len(columns)}) "
+           f"ON CONFLICT(trace_id) DO UPDATE SET "
+           + (', '.join(f"{c} = excluded.{c}" for c in columns) or "created = created"))
+    return sql, (trace['trace_id'], time.time(), *[trace[c] for c in columns])
+
+
+def prune_sql(max_age: float = TRACE_TTL) -> Tuple[str, tuple]:
+    return "DELETE FROM request_traces WHERE created < ?", (time.time() - max_age,)
+
+
+def lookup_sql(trace_id: str) -> Tuple[str, tuple]:
+    """Exact ID or unique-enough prefix (index range scan)"""
+    return ("SELECT * FROM request_traces WHERE trace_id >= ? AND trace_id < ? "
+            "ORDER BY trace_id LIMIT 1", (trace_id, trace_id + '\uffff'))
+
+
+def recent_sql(limit: int = RECENT_LIMIT) -> Tuple[str, tuple]:
+    return "SELECT * FROM request_traces ORDER BY created DESC LIMIT ?", (limit,)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# DOCUMENTS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def trace_document(row: Optional[Mapping[str, Any]], trace_id: str = '') -> Dict[str, Any]:
+    """
+    {'type': 'trace'} document: spans in time order, each with its offset
+    from the first span and the delta from the previous one (ms)
+    """
+    if row is None:
+        return {'type': 'error', 'message': f"No trace {trace_id}"}
+
+    row = dict(row)
+    stamped = [(row[s], i, s) for i, s in enumerate(SPANS) if row.get(s)]
+    stamped.sort()
+
+    spans = []
+    if stamped:
+        origin = prev = stamped[0][0]
+        for ts, _, name in stamped:
+            spans.append({'span': name,
+                          'at_ms': (ts - origin) * 1000,
+                          'delta_ms': (ts - prev) * 1000})
+            prev = ts
+
+    return {
+        'type': 'trace',
+        'trace_id': row['trace_id'],
+        'command': row.get('command') or '',
+        'status': row.get('status') or 'in flight',
+        'total_ms': spans[-1]['at_ms'] if spans else 0.0,
+        'spans': spans,
+    }
+
+
+def traces_document(rows: List[Mapping[str, Any]]) -> Dict[str, Any]:
+    """{'type': 'traces'} summary of recent traces (newest first)"""
+    traces = []
+    for row in rows:
+        doc = trace_document(row)
+        traces.append({k: doc[k] for k in ('trace_id', 'command', 'status', 'total_ms')})
+    return {'type': 'traces', 'traces': traces}
+
+
+__all__ = [
+    'SPANS',
+    'TRACE_SCHEMA',
+    'TRACE_TTL',
+    'RECENT_LIMIT',
+    'IPC_TRACE_COLUMN',
+    'ensure_trace_schema',
+    'migrate_ipc',
+    'upsert',
+    'prune_sql',
+    'lookup_sql',
+    'recent_sql',
+    'trace_document',
+    'traces_document',
+]
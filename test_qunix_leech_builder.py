@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Round-trip tests for l.c coordinate storage (both --coords modes)
+
+Run:  python -m pytest -q test_qunix_leech_builder.py
+"""
+
+import numpy as np
+import pytest
+
+import qunix_leech_builder as builder
+
+
+@pytest.fixture(scope='module')
+def lattice():
+    lattice = builder.LeechLattice()
+    lattice.ints, lattice.types = lattice.generate_int_array()
+    lattice.coords = lattice.ints / lattice.SCALE
+    return lattice
+
+
+def test_int8_roundtrip(lattice):
+    blobs = builder.int8_blobs(lattice.ints)
+    assert len(blobs) == len(lattice.coords) == 196560
+    decoded = np.array([builder.decode_coordinates(blob) for blob in blobs])
+    assert np.array_equal(decoded, lattice.coords)
+
+
+def test_zlib_roundtrip(lattice):
+    slots, lengths = builder.pack_coordinates(lattice.coords)
+    blobs = [slots[k, :n].tobytes() for k, n in enumerate(lengths.tolist())]
+    # Some rows compress to exactly 24 bytes; length must not pick the format
+    assert any(len(blob) == 24 for blob in blobs)
+    decoded = np.array([builder.decode_coordinates(blob) for blob in blobs])
+    assert np.array_equal(decoded, lattice.coords)
+
+
+def test_sidecar_roundtrip(lattice, tmp_path):
+    db_path = tmp_path / 'lattice.db'
+    builder.write_coords_sidecar(db_path, lattice.ints)
+    coords = builder.open_coordinates(db_path)
+    assert np.array_equal(coords / builder.COORD_SCALE, lattice.coords)